@@ -11,6 +11,18 @@
 # outputTerms tuples are ordered as: (Output Index, Variable Name, Variable Unit, Decibel Boolean, Exponent)
 # python CascadeCircuit.py -i a_Test_Circuit_1 -p [5,1,2]
 # python CascadeCircuit.py a_Test_Circuit_1.net test.csv
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -r test_polynomials.npz
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -a
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -s
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -t
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -f 0.05 -b 2000
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -w 8 -e process
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -c
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -n
+# python CascadeCircuit.py bridged_T.net test.csv -m
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -k 4096
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -o npz
+# python CascadeCircuit.py a_Test_Circuit_1.net test.csv -g 64
 # python AutoTest_08.py CascadeCircuit.py 1.0e-14 1.0e-14
 # https://moodle.bath.ac.uk/pluginfile.php/2016444/mod_resource/content/6/Coursework_definition_2022_23_v01_pngfigs.pdf-correctedByPAVE%20%281%29.pdf
 
@@ -47,6 +59,10 @@ import numpy as np
 import math, sys, getopt, re, warnings
 import DataReading as dataRead
 import DataWriting as dataWrite
+import CircuitPolynomials as circuitPoly
+import SweepExecutor as sweepExec
+import ComponentTable as compTable
+# CircuitMNA (which loads SciPy), CircuitSensitivity and CircuitTolerance are imported by the options that use them, so a plain run does not load them
 
 # ===================================================================================================
 # =========================================== SUBROUTINES ===========================================
@@ -65,7 +81,7 @@ def ErrorRaiseCommandLineEntry(systemArguments=[]):
         SyntaxError: Raises a syntax error that has occurred in the command line inputs
     """    
     raise SyntaxError("Invalid entry: " + ' '.join(systemArguments) +
-                                              "\n Example Entries:\n python CascadeCircuit.py -i a_Test_Circuit_1 -p [5,1,2]\n python CascadeCircuit.py input.net output.csv")
+                                              "\n Example Entries:\n python CascadeCircuit.py -i a_Test_Circuit_1 -p [5,1,2]\n python CascadeCircuit.py input.net output.csv\n python CascadeCircuit.py input.net output.csv -r polynomials.npz")
 
 # ============================== COMMAND LINE ==============================
 
@@ -75,9 +91,9 @@ def FormatCommandLine(systemArguments):
     so that the program can read different styles user input.
     
     This takes in the command line input, creates a string of them separated by commas, extracts the graph parameters and removes it from the rest of the string, the 
-    program then replaces the commas with spaces in the string (without graph parameters) and concatenates both strings together before splitting it by the white space.
+    program then replaces the commas with spaces in the string (without graph parameters) and puts the graph parameters back in their place before splitting it by the white space.
 
-    This is so that the graph parameters can be written as [5, 1, 2], [5,1,2], or [5,     1   ,   2] 
+    This is so that the graph parameters can be written as [5, 1, 2], [5,1,2], or [5,     1   ,   2], and other options can still follow the graph parameters
 
     Args:
         systemArguments (list): list of the arguments inputted by the user
@@ -86,6 +102,7 @@ def FormatCommandLine(systemArguments):
         list: list of the arguments in the standard form
     """    
     graphParameterString = ""
+    remainingString = ""
     commandLineString = ",".join(systemArguments)
 
     commandLineString = re.sub(r"[[][.|/';:{}+,\s]*", "[", commandLineString)
@@ -94,11 +111,15 @@ def FormatCommandLine(systemArguments):
     graphParameterPosition = re.search(r"[[]\d", commandLineString)
 
     if not (graphParameterPosition == None):
-        graphParameterString = "".join(commandLineString[graphParameterPosition.start():])
+        graphParameterEnd = commandLineString.find("]", graphParameterPosition.start()) + 1
+        if graphParameterEnd == 0: graphParameterEnd = len(commandLineString)     # No closing bracket, so the rest of the line is kept for the error checks
+        graphParameterString = "".join(commandLineString[graphParameterPosition.start():graphParameterEnd])
+        remainingString = "".join(commandLineString[graphParameterEnd:])
         commandLineString = "".join(commandLineString[:graphParameterPosition.start()])
 
     commandLineString = re.sub(r",+[.|/';:{}+,\s]*", " ", commandLineString)
-    commandLineString +=  graphParameterString
+    remainingString = re.sub(r",+[.|/';:{}+,\s]*", " ", remainingString)
+    commandLineString +=  graphParameterString + remainingString
     return commandLineString.split()
 
 def ReadCommandLine(systemArguments):
@@ -118,28 +139,51 @@ def ReadCommandLine(systemArguments):
         pngFileName (str): string for the .png output file
         userColumns (list): list of integers for user inputted graph columns
         graphBoolean (bool): boolean to detect that a graph has been requested
+        runOptions (dict): dictionary of the optional run settings
+    
+    Additional Information:
+        Options in runOptions:
+            "rationalFile" (-r <file>.npz): Uses the rational function engine and reuses the compiled polynomials saved in the file
+            "analysisBoolean" (-a): Writes the poles, zeros, resonances and -3 dB corners of the circuit to a summary file alongside the .csv
+            "sensitivityBoolean" (-s): Writes the sensitivity of Av, Zin and Pout to every component value to a .csv file alongside the .csv
+            "toleranceBoolean" (-t): Writes the 5/50/95% bands of every output from the <TOLERANCE> block to a .csv file alongside the .csv
+            "adaptiveTolerance" (-f <tolerance>): Refines the frequency sweep near resonances until Av and Zin change by less than the tolerance
+            "pointBudget" (-b <points>): Largest number of frequencies for the adaptive sweep
+            "workers" (-w <workers>): Number of workers that evaluate the frequency sweep and parse the <CIRCUIT> block in parallel
+            "backend" (-e <thread|process>): Type of pool that the workers run on
+            "cacheBoolean" (-c): Reuses the parsed netlist from a binary cache file alongside the .net file while the file is unchanged
+            "nodeMode" (-n): "normalised" allows any node labels, ordering the components by walking the series chain instead of by the node numbers
+            "mnaBoolean" (-m): Solves any network with CircuitMNA instead of the cascade, with the lowest node as the input and the highest node as the output
+            "bufferSize" (-k <kilobytes>): Size of the buffer that collects the rows of the .csv file before they are written
+            "columnFormat" (-o <npz|raw>): Writes binary columns to <output>.npz or the <output>_columns directory instead of the .csv file
+            "memoryBudget" (-g <megabytes>): Memory that the chunks of the streaming sweep can use at once, which sets the number of frequencies in a chunk
     """    
     graphParameters = "1"           # String of 1 to initialise the data
     graphBoolean = False
     fileBoolean = False
     options = [] 
     arguments = []
+    netFileName = ""
+    csvFileName = ""
     pngFileName = ""
+    runOptions = {"rationalFile": "", "analysisBoolean": False, "sensitivityBoolean": False, "toleranceBoolean": False, "adaptiveTolerance": 0, "pointBudget": 10000,
+                  "workers": 1, "backend": "thread", "cacheBoolean": False, "nodeMode": "numbered",
+                  "mnaBoolean": False, "bufferSize": 2**20, "columnFormat": "csv",
+                  "memoryBudget": 2**28}
 
     systemArguments = FormatCommandLine(systemArguments)
+    if len(systemArguments) < 2: ErrorRaiseCommandLineEntry(systemArguments)
 
-    # Sets the netFileName and csvFileName to the first and second entries of the systemArguments, this gets overwritten if the user enters the file for a graph
-    netFileName = systemArguments[0]
-    if len(systemArguments) > 1: csvFileName = systemArguments[1]
-    else: ErrorRaiseCommandLineEntry(systemArguments)
-
-    # Reading System Inputs
+    # Reading System Inputs, options are allowed before or after the file names
     try:
-        options, arguments = getopt.getopt(systemArguments,"i:p:")
+        options, arguments = getopt.gnu_getopt(systemArguments,"i:p:r:astf:b:w:e:cnmk:o:g:")
     except getopt.GetoptError:
-        print('Input invalid! Input line as: CascadeCircuit.py -i <inputfile> -p <parameter>')
+        print('Input invalid! Input line as: CascadeCircuit.py -i <inputfile> -p <parameter> -r <polynomialfile> -a -s -t -f <tolerance> -b <points> -w <workers> -e <backend> -c -n -m -k <kilobytes> -o <format> -g <megabytes>')
         sys.exit(2)
 
+    # Sets the netFileName and csvFileName to the first and second arguments, this gets overwritten if the user enters the file for a graph
+    if len(arguments) > 1: netFileName, csvFileName = arguments[0], arguments[1]
+
     # Read the options that were written into the command line
     for optionAndArgument in options:
         if optionAndArgument[0] in ("-i", "--ifile"):
@@ -150,14 +194,62 @@ def ReadCommandLine(systemArguments):
         elif optionAndArgument[0] in ("-p", "--param"):
             graphParameters = optionAndArgument[1].strip()
             graphBoolean = True
+        elif optionAndArgument[0] in ("-r", "--rational"):
+            if not (".npz" in optionAndArgument[1]): raise OSError("File extension is invalid: " + optionAndArgument[1])
+            runOptions["rationalFile"] = optionAndArgument[1]
+        elif optionAndArgument[0] in ("-a", "--analysis"):
+            runOptions["analysisBoolean"] = True
+        elif optionAndArgument[0] in ("-s", "--sensitivity"):
+            runOptions["sensitivityBoolean"] = True
+        elif optionAndArgument[0] in ("-t", "--tolerance"):
+            runOptions["toleranceBoolean"] = True
+        elif optionAndArgument[0] in ("-f", "--adaptive"):
+            try: runOptions["adaptiveTolerance"] = float(optionAndArgument[1])
+            except: ErrorRaiseCommandLineEntry(systemArguments)
+            if runOptions["adaptiveTolerance"] <= 0: ErrorRaiseCommandLineEntry(systemArguments)
+        elif optionAndArgument[0] in ("-b", "--budget"):
+            try: runOptions["pointBudget"] = int(optionAndArgument[1])
+            except: ErrorRaiseCommandLineEntry(systemArguments)
+        elif optionAndArgument[0] in ("-w", "--workers"):
+            try: runOptions["workers"] = int(optionAndArgument[1])
+            except: ErrorRaiseCommandLineEntry(systemArguments)
+        elif optionAndArgument[0] in ("-e", "--executor"):
+            if not (optionAndArgument[1] in ("thread", "process")): ErrorRaiseCommandLineEntry(systemArguments)
+            runOptions["backend"] = optionAndArgument[1]
+        elif optionAndArgument[0] in ("-c", "--cache"):
+            runOptions["cacheBoolean"] = True
+        elif optionAndArgument[0] in ("-n", "--normalise"):
+            runOptions["nodeMode"] = "normalised"
+        elif optionAndArgument[0] in ("-m", "--mna"):
+            runOptions["mnaBoolean"] = True
+        elif optionAndArgument[0] in ("-k", "--buffer"):
+            try: runOptions["bufferSize"] = int(optionAndArgument[1]) * 1024
+            except: ErrorRaiseCommandLineEntry(systemArguments)
+            if runOptions["bufferSize"] <= 0: ErrorRaiseCommandLineEntry(systemArguments)
+        elif optionAndArgument[0] in ("-o", "--output"):
+            if not (optionAndArgument[1] in ("npz", "raw")): ErrorRaiseCommandLineEntry(systemArguments)
+            runOptions["columnFormat"] = optionAndArgument[1]
+        elif optionAndArgument[0] in ("-g", "--memory"):
+            try: runOptions["memoryBudget"] = int(float(optionAndArgument[1]) * 2**20)
+            except: ErrorRaiseCommandLineEntry(systemArguments)
+            if runOptions["memoryBudget"] <= 0: ErrorRaiseCommandLineEntry(systemArguments)
 
     # Check that the file extensions are correct and raise an error if they are not correct
     if not (".net" in netFileName): raise OSError("File extension is invalid: " + netFileName)
     if not (".csv" in csvFileName): raise OSError("File extension is invalid: " + csvFileName)
 
+    # The network engine reads the nodes in any order, and the other options need the circuit to be a cascade
+    if runOptions["mnaBoolean"]:
+        runOptions["nodeMode"] = "general"
+        if runOptions["rationalFile"] or runOptions["analysisBoolean"] or runOptions["sensitivityBoolean"] or runOptions["toleranceBoolean"] or runOptions["adaptiveTolerance"]:
+            raise SyntaxError("Invalid entry: -m cannot be used with -r, -a, -s, -t or -f\n Please Check Command Line")
+
     # Arguments should be empty in this case, when it is full, then the command line prompt is written incorrectly
     if fileBoolean and len(arguments) > 0: ErrorRaiseCommandLineEntry(systemArguments)
-    if fileBoolean == False and len(systemArguments) > 2: ErrorRaiseCommandLineEntry(systemArguments)
+    if fileBoolean == False and len(arguments) != 2: ErrorRaiseCommandLineEntry(systemArguments)
+
+    # Graphs are read back from the .csv file, which is not written for binary columns
+    if graphBoolean == True and runOptions["columnFormat"] != "csv": raise SyntaxError("Invalid entry: -p cannot be used with -o\n Please Check Command Line")
 
     if graphBoolean == True:
         if re.search(r".+[[]", graphParameters) or re.search(r"[]].+", graphParameters): ErrorRaiseCommandLineEntry(systemArguments)
@@ -169,7 +261,7 @@ def ReadCommandLine(systemArguments):
     userColumns = dataRead.RemoveEmptyElements(userColumns)       
     userColumns = sorted(userColumns)
 
-    return netFileName, csvFileName, pngFileName, userColumns, graphBoolean
+    return netFileName, csvFileName, pngFileName, userColumns, graphBoolean, runOptions
 
 # ============================== MATHEMATICS ==============================
 
@@ -189,69 +281,734 @@ def GetFrequencies(startFrequency, endFrequency, numberOfFrequencies, logBoolean
     if logBoolean: return np.logspace(math.log10(startFrequency), math.log10(endFrequency), int(numberOfFrequencies))
     return np.linspace(startFrequency, endFrequency, int(numberOfFrequencies))
 
-def GetComponentMatrix(impedance, connectionType):
+def GenerateFrequencyChunks(startFrequency, endFrequency, numberOfFrequencies, logBoolean, chunkSize):
+    """
+    Generates the frequencies of GetFrequencies a chunk at a time, so that the grid is never held in memory as a whole. Each chunk repeats the
+    arithmetic of np.linspace (and the power of np.logspace) for its own indexes, so the frequencies are identical to GetFrequencies.
+
+    Args:
+        startFrequency (float): The starting frequency
+        endFrequency (float): The ending frequency
+        numberOfFrequencies (float): Number of frequencies in the sweep
+        logBoolean (boolean): Boolean for a logarithmic sweep
+        chunkSize (int): Number of frequencies in each chunk
+
+    Yields:
+        ndarray: The frequencies of the next chunk
+    """
+    numberOfFrequencies = int(numberOfFrequencies)
+    start, stop = (math.log10(startFrequency), math.log10(endFrequency)) if logBoolean else (float(startFrequency), float(endFrequency))
+    start, stop = np.float64(start), np.float64(stop)
+    delta = stop - start
+    step = delta / (numberOfFrequencies - 1) if numberOfFrequencies > 1 else np.nan
+
+    for chunkStart in range(0, numberOfFrequencies, max(1, int(chunkSize))):
+        chunkEnd = min(chunkStart + int(chunkSize), numberOfFrequencies)
+        chunk = np.arange(chunkStart, chunkEnd, dtype=float)
+        if numberOfFrequencies == 1:  chunk = chunk * delta
+        elif step == 0:               chunk = chunk / (numberOfFrequencies - 1) * delta       # np.linspace handles denormal steps in the same way
+        else:                         chunk = chunk * step
+        chunk += start
+        if chunkEnd == numberOfFrequencies and numberOfFrequencies > 1: chunk[-1] = stop
+        yield np.power(10.0, chunk) if logBoolean else chunk
+
+def GetBytesPerFrequency(numberOfComponents, numberOfColumns, numberOfTerminations=1):
+    """
+    Gets an estimate of the memory that each frequency of a chunk uses over every stage of the streaming sweep. A frequency holds the impedances of up
+    to 256 components at once, the ABCD entries and their temporaries, and for every termination the 12 outputs and their temporaries, and the columns
+    with their formatted text.
+
+    Args:
+        numberOfComponents (int): Number of entries of the compiled circuit
+        numberOfColumns (int): Number of columns that are written
+        numberOfTerminations (int, optional): Number of terminations that every frequency is calculated for. Defaults to 1
+
+    Returns:
+        int: Number of bytes for each frequency
+    """
+    return 16*min(numberOfComponents, 256) + 16*4*4 + (16*12*2 + 64*(numberOfColumns + 1))*numberOfTerminations
+
+def GetComponentImpedance(individualComponent, angularFrequency):
+    """
+    Gets the impedance of an individual component. The angular frequency can be a single frequency or an array of frequencies, in which case the
+    impedance is returned for every frequency at once. Frequency independent components ('R' and 'G') always return a single value.
+
+    Args:
+        individualComponent (tuple): The component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequency (float or ndarray): Frequency (IN RADS) that the component will be analysed on
+
+    Raises:
+        ZeroDivisionError: Raised when the impedance of the component divides by 0, or when the component type is unknown
+
+    Returns:
+        impedance (complex or ndarray): Impedance of the component
+    """    
+    componentType = individualComponent[1]
+    componentValue = individualComponent[2]
+    try: 
+        if   componentType == "R": return componentValue
+        elif componentType == "G": return 1/componentValue
+        elif componentType == "L": return 1j*angularFrequency*componentValue
+        elif componentType == "C": 
+            if not np.all(angularFrequency*componentValue): raise ZeroDivisionError     # Numpy would return inf for arrays instead of raising
+            return 1/(1j*angularFrequency*componentValue)
+        else: raise ValueError("Unknown Component Found: " + " ".join(str(individualComponent)))
+    except:
+        raise ZeroDivisionError("Cannot divide by 0:\n(Connection Type, Component Type, Component Value, Exponent)\n" + " ".join(str(individualComponent)))
+
+def CascadeComponent(A, B, C, D, connectionType, impedance):
     """
-    Gets the ABCD Matrix of each individual component
+    Cascades a single component onto the ABCD entries of the circuit using the closed form of the matrix multiplication, instead of building the
+    component matrix and multiplying the two matrices together.
 
     Supporting Mathematics (Page 15): https://moodle.bath.ac.uk/pluginfile.php/2016444/mod_resource/content/6/Coursework_definition_2022_23_v01_pngfigs.pdf-correctedByPAVE%20%281%29.pdf
 
+        Series:     [A B] [1 Z]  =  [A  B + A*Z]
+                    [C D] [0 1]     [C  D + C*Z]
+
+        Parallel:   [A B] [1 0]  =  [A + B*Y  B]
+                    [C D] [Y 1]     [C + D*Y  D]
+
+    The entries can be complex scalars or 1-D arrays with one value per frequency. Arrays are updated in place. Components with an impedance of 0 are
+    skipped, as they leave the ABCD Matrix unchanged.
+
     Args:
-        impedance (complex): The impedance of the component
-        connectionType (_type_): The type of connection, 'S' for Series and 'P' for Parallel
+        A (complex or ndarray): A entry of the circuit ABCD Matrix
+        B (complex or ndarray): B entry of the circuit ABCD Matrix
+        C (complex or ndarray): C entry of the circuit ABCD Matrix
+        D (complex or ndarray): D entry of the circuit ABCD Matrix
+        connectionType (str): The type of connection, 'S' for Series and 'P' for Parallel
+        impedance (complex or ndarray): The impedance of the component
 
     Returns:
-        matrix (ndarray): ABCD Matrix of the component
+        A, B, C, D (complex or ndarray): Updated ABCD entries of the circuit
     """    
-    matrix = np.array([[1, 0],
-                       [0, 1]])
+    if np.ndim(impedance) == 0:
+        if impedance == 0: return A, B, C, D
+        if connectionType == "S":
+            B += A*impedance
+            D += C*impedance
+        elif connectionType == "P":
+            admittance = 1/impedance
+            A += B*admittance
+            C += D*admittance
+        return A, B, C, D
+
     if connectionType == "S":
-        matrix = np.array([[1, impedance],
-                           [0, 1]])
+        B += A*impedance
+        D += C*impedance
     elif connectionType == "P":
-        matrix = np.array([[1, 0],
-                           [1/impedance, 1]])
-    return matrix
+        admittance = np.divide(1, impedance, out=np.zeros_like(impedance), where=(impedance != 0))
+        A += B*admittance
+        C += D*admittance
+    return A, B, C, D
 
-def CalculateMatrix(circuitComponents, angularFrequency):
+def CascadeMatrix(A, B, C, D, componentMatrix):
     """
-    Calculates the ABCD Matrix for the circuit for a given frequency.
-    Supporting Mathematics (Page 14): https://moodle.bath.ac.uk/pluginfile.php/2016444/mod_resource/content/6/Coursework_definition_2022_23_v01_pngfigs.pdf-correctedByPAVE%20%281%29.pdf
+    Cascades a precomputed constant ABCD block onto the ABCD entries of the circuit. This is the full 2x2 matrix multiplication, written out so that the
+    entries can be complex scalars or 1-D arrays with one value per frequency.
+
+    Args:
+        A (complex or ndarray): A entry of the circuit ABCD Matrix
+        B (complex or ndarray): B entry of the circuit ABCD Matrix
+        C (complex or ndarray): C entry of the circuit ABCD Matrix
+        D (complex or ndarray): D entry of the circuit ABCD Matrix
+        componentMatrix (tuple): ABCD entries of the constant block in the form (A, B, C, D)
 
-    Component types will be denoted by a single letter:
-        'R': Resistor
-        'G': Conductor
-        'L': Inductor
-        'C': Capacitor
+    Returns:
+        A, B, C, D (complex or ndarray): Updated ABCD entries of the circuit
+    """    
+    blockA, blockB, blockC, blockD = componentMatrix
+    return A*blockA + B*blockC, A*blockB + B*blockD, C*blockA + D*blockC, C*blockB + D*blockD
+
+def ApplyComponent(A, B, C, D, individualComponent, angularFrequency):
+    """
+    Applies a single entry of the (compiled) circuit onto the ABCD entries of the circuit. Entries with the 'M' connection type are constant ABCD blocks
+    and entries with the 'N' connection type are repeated sections, both made by CompileCircuit, every other entry is a single component.
 
     Args:
-        circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
-        angularFrequency (float): Frequency (IN RADS) that circuit will be analysed on
+        A (complex or ndarray): A entry of the circuit ABCD Matrix
+        B (complex or ndarray): B entry of the circuit ABCD Matrix
+        C (complex or ndarray): C entry of the circuit ABCD Matrix
+        D (complex or ndarray): D entry of the circuit ABCD Matrix
+        individualComponent (tuple): The component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequency (float or ndarray): Frequency (IN RADS) that the component will be analysed on
+
+    Returns:
+        A, B, C, D (complex or ndarray): Updated ABCD entries of the circuit
+    """    
+    if individualComponent[0] == "M": return CascadeMatrix(A, B, C, D, individualComponent[2])
+    if individualComponent[0] == "N":
+        sectionEntries, count = individualComponent[2]
+        sectionA, sectionB, sectionC, sectionD = 1.0, 0.0, 0.0, 1.0
+        for sectionComponent in sectionEntries:
+            sectionA, sectionB, sectionC, sectionD = ApplyComponent(sectionA, sectionB, sectionC, sectionD, sectionComponent, angularFrequency)
+        return CascadeMatrix(A, B, C, D, PowerMatrix(sectionA, sectionB, sectionC, sectionD, count))
+    impedance = GetComponentImpedance(individualComponent, angularFrequency)
+    return CascadeComponent(A, B, C, D, individualComponent[0], impedance)
+
+def PowerMatrix(A, B, C, D, count):
+    """
+    Raises the ABCD Matrix of a section to a whole power by repeated squaring, so a section that is repeated N times takes about 2*log2(N) matrix
+    products instead of N. Every product is between powers of the same matrix, which commute, so the order of the products does not matter.
+
+    Args:
+        A (complex or ndarray): A entry of the section ABCD Matrix
+        B (complex or ndarray): B entry of the section ABCD Matrix
+        C (complex or ndarray): C entry of the section ABCD Matrix
+        D (complex or ndarray): D entry of the section ABCD Matrix
+        count (int): Number of times the section is repeated, at least 1
+
+    Returns:
+        tuple: A, B, C and D entries of the power of the matrix
+    """    
+    powerMatrix, squareMatrix = None, (A, B, C, D)
+    while True:
+        if count & 1: powerMatrix = squareMatrix if powerMatrix is None else CascadeMatrix(*powerMatrix, squareMatrix)
+        count >>= 1
+        if count == 0: return powerMatrix
+        squareMatrix = CascadeMatrix(*squareMatrix, squareMatrix)
+
+def RepeatSection(sectionTable, count):
+    """
+    Gets the compiled entry of a section that is repeated count times. A section of frequency independent entries is raised to its power once here
+    and becomes a constant ABCD block, any other section becomes a single repeated section entry with the 'N' connection type.
+
+    Args:
+        sectionTable (ComponentTable): Compiled entries of a single copy of the section
+        count (int): Number of times the section is repeated, at least 2
+
+    Returns:
+        list: List containing the entry of the repeated section, or an empty list when the section leaves the ABCD Matrix unchanged
+    """    
+    if len(sectionTable) == 0: return []
+    if np.all((sectionTable.typeCodes <= 1) | (sectionTable.connectionCodes == 2)):
+        A, B, C, D = 1.0, 0.0, 0.0, 1.0
+        for individualComponent in sectionTable: A, B, C, D = ApplyComponent(A, B, C, D, individualComponent, 0)
+        return [("M", "K", tuple(PowerMatrix(A, B, C, D, count)))]
+    return [("N", "K", (sectionTable, int(count)))]
+
+def ReplaceRuns(componentTable, runs, runEntries):
+    """
+    Replaces runs of adjacent entries of the table with at most one compiled entry each. The first row of each run takes the new entry and the other
+    rows are masked out of the arrays, so the rest of the table is never turned into tuples.
+
+    Args:
+        componentTable (ComponentTable): Table of the circuit entries
+        runs (list): List of the (Start, End) rows of each run, in circuit order without any overlap
+        runEntries (list): List of the entries that replace each run, as lists from FoldConstantComponents or RepeatSection
+
+    Returns:
+        ComponentTable: Table of the compiled circuit entries, without node data
+    """    
+    keepMask = np.ones(len(componentTable), dtype=bool)
+    connectionCodes, typeCodes, componentValues = componentTable.connectionCodes.copy(), componentTable.typeCodes.copy(), componentTable.componentValues.copy()
+    newBlocks, sections = [], list(componentTable.sections)
+
+    for (start, end), runEntry in zip(runs, runEntries):
+        keepMask[start:end] = False
+        if len(runEntry) == 0: continue
+        connectionType, componentType, componentValue = runEntry[0]
+        keepMask[start] = True
+        connectionCodes[start] = compTable.ComponentTable.CONNECTION_TYPES.index(connectionType)
+        typeCodes[start] = compTable.ComponentTable.COMPONENT_TYPES.index(componentType)
+        if connectionType == "M":
+            componentValues[start] = len(componentTable.blocks) + len(newBlocks)
+            newBlocks.append(componentValue)
+        elif connectionType == "N":
+            componentValues[start] = len(sections)
+            sections.append(componentValue)
+        else:
+            componentValues[start] = componentValue
+
+    blocks = np.concatenate((componentTable.blocks, np.reshape(np.array(newBlocks), (-1, 4)))) if len(newBlocks) > 0 else componentTable.blocks
+    return compTable.ComponentTable(connectionCodes[keepMask], typeCodes[keepMask], componentValues[keepMask], blocks=blocks, sections=sections)
+
+def FindPeriodicRuns(symbols, periodLimit=64):
+    """
+    Finds the runs of the circuit that are made of identical consecutive copies of a section, such as a ladder that was written out line by line. For
+    each period p, symbols[i] == symbols[i + p] is compared for every entry at once, and each unbroken run of matches is a run of whole copies with
+    that period. A run is only kept when raising the section to a power is cheaper than cascading every copy, and where runs overlap the one that
+    covers the most entries is kept, with the shortest section.
+
+    Example:
+        [0, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, ..., 3]     # (1, 2, count) for the copies of (1, 2)
+
+    Args:
+        symbols (list): List of an integer for each entry, where identical entries have the same integer
+        periodLimit (int, optional): Largest number of entries in a section. Defaults to 64
+
+    Returns:
+        runs (list): List of (Start, Section Length, Count) of each run, in circuit order
+    """    
+    symbols = np.asarray(symbols)
+    candidates = []
+    for period in range(1, min(periodLimit, len(symbols)//2) + 1):
+        matchMask = np.concatenate(([False], symbols[period:] == symbols[:-period], [False]))
+        starts, ends = np.flatnonzero(matchMask[1:] != matchMask[:-1]).reshape(-1, 2).T
+        counts = (ends - starts + period) // period
+
+        # A power takes about two matrix products for each bit of the count, and each product costs about four components
+        keepMask = period*counts > 2*(period + 8*np.floor(np.log2(np.maximum(counts, 1)) + 1))
+        candidates.extend((int(count)*period, period, int(start), int(count)) for start, count in zip(starts[keepMask], counts[keepMask]))
+
+    runs = []
+    claimedMask = np.zeros(len(symbols), dtype=bool)
+    for length, period, start, count in sorted(candidates, key=lambda candidate: (-candidate[0], candidate[1], candidate[2])):
+        if claimedMask[start:start + length].any(): continue
+        claimedMask[start:start + length] = True
+        runs.append((start, period, count))
+    return sorted(runs)
+
+def GetEntrySymbols(componentTable):
+    """
+    Gets an integer for each entry of the table, where identical entries have the same integer. Constant blocks are compared by their entries and
+    repeated sections by their index in the sections list. The entries are grouped with one sort on their codes and values
+
+    Args:
+        componentTable (ComponentTable): Table of the compiled circuit entries
+
+    Returns:
+        symbols (ndarray): Integer of each entry
+    """    
+    entryCodes = componentTable.connectionCodes.astype(int)*len(componentTable.COMPONENT_TYPES) + componentTable.typeCodes
+    entryValues = componentTable.componentValues + 0.0     # + 0.0 makes -0.0 the same as 0.0
+    blockMask = entryCodes == 2*len(componentTable.COMPONENT_TYPES) + 4
+    if np.any(blockMask):
+        blockEntries = componentTable.blocks[componentTable.componentValues[blockMask].astype(int)]
+        entryValues[blockMask] = np.unique(np.hstack((blockEntries.real, np.imag(blockEntries))) + 0.0, axis=0, return_inverse=True)[1].reshape(-1)
+
+    entryOrder = np.lexsort((entryValues, entryCodes))
+    sortedCodes, sortedValues = entryCodes[entryOrder], entryValues[entryOrder]
+    newSymbolMask = np.concatenate(([True], (sortedCodes[1:] != sortedCodes[:-1]) | (sortedValues[1:] != sortedValues[:-1])))
+    symbols = np.empty(len(componentTable), dtype=int)
+    symbols[entryOrder] = np.cumsum(newSymbolMask) - 1
+    return symbols
+
+def FoldPeriodicRuns(componentTable, periodLimit=64):
+    """
+    Folds every run of identical consecutive sections of the compiled circuit into a repeated section entry, so that circuits which were written out
+    line by line are evaluated with PowerMatrix in the same way as a REPEAT section.
+
+    Args:
+        componentTable (ComponentTable): Table of the compiled circuit entries in circuit order
+        periodLimit (int, optional): Largest number of entries in a section. Defaults to 64
+
+    Returns:
+        ComponentTable: Table of the compiled circuit entries with the periodic runs folded
+    """    
+    periodicRuns = FindPeriodicRuns(GetEntrySymbols(componentTable), periodLimit)
+    return ReplaceRuns(componentTable, [(start, start + sectionLength*count) for start, sectionLength, count in periodicRuns],
+                       [RepeatSection(componentTable[start:start + sectionLength], count) for start, sectionLength, count in periodicRuns])
+
+def FoldConstantComponents(connectionCodes, typeCodes, componentValues):
+    """
+    Folds a run of adjacent frequency independent components ('R' and 'G') into a single entry. Series only runs become one series resistor, parallel
+    only runs become one parallel conductance and mixed runs become a constant ABCD block with the 'M' connection type.
+
+    Args:
+        connectionCodes (list): Connection code of each component of the run, in circuit order
+        typeCodes (list): Type code of each component of the run
+        componentValues (list): Value of each component of the run
+
+    Raises:
+        ZeroDivisionError: Raised for a conductor with a value of 0
+
+    Returns:
+        list: List containing the folded entry, or an empty list when the run leaves the ABCD Matrix unchanged
+    """    
+    connectionTypes, componentTypes = compTable.ComponentTable.CONNECTION_TYPES, compTable.ComponentTable.COMPONENT_TYPES
+    if len(typeCodes) == 1: return [(connectionTypes[connectionCodes[0]], componentTypes[typeCodes[0]], componentValues[0])]
+
+    A, B, C, D = 1.0, 0.0, 0.0, 1.0
+    for connectionCode, typeCode, componentValue in zip(connectionCodes, typeCodes, componentValues):
+        impedance = GetComponentImpedance((connectionTypes[connectionCode], componentTypes[typeCode], componentValue), 0)
+        A, B, C, D = CascadeComponent(A, B, C, D, connectionTypes[connectionCode], impedance)
+
+    # With no parallel admittance the run is a sum of series resistances, and with no series impedance it is a sum of parallel conductances
+    if (B == 0) and (C == 0): return []
+    if C == 0: return [("S", "R", B)]
+    if B == 0: return [("P", "G", C)]
+    return [("M", "K", (A, B, C, D))]
+
+def FoldConstantRuns(componentTable):
+    """
+    Folds every run of adjacent frequency independent components ('R' and 'G') of the table into a single entry with FoldConstantComponents. The runs
+    are found with one comparison of the type codes, and only the values of the runs are taken out of the arrays
+
+    Args:
+        componentTable (ComponentTable): Table of the circuit entries in circuit order
+
+    Returns:
+        ComponentTable: Table of the circuit entries with the constant runs folded
+    """    
+    constantMask = np.concatenate(([False], componentTable.typeCodes <= 1, [False]))
+    starts, ends = np.flatnonzero(constantMask[1:] != constantMask[:-1]).reshape(-1, 2).T
+    runs = [(start, end) for start, end in zip(starts.tolist(), ends.tolist()) if end - start > 1]
+    return ReplaceRuns(componentTable, runs, [FoldConstantComponents(componentTable.connectionCodes[start:end].tolist(), componentTable.typeCodes[start:end].tolist(),
+                                                                     componentTable.componentValues[start:end].tolist()) for start, end in runs])
+
+def CompileCircuit(circuitComponents):
+    """
+    Compiles the circuit components from DataReading.GetCircuitComponents for the frequency sweep. Runs of adjacent frequency independent
+    components ('R' and 'G') are folded into a single entry, so only the reactive components are evaluated at each frequency. Each REPEAT section
+    is compiled once and becomes a single entry, which is raised to its power by PowerMatrix at each frequency, and runs of identical sections that
+    were written out line by line are found by FindPeriodicRuns and folded in the same way. Every step works on the arrays of a ComponentTable, and a
+    list is compiled as a ComponentTable.
+
+    Compiled entries are in the same form as the circuit components, with the addition of the constant block and the repeated section:
+        ('M', 'K', (A, B, C, D))
+        ('N', 'K', (section entries, count))
+
+    Args:
+        circuitComponents (list or ComponentTable): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
 
     Returns:
-        ABCDMatrix (ndarray): Overall ABCD Matrix of the circuit
+        compiledComponents (list or ComponentTable): Compiled circuit entries in circuit order, as a ComponentTable when a ComponentTable is compiled
     """    
-    ABCDMatrix = np.identity(2)
+    if not isinstance(circuitComponents, compTable.ComponentTable): return list(CompileCircuit(compTable.ComponentTable.FromComponents(circuitComponents)))
+
+    repeats = [(start, sectionLength, count) for start, sectionLength, count in circuitComponents.repeats.tolist() if count > 1]
+    compiledComponents = ReplaceRuns(circuitComponents, [(start, start + sectionLength) for start, sectionLength, count in repeats],
+                                     [RepeatSection(CompileCircuit(circuitComponents[start:start + sectionLength]), count) for start, sectionLength, count in repeats])
+    compiledComponents = FoldConstantRuns(compiledComponents)
+    return FoldPeriodicRuns(compiledComponents)
+
+def CalculateCoefficients(circuitComponents, angularFrequencies):
+    """
+    Calculates the ABCD entries of the circuit at every frequency at once. Each component's impedance is calculated across the whole frequency vector
+    and cascaded onto four 1-D arrays, so the number of Python-level operations depends on the number of components only.
+    A ComponentTable is passed on to CalculateTableCoefficients.
+
+    Args:
+        circuitComponents (list or ComponentTable): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Returns:
+        A, B, C, D (ndarray): Arrays of each ABCD entry of the circuit, with one value per frequency
+    """    
+    if isinstance(circuitComponents, compTable.ComponentTable): return CalculateTableCoefficients(circuitComponents, angularFrequencies)
+
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    A = np.ones(len(angularFrequencies), dtype=complex)
+    B = np.zeros(len(angularFrequencies), dtype=complex)
+    C = np.zeros(len(angularFrequencies), dtype=complex)
+    D = np.ones(len(angularFrequencies), dtype=complex)
 
     for individualComponent in circuitComponents:
-        impedance = 0 + 0j
-        connectionType = individualComponent[0]
-        componentType = individualComponent[1]
-        componentValue = individualComponent[2]
-        try: 
-            if   componentType == "R": impedance = componentValue
-            elif componentType == "G": impedance = 1/componentValue
-            elif componentType == "L": impedance = 1j*angularFrequency*componentValue
-            elif componentType == "C": impedance = 1/(1j*angularFrequency*componentValue)
-            else: raise ValueError("Unknown Component Found: " + " ".join(str(individualComponent)))
-        except:
-            raise ZeroDivisionError("Cannot divide by 0:\n(Connection Type, Component Type, Component Value, Exponent)\n" + " ".join(str(individualComponent)))
-            
-    
-        if impedance != 0:                                                     
-            componentMatrix = GetComponentMatrix(impedance, connectionType)
-            ABCDMatrix = np.matmul(ABCDMatrix, componentMatrix)
+        A, B, C, D = ApplyComponent(A, B, C, D, individualComponent, angularFrequencies)
+
+    return A, B, C, D
+
+def CalculateTableCoefficients(componentTable, angularFrequencies, chunkSize=256):
+    """
+    Calculates the ABCD entries of the circuit at every frequency from a ComponentTable. The impedances of the reactive components are calculated with
+    a boolean mask for each component type, a chunk of components at a time, and the components are dispatched on their integer codes instead of
+    comparing strings. The result is identical to CalculateCoefficients on the same components.
 
-    return ABCDMatrix
+    Args:
+        componentTable (ComponentTable): Table of the circuit components or compiled circuit entries
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        chunkSize (int, optional): Number of components that the impedances are calculated for at once. Defaults to 256
+
+    Raises:
+        ZeroDivisionError: Raised when the impedance of a component divides by 0
+
+    Returns:
+        A, B, C, D (ndarray): Arrays of each ABCD entry of the circuit, with one value per frequency
+    """    
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    A = np.ones(len(angularFrequencies), dtype=complex)
+    B = np.zeros(len(angularFrequencies), dtype=complex)
+    C = np.zeros(len(angularFrequencies), dtype=complex)
+    D = np.ones(len(angularFrequencies), dtype=complex)
+
+    componentTable.CheckImpedances(angularFrequencies)
+    constantImpedances = componentTable.GetConstantImpedances()
+    connectionTypes = compTable.ComponentTable.CONNECTION_TYPES
+
+    for start in range(0, len(componentTable), chunkSize):
+        impedances = componentTable.GetImpedances(angularFrequencies, start, start + chunkSize)
+        for index in range(start, min(start + chunkSize, len(componentTable))):
+            connectionCode, typeCode = componentTable.connectionCodes[index], componentTable.typeCodes[index]
+            if connectionCode == 2: A, B, C, D = CascadeMatrix(A, B, C, D, tuple(componentTable.blocks[int(componentTable.componentValues[index])].tolist()))
+            elif connectionCode == 3:
+                sectionTable, count = componentTable.sections[int(componentTable.componentValues[index])]
+                A, B, C, D = CascadeMatrix(A, B, C, D, PowerMatrix(*CalculateTableCoefficients(sectionTable, angularFrequencies, chunkSize), count))
+            elif typeCode <= 1:     A, B, C, D = CascadeComponent(A, B, C, D, connectionTypes[connectionCode], float(constantImpedances[index]))
+            else:                   A, B, C, D = CascadeComponent(A, B, C, D, connectionTypes[connectionCode], impedances[index - start])
+
+    return A, B, C, D
+
+def CascadeRow(first, second, connectionType, impedance):
+    """
+    Cascades a single component onto one row of the ABCD Matrix, either (A, B) or (C, D). Each row of the product only depends on the same row of the
+    circuit, so this is the same closed form as CascadeComponent for one row.
+
+        Series:     [first second] [1 Z]  =  [first  second + first*Z]
+                                   [0 1]
+
+        Parallel:   [first second] [1 0]  =  [first + second*Y  second]
+                                   [Y 1]
+
+    Args:
+        first (complex or ndarray): First entry of the row, A or C
+        second (complex or ndarray): Second entry of the row, B or D
+        connectionType (str): The type of connection, 'S' for Series and 'P' for Parallel
+        impedance (complex or ndarray): The impedance of the component
+
+    Returns:
+        first, second (complex or ndarray): Updated entries of the row
+    """    
+    if np.ndim(impedance) == 0:
+        if impedance == 0: return first, second
+        if connectionType == "S":   second += first*impedance
+        elif connectionType == "P": first += second*(1/impedance)
+        return first, second
+
+    if connectionType == "S":
+        second += first*impedance
+    elif connectionType == "P":
+        first += second*np.divide(1, impedance, out=np.zeros_like(impedance), where=(impedance != 0))
+    return first, second
+
+def CalculateRowCoefficients(circuitComponents, rowIndex, angularFrequencies, chunkSize=256):
+    """
+    Calculates one row of the ABCD Matrix of the circuit at every frequency, which is (A, B) for row 0 and (C, D) for row 1. This is used when the
+    requested outputs only need one row, and the entries are identical to the same row from CalculateCoefficients.
+
+    Args:
+        circuitComponents (list or ComponentTable): List of the circuit component data or compiled circuit entries
+        rowIndex (int): 0 for the (A, B) row or 1 for the (C, D) row
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        chunkSize (int, optional): Number of components that the impedances are calculated for at once. Defaults to 256
+
+    Raises:
+        ZeroDivisionError: Raised when the impedance of a component divides by 0
+
+    Returns:
+        first, second (ndarray): Arrays of the entries of the row, with one value per frequency
+    """    
+    if not isinstance(circuitComponents, compTable.ComponentTable): circuitComponents = compTable.ComponentTable.FromComponents(circuitComponents)
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    first = np.full(len(angularFrequencies), 1 - rowIndex, dtype=complex)
+    second = np.full(len(angularFrequencies), rowIndex, dtype=complex)
+
+    circuitComponents.CheckImpedances(angularFrequencies)
+    constantImpedances = circuitComponents.GetConstantImpedances()
+    connectionTypes = compTable.ComponentTable.CONNECTION_TYPES
+
+    for start in range(0, len(circuitComponents), chunkSize):
+        impedances = circuitComponents.GetImpedances(angularFrequencies, start, start + chunkSize)
+        for index in range(start, min(start + chunkSize, len(circuitComponents))):
+            connectionCode, typeCode = circuitComponents.connectionCodes[index], circuitComponents.typeCodes[index]
+            if connectionCode == 2:
+                blockA, blockB, blockC, blockD = circuitComponents.blocks[int(circuitComponents.componentValues[index])].tolist()
+                first, second = first*blockA + second*blockC, first*blockB + second*blockD
+            elif connectionCode == 3:
+                sectionTable, count = circuitComponents.sections[int(circuitComponents.componentValues[index])]
+                blockA, blockB, blockC, blockD = PowerMatrix(*CalculateTableCoefficients(sectionTable, angularFrequencies, chunkSize), count)
+                first, second = first*blockA + second*blockC, first*blockB + second*blockD
+            elif typeCode <= 1: first, second = CascadeRow(first, second, connectionTypes[connectionCode], float(constantImpedances[index]))
+            else:               first, second = CascadeRow(first, second, connectionTypes[connectionCode], impedances[index - start])
+
+    return first, second
+
+def GetAdaptiveFrequencies(circuitComponents, startFrequency, endFrequency, numberOfFrequencies, logBoolean, loadImpedance, tolerance=0.05, pointBudget=10000):
+    """
+    Gets a non-uniform list of frequencies that is refined near resonances. The sweep starts from the normal grid from GetFrequencies, then every interval
+    where Av or Zin changes by more than the tolerance is split in half, until every interval is within the tolerance or the point budget is reached.
+
+    The change across an interval is measured as |log(H2 / H1)|, where the real part is the change in log magnitude and the imaginary part is the change
+    in phase, so the tolerance is in nepers and radians. When the budget cannot split every interval, the intervals with the largest change are split first.
+
+    Args:
+        circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+        startFrequency (float): The starting frequency
+        endFrequency (float): The ending frequency
+        numberOfFrequencies (float): Number of frequencies in the starting grid
+        logBoolean (boolean): Boolean to split the intervals at the geometric mean instead of the arithmetic mean
+        loadImpedance (float): Impedance of the load
+        tolerance (float, optional): Largest change allowed across an interval. Defaults to 0.05
+        pointBudget (int, optional): Largest number of frequencies to return. Defaults to 10000
+
+    Returns:
+        frequencies (ndarray): Sorted frequencies for the system to analyse the circuit over
+    """    
+    def GetResponses(frequencies):
+        """
+        Gets Av and Zin at the frequencies, which are the responses that are checked for changes
+
+        Args:
+            frequencies (ndarray): Frequencies to evaluate
+
+        Returns:
+            ndarray: (2, N) array of Av and Zin
+        """        
+        A, B, C, D = CalculateCoefficients(circuitComponents, 2*math.pi*frequencies)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.array([loadImpedance / (A * loadImpedance + B), (A * loadImpedance + B) / (C * loadImpedance + D)])
+
+    frequencies = GetFrequencies(startFrequency, endFrequency, numberOfFrequencies, logBoolean)
+    responses = GetResponses(frequencies)
+    smallestInterval = abs(endFrequency - startFrequency) * 1e-12
+
+    while len(frequencies) < pointBudget:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes = np.max(np.abs(np.log(responses[:, 1:] / responses[:, :-1])), axis=0)
+        changes = np.where(np.isnan(changes), np.inf, changes)       # Responses that are zero or infinite are refined as much as possible
+        changes[np.diff(frequencies) <= smallestInterval] = 0
+
+        refineIndices = np.nonzero(changes > tolerance)[0]
+        if len(refineIndices) == 0: break
+        if len(refineIndices) > pointBudget - len(frequencies):
+            refineIndices = refineIndices[np.argsort(changes[refineIndices])[::-1][:pointBudget - len(frequencies)]]
+
+        lowerFrequencies = frequencies[refineIndices]
+        upperFrequencies = frequencies[refineIndices + 1]
+        if logBoolean and np.all(lowerFrequencies > 0): newFrequencies = np.sqrt(lowerFrequencies * upperFrequencies)
+        else:                                           newFrequencies = (lowerFrequencies + upperFrequencies) / 2
+
+        frequencies = np.concatenate((frequencies, newFrequencies))
+        responses = np.concatenate((responses, GetResponses(newFrequencies)), axis=1)
+        order = np.argsort(frequencies, kind="stable")
+        frequencies = frequencies[order]
+        responses = responses[:, order]
+
+    return frequencies
+
+def MultiplyComplex(first, second, out=None):
+    """
+    Multiplies complex arrays from their real and imaginary parts. The vectorized complex product of numpy may fuse the multiplications and additions,
+    which changes the last bit of values that nearly cancel, such as the imaginary part of a real power. Separate operations round in the same way as
+    the product of single values, so the outputs are identical to the values calculated one frequency at a time.
+
+    Args:
+        first (ndarray): First complex array
+        second (ndarray): Second complex array
+        out (ndarray, optional): Array to write the product into, which can be one of the inputs. Defaults to a new array
+
+    Returns:
+        product (ndarray): Product of the arrays
+    """
+    first, second = np.asarray(first, dtype=complex), np.asarray(second, dtype=complex)
+    product = np.empty(np.broadcast(first, second).shape, dtype=complex) if out is None else out
+    realPart = first.real*second.real - first.imag*second.imag
+    imaginaryPart = first.real*second.imag + first.imag*second.real
+    product.real, product.imag = realPart, imaginaryPart
+    return product
+
+# Names of the outputs in the order of DataReading.InsertOutputIndex, and the terms that each output and shared term is calculated from
+OUTPUT_NAMES = ("Vin", "Vout", "Iin", "Iout", "Pin", "Pout", "Zin", "Zout", "Av", "Ai", "Ap", "T")
+OUTPUT_DEPENDENCIES = {"inputNumerator": ("A", "B"), "loadProduct": ("C",), "inputDenominator": ("loadProduct", "D"), "sourceProduct": ("D",),
+                       "Zin": ("inputNumerator", "inputDenominator"), "Zout": ("sourceProduct", "A", "B", "C"), "Av": ("inputNumerator",),
+                       "Ai": ("inputDenominator",), "Ap": ("Av", "Ai"), "T": ("inputNumerator", "loadProduct", "sourceProduct"),
+                       "Pin": ("Vin", "Iin"), "Vout": ("Vin", "Av"), "Iout": ("Iin", "Ai"), "Pout": ("Vout", "Iout")}
+SOURCE_DEPENDENCIES = {True:  {"Vin": ("Zin",), "Iin": ("Vin", "Zin")},         # Thevenin source
+                       False: {"Iin": ("Zin",), "Vin": ("Iin", "Zin")}}         # Norton source
+
+def GetOutputDependencies(outputIndexes, theveninBoolean):
+    """
+    Gets every output, shared term and ABCD entry that the requested outputs are calculated from, by walking the dependency graph of the outputs
+
+    Example:
+        GetOutputDependencies([8], True)            # {"Av", "inputNumerator", "A", "B"}, so only the A and B entries are needed
+
+    Args:
+        outputIndexes (list): List of the indexes of the requested outputs
+        theveninBoolean (bool): Boolean for a Thevenin source, otherwise the source is a Norton source
+
+    Returns:
+        requiredTerms (set): Set of the names of every term that is needed
+    """
+    dependencies = dict(OUTPUT_DEPENDENCIES, **SOURCE_DEPENDENCIES[theveninBoolean])
+    requiredTerms = set()
+    remainingTerms = [OUTPUT_NAMES[outputIndex] for outputIndex in outputIndexes]
+    while remainingTerms:
+        term = remainingTerms.pop()
+        if term in requiredTerms: continue
+        requiredTerms.add(term)
+        remainingTerms.extend(dependencies.get(term, ()))
+    return requiredTerms
+
+def GetRequiredRows(outputIndexes, theveninBoolean):
+    """
+    Gets the rows of the ABCD Matrix that the requested outputs need. The rows of a cascade are independent, as every component multiplies the matrix from
+    the right, so a row that is not needed does not have to be calculated.
+
+    Args:
+        outputIndexes (list): List of the indexes of the requested outputs
+        theveninBoolean (bool): Boolean for a Thevenin source, otherwise the source is a Norton source
+
+    Returns:
+        tuple: Indexes of the required rows, 0 for (A, B) and 1 for (C, D)
+    """
+    requiredTerms = GetOutputDependencies(outputIndexes, theveninBoolean)
+    return tuple(rowIndex for rowIndex, entries in enumerate((("A", "B"), ("C", "D"))) if requiredTerms.intersection(entries))
+
+def CalculateOutputs(A, B, C, D, inputSource, sourceImpedance, loadImpedance, outputBlock=None, outputIndexes=None):
+    """
+    Calculates the output values from the ABCD entries of the circuit. The entries can be arrays of any shape, so every frequency (and every sample of
+    a tolerance analysis) is calculated at once. The values are identical to calculating each frequency on its own.
+
+    The source value, source impedance and load impedance can also be arrays, which broadcast against the entries. The ABCD Matrix does not depend on
+    the terminations, so a grid of terminations from DataReading.GetTerminations is calculated from one sweep by passing entries of shape (N, 1):
+        CalculateOutputs(A[:, np.newaxis], ..., ('V', sourceValues), sourceImpedances, loadImpedances)      # (12, N, terminations) block
+
+    A*ZL + B and C*ZL + D are each calculated once and shared by Zin, Av, Ai and T, and the source type is checked once for the whole block. Every
+    output is written into its row of the output block, so a sweep can reuse one block for every chunk. When only some outputs are requested, only the
+    terms that they depend on are calculated, and the entries that are not needed can be None.
+
+    The order of the outputs matches DataReading.InsertOutputIndex:
+        [Vin (0), Vout (1), Iin (2), Iout (3), Pin (4), Pout (5), Zin (6), Zout (7), Av (8), Ai (9), Ap (10), T (11)]
+
+    Args:
+        A (ndarray): A entry of the circuit ABCD Matrix
+        B (ndarray): B entry of the circuit ABCD Matrix
+        C (ndarray): C entry of the circuit ABCD Matrix
+        D (ndarray): D entry of the circuit ABCD Matrix
+        inputSource (tuple): Source in the form (Source Type, Source Value), where the value can be an array
+        sourceImpedance (float or ndarray): Impedance of the source
+        loadImpedance (float or ndarray): Impedance of the load
+        outputBlock (ndarray, optional): (12, ...) complex array to write the outputs into, with the broadcast shape of the entries and terminations after the first axis.
+                                         Defaults to a new array
+        outputIndexes (list, optional): List of the indexes of the requested outputs. Defaults to every output
+
+    Returns:
+        outputBlock (ndarray): (12, ...) array, where each row is an output value. Rows of the outputs that are not needed are left unchanged
+    """    
+    theveninBoolean = "V" in inputSource[0]
+    requiredTerms = GetOutputDependencies(range(12) if outputIndexes is None else outputIndexes, theveninBoolean)
+    A, B, C, D = (None if entry is None else np.asarray(entry, dtype=complex) for entry in (A, B, C, D))
+    if outputBlock is None: outputBlock = np.empty((12,) + np.broadcast(*[entry for entry in (A, B, C, D) if entry is not None], inputSource[1], sourceImpedance, loadImpedance).shape,
+                                                   dtype=complex)
+    inputVoltage, outputVoltage, inputCurrent, outputCurrent, inputPower, outputPower, inputImpedance, outputImpedance, voltageGain, currentGain, powerGain, transmittance = outputBlock
+
+    # Shared terms, in the same order of operations as the separate equations
+    if "loadProduct" in requiredTerms:      loadProduct = C * loadImpedance
+    if "inputNumerator" in requiredTerms:   inputNumerator = A * loadImpedance + B
+    if "inputDenominator" in requiredTerms: inputDenominator = loadProduct + D
+    if "sourceProduct" in requiredTerms:    sourceProduct = D * sourceImpedance
+
+    if "Zin" in requiredTerms:  np.divide(inputNumerator, inputDenominator, out=inputImpedance)
+    if "Zout" in requiredTerms: np.divide(sourceProduct + B, C * sourceImpedance + A, out=outputImpedance)
+    if "Av" in requiredTerms:   np.divide(loadImpedance, inputNumerator, out=voltageGain)
+    if "Ai" in requiredTerms:   np.divide(1, inputDenominator, out=currentGain)
+    if "Ap" in requiredTerms:   MultiplyComplex(voltageGain, np.conj(currentGain), out=powerGain)
+    if "T" in requiredTerms:    np.divide(2, inputNumerator + loadProduct * sourceImpedance + sourceProduct, out=transmittance)
+
+    if theveninBoolean:
+        if "Vin" in requiredTerms: np.multiply(inputSource[1], inputImpedance / (sourceImpedance + inputImpedance), out=inputVoltage)
+        if "Iin" in requiredTerms: np.divide(inputVoltage, inputImpedance, out=inputCurrent)
+    else:
+        if "Iin" in requiredTerms: np.multiply(inputSource[1], sourceImpedance / (sourceImpedance + inputImpedance), out=inputCurrent)
+        if "Vin" in requiredTerms: MultiplyComplex(inputCurrent, inputImpedance, out=inputVoltage)
+
+    if "Pin" in requiredTerms:  MultiplyComplex(inputVoltage, np.conj(inputCurrent), out=inputPower)
+    if "Vout" in requiredTerms: MultiplyComplex(inputVoltage, voltageGain, out=outputVoltage)
+    if "Iout" in requiredTerms: MultiplyComplex(inputCurrent, currentGain, out=outputCurrent)
+    if "Pout" in requiredTerms: MultiplyComplex(outputVoltage, np.conj(outputCurrent), out=outputPower)
+    return outputBlock
 
 # =================================================================================================
 # =========================================== MAIN CODE ===========================================
@@ -262,23 +1019,15 @@ def main():
     # ===================== COMMAND LINE =====================
     # ========================================================
 
-    netFileName, csvFileName, pngFileName, userColumns, graphBoolean = ReadCommandLine(sys.argv[1:])
+    netFileName, csvFileName, pngFileName, userColumns, graphBoolean, runOptions = ReadCommandLine(sys.argv[1:])
 
     # ========================================================
     # ===================== FILE READING =====================
     # ========================================================
 
-    dataWrite.CreateFile(csvFileName)
-    circuitText, termsText, outputText = dataRead.ReadFile(netFileName)
-
-    print("READING CIRCUIT BLOCK")
-    circuitComponents = dataRead.GetCircuitComponents(circuitText)
-
-    print("READING TERMS BLOCK")
-    inputSource, sourceImpedance, loadImpedance, startFrequency, endFrequency, numberOfFrequencies, logarithmicSweepBoolean = dataRead.GetTerms(termsText)
-    
-    print("READING OUTPUT BLOCK")
-    outputTerms = dataRead.GetOutputOrder(outputText)
+    if runOptions["columnFormat"] == "csv": outputWriter = dataWrite.CsvWriter(csvFileName, runOptions["bufferSize"])       # Creates the file and keeps it open for the whole sweep
+    circuitComponents, termsList, outputTerms = dataRead.ReadNetlist(netFileName, runOptions["cacheBoolean"], runOptions["workers"], runOptions["nodeMode"])
+    inputSource, sourceImpedance, loadImpedance, startFrequency, endFrequency, numberOfFrequencies, logarithmicSweepBoolean = termsList
 
     dataRead.CheckEmptyListError(circuitComponents, "CIRCUIT")
     dataRead.CheckEmptyListError(outputTerms, "OUTPUT")
@@ -287,8 +1036,25 @@ def main():
     if (((len(outputTerms)*2)) < max(userColumns)) or (min(userColumns) <= 0): raise IndexError("Column " + str(max(userColumns)) + 
                                                                                           " is out of range. Enter a value between 1-" + str(((len(outputTerms)*2))))
 
-    # Write to the file to get the initial format
-    dataWrite.InitialiseFile(csvFileName, outputTerms)   
+    # Lists and ranges in the TERMS block make a grid of terminations, which are all calculated from the same ABCD entries
+    sourceValues, sourceImpedances, loadImpedances = dataRead.GetTerminations(termsList)
+    numberOfTerminations = len(loadImpedances)
+    if numberOfTerminations > 1:
+        if graphBoolean or runOptions["adaptiveTolerance"] or runOptions["analysisBoolean"] or runOptions["sensitivityBoolean"] or runOptions["toleranceBoolean"]:
+            raise ValueError("Options -p, -f, -a, -s and -t need a single termination, but the TERMS block has " + str(numberOfTerminations) + "\n Please Check TERMS")
+        inputSource, sourceImpedance, loadImpedance = (inputSource[0], sourceValues), sourceImpedances, loadImpedances
+        terminations = (inputSource[0], sourceValues, sourceImpedances, loadImpedances)
+    else:
+        terminations = None
+
+    # Write to the file to get the initial format, with a file for each termination of a grid
+    if runOptions["columnFormat"] == "csv":
+        if terminations is None: outputWriter.WriteHeader(outputTerms)
+        else:
+            outputWriter.Close()
+            outputWriter = dataWrite.TerminationWriter(csvFileName, outputTerms, *terminations, runOptions["bufferSize"])
+    elif runOptions["columnFormat"] == "npz": outputWriter = dataWrite.ColumnWriter(csvFileName.replace(".csv", ".npz"), "npz", outputTerms, terminations)
+    else:                                     outputWriter = dataWrite.ColumnWriter(csvFileName.replace(".csv", "_columns"), "raw", outputTerms, terminations)
     
     # ===============================================================================
     # =============================== DATA PROCESSING ===============================
@@ -296,45 +1062,98 @@ def main():
 
     print("PROCESSING DATA")
 
-    outputValues = {"inputVoltage": 0, "outputVoltage": 0, "inputCurrent": 0, "outputCurrent": 0, "inputPower": 0, "outputPower": 0, "inputImpedance": 0, "outputImpedance": 0,
-        "voltageGain": 0, "currentGain": 0, "powerGain": 0, "transmittance": 0,}
+    # Fold the frequency independent components so that only the reactive components are evaluated at each frequency
+    compiledComponents = CompileCircuit(circuitComponents)
+    # The budget is shared by every chunk that the streaming sweep holds at once, which is more than one when the workers evaluate ahead
+    chunkSize = sweepExec.GetChunkSize(runOptions["memoryBudget"] // sweepExec.GetChunksInFlight(runOptions["workers"]),
+                                       GetBytesPerFrequency(len(compiledComponents), len(outputTerms)*2, numberOfTerminations))
 
     # For logspace, apply a log function to the frequencies so that the values are the base of the exponent
-    frequencies = GetFrequencies(startFrequency, endFrequency, numberOfFrequencies, logarithmicSweepBoolean)
+    # The whole grid is only built for the options that need every frequency, otherwise it is generated a chunk at a time
+    if runOptions["adaptiveTolerance"]:
+        frequencies = GetAdaptiveFrequencies(compiledComponents, startFrequency, endFrequency, numberOfFrequencies, logarithmicSweepBoolean, loadImpedance,
+                                             runOptions["adaptiveTolerance"], runOptions["pointBudget"])
+    elif runOptions["rationalFile"] or runOptions["analysisBoolean"] or runOptions["sensitivityBoolean"] or runOptions["toleranceBoolean"]:
+        frequencies = GetFrequencies(startFrequency, endFrequency, numberOfFrequencies, logarithmicSweepBoolean)
+    else:
+        frequencies = None
+
+    if frequencies is None: frequencyChunks = GenerateFrequencyChunks(startFrequency, endFrequency, numberOfFrequencies, logarithmicSweepBoolean, chunkSize)
+    else:                   frequencyChunks = (frequencies[start:start + chunkSize] for start in range(0, len(frequencies), chunkSize))
+
+    # Only the outputs in the OUTPUT block are calculated, and a row of the ABCD Matrix that none of them need is skipped by the cascade engines
+    outputIndexes = sorted(set(outputTerm[0] for outputTerm in outputTerms))
+    requiredRows = GetRequiredRows(outputIndexes, "V" in inputSource[0])
+    entryNames = ("A", "B", "C", "D") if (len(requiredRows) != 1 or runOptions["mnaBoolean"]) else (("A", "B"), ("C", "D"))[requiredRows[0]]
+
+    # The rational functions of high order circuits lose their accuracy, so they are checked against the cascade at a few frequencies before they are used
+    rationalCircuit = None
+    if runOptions["rationalFile"] or runOptions["analysisBoolean"]:
+        sampleFrequencies = circuitPoly.GetSampleFrequencies(2*math.pi*frequencies)
+        sampleCoefficients = CalculateCoefficients(compiledComponents, sampleFrequencies)
+    if runOptions["rationalFile"]:
+        rationalCircuit = circuitPoly.GetRationalCircuit(runOptions["rationalFile"], compiledComponents, circuitPoly.GetAngularScale(2*math.pi*frequencies))
+        if not circuitPoly.CheckRationalCircuit(rationalCircuit, sampleFrequencies, sampleCoefficients):
+            warnings.warn("WARNING: The rational functions of the circuit do not match the cascade, as the circuit order is too high for them to be accurate. "
+                          "Evaluating with the cascade instead")
+            rationalCircuit = None
 
     # SUPPORTING MATHEMATICS IS LINKED AT THE TOP OF THE FILE
-    for frequency in frequencies:
-        ABCDMatrix = CalculateMatrix(circuitComponents, 2*math.pi*frequency)
-
-        A_C = ABCDMatrix[0, 0]
-        B_C = ABCDMatrix[0, 1]
-        C_C = ABCDMatrix[1, 0]
-        D_C = ABCDMatrix[1, 1]
-
-        # Check for zero values and perform maths
-        try:
-            outputValues["inputImpedance"] = (A_C * loadImpedance + B_C) / (C_C * loadImpedance + D_C)
-            outputValues["outputImpedance"] = (D_C * sourceImpedance + B_C) / (C_C * sourceImpedance + A_C)
-            outputValues["voltageGain"] = loadImpedance / (A_C * loadImpedance + B_C)
-            outputValues["currentGain"] = 1 / (C_C * loadImpedance + D_C)
-            outputValues["powerGain"] = outputValues["voltageGain"] * np.conj(outputValues["currentGain"])
-            outputValues["transmittance"] = 2 / (A_C * loadImpedance+B_C + C_C * loadImpedance * sourceImpedance + D_C * sourceImpedance)
-
-            if "V" in inputSource[0]:
-                outputValues["inputVoltage"] = inputSource[1] * (outputValues["inputImpedance"] / (sourceImpedance + outputValues["inputImpedance"]))
-                outputValues["inputCurrent"] = outputValues["inputVoltage"] / outputValues["inputImpedance"]
-            else:
-                outputValues["inputCurrent"] = inputSource[1] * (sourceImpedance / (sourceImpedance + outputValues["inputImpedance"]))
-                outputValues["inputVoltage"] = outputValues["inputCurrent"] * outputValues["inputImpedance"]
-        except:
-            raise ZeroDivisionError("Division by Zero has occurred in Output Calculations! Please check the CIRCUIT and TERMS Blocks in: " + netFileName)    
-        
-        outputValues["inputPower"] = outputValues["inputVoltage"] * np.conj(outputValues["inputCurrent"])
-        outputValues["outputVoltage"] = outputValues["inputVoltage"] * outputValues["voltageGain"]
-        outputValues["outputCurrent"] = outputValues["inputCurrent"] * outputValues["currentGain"]
-        outputValues["outputPower"] = outputValues["outputVoltage"] * np.conj(outputValues["outputCurrent"])
-        
-        dataWrite.WriteDataToFile(outputTerms, list(outputValues.values()), csvFileName, frequency)
+    if runOptions["mnaBoolean"]:
+        import CircuitMNA as circuitMNA
+        sweepFunction, sweepArguments = circuitMNA.CalculateNetworkCoefficients, (circuitMNA.CompileNetwork(circuitComponents.Expand()),)
+    elif rationalCircuit is not None:
+        if len(entryNames) == 4: sweepFunction, sweepArguments = circuitPoly.EvaluateRationalCircuit, (rationalCircuit,)
+        else:                    sweepFunction, sweepArguments = circuitPoly.EvaluateRationalRow, (rationalCircuit, requiredRows[0])
+    else:
+        if len(entryNames) == 4: sweepFunction, sweepArguments = CalculateCoefficients, (compiledComponents,)
+        else:                    sweepFunction, sweepArguments = CalculateRowCoefficients, (compiledComponents, requiredRows[0])
+
+    # Each stage takes the chunks of the stage before it as they are needed: frequencies, ABCD entries, outputs and then the rows of the file
+    # The writer has finished with the outputs of a chunk before the next chunk is calculated, so one output block is reused for every chunk
+    # For a grid of terminations, the entries become (N, 1) columns that broadcast against the terminations into a (12, N, terminations) block
+    outputBlock = np.empty((12, chunkSize) + (() if terminations is None else (numberOfTerminations,)), dtype=complex)
+    for frequencyChunk, entries in sweepExec.StreamSweep(sweepFunction, sweepArguments, frequencyChunks, runOptions["workers"], runOptions["backend"]):
+        if terminations is not None: entries = [entry[:, np.newaxis] for entry in entries]
+        entries = dict(zip(entryNames, entries))
+        outputColumns = CalculateOutputs(entries.get("A"), entries.get("B"), entries.get("C"), entries.get("D"), inputSource, sourceImpedance, loadImpedance,
+                                         outputBlock[:, :len(frequencyChunk)], outputIndexes)
+        outputWriter.WriteRows(outputTerms, outputColumns, frequencyChunk)
+    outputWriter.Close()
+
+    # Analyse the transfer functions directly from the rational functions of the circuit
+    if runOptions["analysisBoolean"]:
+        print("ANALYSING CIRCUIT")
+        if rationalCircuit is None: rationalCircuit = circuitPoly.CompileRationalCircuit(compiledComponents, circuitPoly.GetAngularScale(2*math.pi*frequencies))
+        if not circuitPoly.CheckRationalCircuit(rationalCircuit, sampleFrequencies, sampleCoefficients):
+            warnings.warn("WARNING: Circuit analysis skipped: the rational functions of the circuit do not match the cascade, as the circuit order is too high for them to be accurate")
+        else:
+            try:
+                analysisResults = circuitPoly.AnalyseRationalCircuit(rationalCircuit, sourceImpedance, loadImpedance)
+                dataWrite.WriteAnalysisSummary(csvFileName.replace(".csv", "_summary.txt"), analysisResults)
+            except (OverflowError, np.linalg.LinAlgError) as error:
+                warnings.warn("WARNING: Circuit analysis skipped: " + str(error))
+
+    # Sensitivities use the components before compilation with every REPEAT section written out, so that every component has its own derivative
+    if runOptions["sensitivityBoolean"]:
+        print("CALCULATING SENSITIVITIES")
+        import CircuitSensitivity as circuitSens
+        expandedComponents = circuitComponents.Expand()
+        sensitivities = circuitSens.CalculateSensitivities(expandedComponents, 2*math.pi*frequencies, inputSource, sourceImpedance, loadImpedance)
+        dataWrite.WriteSensitivityFile(csvFileName.replace(".csv", "_sensitivity.csv"), dataRead.GetComponentLabels(expandedComponents.GetNodeComponents()), frequencies, sensitivities)
+
+    # Tolerance analysis evaluates every random circuit at once, using the components before compilation as each sample has different values
+    if runOptions["toleranceBoolean"]:
+        print("CALCULATING TOLERANCES")
+        import CircuitTolerance as circuitTol
+        toleranceText = dataRead.ReadOptionalBlock(netFileName, "TOLERANCE")
+        dataRead.CheckEmptyListError(dataRead.RemoveEmptyElements(toleranceText.split("\n")), "TOLERANCE")
+        toleranceSettings = dataRead.GetTolerances(toleranceText)
+        expandedComponents = circuitComponents.Expand()
+        componentTolerances = dataRead.GetComponentTolerances(expandedComponents.GetNodeComponents(), toleranceSettings)
+        toleranceBands = circuitTol.CalculateToleranceBands(expandedComponents, componentTolerances, 2*math.pi*frequencies, inputSource, sourceImpedance, loadImpedance,
+                                                            outputTerms, toleranceSettings["samples"], toleranceSettings["seed"])
+        dataWrite.WriteToleranceFile(csvFileName.replace(".csv", "_tolerance.csv"), outputTerms, frequencies, toleranceBands)
 
     print("WRITING DATA")
 
@@ -0,0 +1,182 @@
+# ====================================================================================================================================
+#   Filename:     CircuitMNA.py
+#   Summary:      The module that analyses circuits that are not a cascade, using modified nodal analysis
+#   Description:  This is a set of functions that build the sparse nodal admittance matrix of any network of R, G, L and C components,
+#                 such as bridged-T and lattice networks that cannot be written as a series/parallel ladder. The network is reduced to
+#                 the two-port between the input and output nodes at every frequency, and converted into the same ABCD entries as the
+#                 cascade, so every output is written through the same path. The sparsity pattern, the stamping of the components and
+#                 the fill-reducing ordering are found once, so each frequency is only a numerical factorisation.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.linalg as sparseLinalg
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+# ===================================================================================================================================
+# ========================================================== ADMITTANCES ============================================================
+# ===================================================================================================================================
+
+def GetComponentAdmittances(componentTable, angularFrequencies):
+    """
+    Gets the admittance of every component at every frequency, using a boolean mask for each component type
+
+    Args:
+        componentTable (ComponentTable): Table of the circuit components
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Raises:
+        ZeroDivisionError: Raised for the first component with an admittance that divides by 0, which is a resistor or inductor of 0, or an inductor at 0 Hz
+
+    Returns:
+        admittances (ndarray): (components, frequencies) array of the admittances
+    """
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    typeCodes, componentValues = componentTable.typeCodes, componentTable.componentValues
+
+    failedMask = ((typeCodes == 0) | (typeCodes == 2)) & (componentValues == 0)
+    failedMask |= (typeCodes == 2) & bool(np.any(angularFrequencies == 0))
+    if np.any(failedMask):
+        raise ZeroDivisionError("Cannot divide by 0:\n(Connection Type, Component Type, Component Value, Exponent)\n" + " ".join(str(componentTable[int(np.argmax(failedMask))])))
+
+    admittances = np.zeros((len(componentTable), len(angularFrequencies)), dtype=complex)
+    resistorMask, conductorMask, inductorMask, capacitorMask = (typeCodes == 0), (typeCodes == 1), (typeCodes == 2), (typeCodes == 3)
+    admittances[resistorMask] = 1/componentValues[resistorMask, np.newaxis]
+    admittances[conductorMask] = componentValues[conductorMask, np.newaxis]
+    admittances[inductorMask] = 1/(1j*angularFrequencies[np.newaxis, :]*componentValues[inductorMask, np.newaxis])
+    admittances[capacitorMask] = 1j*angularFrequencies[np.newaxis, :]*componentValues[capacitorMask, np.newaxis]
+    return admittances
+
+# ===================================================================================================================================
+# ========================================================== NETWORK ================================================================
+# ===================================================================================================================================
+
+def GetStampMatrix(targets, componentIndexes, signs, numberOfTargets, numberOfComponents):
+    """
+    Gets the sparse matrix that stamps the component admittances onto the entries of the admittance matrix, so that every entry at every frequency is
+    found with one sparse product: entries = stampMatrix @ admittances
+
+    Args:
+        targets (ndarray): Index of the entry that each stamp adds to
+        componentIndexes (ndarray): Index of the component of each stamp
+        signs (ndarray): Sign of each stamp, +1 on the diagonal and -1 off the diagonal
+        numberOfTargets (int): Number of entries
+        numberOfComponents (int): Number of components
+
+    Returns:
+        scipy.sparse.csr_matrix: (entries, components) stamp matrix
+    """
+    return sparse.csr_matrix((signs, (targets, componentIndexes)), shape=(numberOfTargets, numberOfComponents))
+
+def CompileNetwork(componentTable):
+    """
+    Compiles the network for the frequency sweep. The lowest node label is the input and the highest node label is the output, the same as node 1 and
+    the last node of a cascade, with 0 as the common node. Every other node is internal and is removed at each frequency by the Schur complement
+
+        Yport = Ypp - Ypi * inv(Yii) * Yip
+
+    The internal nodes are put in reverse Cuthill-McKee order once and the compressed column pattern of Yii is built once, so each frequency only
+    fills in the values of the same pattern.
+
+    Args:
+        componentTable (ComponentTable): Table of the circuit components, including their nodes
+
+    Raises:
+        ValueError: Raised when the circuit does not have separate input and output nodes
+
+    Returns:
+        network (dict): Dictionary of the compiled network
+    """
+    if componentTable.nodes is None: raise ValueError("Component Table has no node data")
+    nodes = componentTable.nodes
+    labels = np.unique(nodes[nodes != 0])
+    if len(labels) < 2: raise ValueError("Invalid Circuit Connection: The network needs separate input and output nodes\n\nCheck CIRCUIT Block")
+
+    # Port nodes are 0 (input) and 1 (output), internal nodes follow in their fill-reducing order, and the common node is -1
+    nodeIndexes = np.searchsorted(labels, nodes)
+    nodeIndexes[nodes == 0] = -1
+    numberOfInternal = len(labels) - 2
+    matrixIndexes = np.full(len(labels), -1)
+    matrixIndexes[0], matrixIndexes[-1] = 0, 1
+    matrixIndexes[1:-1] = np.arange(2, numberOfInternal + 2)
+    nodeIndexes = np.where(nodeIndexes >= 0, matrixIndexes[np.maximum(nodeIndexes, 0)], -1)
+
+    # Stamps of each component: +Y on the diagonal of both nodes and -Y between them, skipping the common node
+    componentIndexes = np.arange(len(componentTable))
+    firstNodes, secondNodes = nodeIndexes[:, 0], nodeIndexes[:, 1]
+    rows = np.concatenate((firstNodes, secondNodes, firstNodes, secondNodes))
+    columns = np.concatenate((firstNodes, secondNodes, secondNodes, firstNodes))
+    stampComponents = np.tile(componentIndexes, 4)
+    signs = np.repeat([1.0, 1.0, -1.0, -1.0], len(componentTable))
+    validMask = (rows >= 0) & (columns >= 0)
+    rows, columns, stampComponents, signs = rows[validMask], columns[validMask], stampComponents[validMask], signs[validMask]
+
+    # Reverse Cuthill-McKee order of the internal nodes, found once from the pattern of Yii
+    internalMask = (rows >= 2) & (columns >= 2)
+    if numberOfInternal > 0:
+        pattern = sparse.csr_matrix((np.ones(np.count_nonzero(internalMask)), (rows[internalMask] - 2, columns[internalMask] - 2)), shape=(numberOfInternal, numberOfInternal))
+        internalOrder = np.argsort(reverse_cuthill_mckee(pattern, symmetric_mode=True))
+        rows = np.where(rows >= 2, internalOrder[np.maximum(rows - 2, 0)] + 2, rows)
+        columns = np.where(columns >= 2, internalOrder[np.maximum(columns - 2, 0)] + 2, columns)
+
+    # Compressed column pattern of Yii, the unique (column, row) keys are already in compressed column order
+    internalKeys = (columns[internalMask] - 2) * max(numberOfInternal, 1) + (rows[internalMask] - 2)
+    uniqueKeys, internalSlots = np.unique(internalKeys, return_inverse=True)
+    network = {"numberOfInternal": numberOfInternal, "componentTable": componentTable,
+               "indices": (uniqueKeys % max(numberOfInternal, 1)).astype(np.int32),
+               "indptr": np.searchsorted(uniqueKeys // max(numberOfInternal, 1), np.arange(numberOfInternal + 1)).astype(np.int32)}
+    network["internalStamps"] = GetStampMatrix(internalSlots, stampComponents[internalMask], signs[internalMask], len(uniqueKeys), len(componentTable))
+
+    # Yip is stored as a dense (internal, 2) block and Ypp as a dense 2x2 block, both flattened in row order
+    couplingMask = (rows >= 2) & (columns < 2)
+    network["couplingStamps"] = GetStampMatrix((rows[couplingMask] - 2)*2 + columns[couplingMask], stampComponents[couplingMask], signs[couplingMask], numberOfInternal*2, len(componentTable))
+    portMask = (rows < 2) & (columns < 2)
+    network["portStamps"] = GetStampMatrix(rows[portMask]*2 + columns[portMask], stampComponents[portMask], signs[portMask], 4, len(componentTable))
+    return network
+
+def CalculateNetworkCoefficients(network, angularFrequencies, chunkSize=256):
+    """
+    Calculates the ABCD entries of the network at every frequency. The admittance matrix is reduced to the two-port Y parameters between the input and
+    output nodes, which are converted to ABCD entries with the output current leaving the network, the same as the cascade.
+
+    Supporting Mathematics:
+        A = -Y22/Y21    B = -1/Y21    C = -(Y11*Y22 - Y12*Y21)/Y21    D = -Y11/Y21
+
+    Args:
+        network (dict): Compiled network from CompileNetwork
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        chunkSize (int, optional): Number of frequencies that are stamped at once. Defaults to 256
+
+    Raises:
+        ZeroDivisionError: Raised when the network is singular, or when nothing is transmitted from the input to the output
+
+    Returns:
+        A, B, C, D (ndarray): Arrays of each ABCD entry of the network, with one value per frequency
+    """
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    numberOfInternal = network["numberOfInternal"]
+    portParameters = np.zeros((len(angularFrequencies), 2, 2), dtype=complex)
+
+    for start in range(0, len(angularFrequencies), chunkSize):
+        admittances = GetComponentAdmittances(network["componentTable"], angularFrequencies[start:start + chunkSize])
+        internalValues = network["internalStamps"] @ admittances
+        couplingValues = network["couplingStamps"] @ admittances
+        portValues = network["portStamps"] @ admittances
+
+        for index in range(admittances.shape[1]):
+            portParameters[start + index] = portValues[:, index].reshape(2, 2)
+            if numberOfInternal == 0: continue
+
+            coupling = couplingValues[:, index].reshape(numberOfInternal, 2)
+            internalMatrix = sparse.csc_matrix((internalValues[:, index], network["indices"], network["indptr"]), shape=(numberOfInternal, numberOfInternal))
+            try:
+                factorisation = sparseLinalg.splu(internalMatrix, permc_spec="NATURAL")       # The ordering was already applied by CompileNetwork
+            except RuntimeError:
+                raise ZeroDivisionError("Singular Network at " + str(angularFrequencies[start + index]/(2*np.pi)) + " Hz: Every node must be connected to the input, output or common node\n Please Check CIRCUIT")
+            portParameters[start + index] -= coupling.T @ factorisation.solve(coupling)
+
+    Y11, Y12, Y21, Y22 = portParameters[:, 0, 0], portParameters[:, 0, 1], portParameters[:, 1, 0], portParameters[:, 1, 1]
+    if not np.all(Y21): raise ZeroDivisionError("Division by Zero has occurred: Nothing is transmitted from the input node to the output node\n Please Check CIRCUIT")
+    return -Y22/Y21, -1/Y21, -(Y11*Y22 - Y12*Y21)/Y21, -Y11/Y21
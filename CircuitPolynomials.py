@@ -0,0 +1,511 @@
+# ====================================================================================================================================
+#   Filename:     CircuitPolynomials.py
+#   Summary:      The module that compiles the circuit into rational functions of s
+#   Description:  This is a set of functions that compile the cascade circuit into numerator polynomials in s = jw for each of the ABCD
+#                 entries, all divided by a common power of s. Once compiled, the ABCD Matrix at any frequency is found by evaluating the
+#                 polynomials with Horner's rule, so the cost per frequency depends on the order of the circuit and not on the number of
+#                 components. The compiled polynomials can be saved to a .npz file and reused across runs.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+import os
+
+# =============================================================================================================================
+# ========================================================== GENERAL ==========================================================
+# =============================================================================================================================
+
+def AddPolynomials(firstPolynomial, secondPolynomial):
+    """
+    Adds two polynomials together that have their coefficients in ascending powers. The shorter polynomial is padded with zeros.
+
+    Args:
+        firstPolynomial (ndarray): Coefficients of the first polynomial in ascending powers
+        secondPolynomial (ndarray): Coefficients of the second polynomial in ascending powers
+
+    Returns:
+        ndarray: Coefficients of the sum in ascending powers
+    """
+    length = max(len(firstPolynomial), len(secondPolynomial))
+    return np.pad(firstPolynomial, (0, length - len(firstPolynomial))) + np.pad(secondPolynomial, (0, length - len(secondPolynomial)))
+
+def GetComponentMonomial(individualComponent, angularScale=1.0):
+    """
+    Gets the immittance of a component as a monomial in the scaled variable x = s / angularScale. Series components use their impedance and parallel
+    components use their admittance, so that the cascade update is B += A*Z or A += B*Y.
+
+    The immittance of a component is in the form: coefficient * x^power, where the power is -1, 0 or 1
+
+    Args:
+        individualComponent (tuple): The component data in the form (Connection Type, Component Type, Component Value)
+        angularScale (float, optional): Angular frequency that s is scaled by to keep the coefficients within range. Defaults to 1.0
+
+    Raises:
+        ZeroDivisionError: Raised when the immittance of the component divides by 0
+        ValueError: Raised when the component type or connection type is unknown
+
+    Returns:
+        coefficient (float): Coefficient of the monomial, 0 when the component leaves the ABCD Matrix unchanged
+        power (int): Power of x in the monomial
+    """
+    connectionType, componentType, componentValue = individualComponent[:3]
+
+    # Impedance of each component in the form (coefficient, power)
+    try:
+        if   componentType == "R": impedance = (componentValue, 0)
+        elif componentType == "G": impedance = (1/componentValue, 0)
+        elif componentType == "L": impedance = (componentValue*angularScale, 1)
+        elif componentType == "C": impedance = (1/(componentValue*angularScale), -1)
+        else: raise ValueError("Unknown Component Found: " + str(individualComponent))
+    except ZeroDivisionError:
+        raise ZeroDivisionError("Cannot divide by 0:\n(Connection Type, Component Type, Component Value, Exponent)\n" + str(individualComponent))
+
+    if connectionType == "S": return impedance
+    if connectionType == "P":
+        if impedance[0] == 0: return (0, 0)         # A parallel component with no impedance is skipped, the same as CascadeCircuit.CascadeComponent
+        return (1/impedance[0], -impedance[1])
+    raise ValueError("Unknown Connection Type Found: " + str(individualComponent))
+
+def GetAngularScale(angularFrequencies):
+    """
+    Gets an angular frequency to scale s by, which is the geometric mean of the smallest and largest non-zero frequencies. This keeps the scaled
+    variable close to a magnitude of 1 in the middle of the sweep, which delays overflow, but it does not keep high order polynomials accurate, so
+    the compiled circuit is checked with CheckRationalCircuit before it is used.
+
+    Args:
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Returns:
+        float: Angular frequency to scale s by
+    """
+    angularFrequencies = np.abs(np.asarray(angularFrequencies, dtype=float))
+    angularFrequencies = angularFrequencies[angularFrequencies > 0]
+    if len(angularFrequencies) == 0: return 1.0
+    return float(np.sqrt(np.min(angularFrequencies) * np.max(angularFrequencies)))
+
+# ===================================================================================================================================
+# ========================================================== COMPILATION ============================================================
+# ===================================================================================================================================
+
+def ExpandSections(circuitComponents):
+    """
+    Expands the repeated section entries ('N') of the compiled circuit into their copies, as the polynomials are built one entry at a time
+
+    Args:
+        circuitComponents (list): List of the circuit component data or compiled circuit entries
+
+    Yields:
+        tuple: The next entry of the circuit
+    """
+    for individualComponent in circuitComponents:
+        if individualComponent[0] != "N":
+            yield individualComponent
+            continue
+        sectionEntries, count = individualComponent[2]
+        for copy in range(count): yield from ExpandSections(sectionEntries)
+
+def CompileRationalCircuit(circuitComponents, angularScale=1.0):
+    """
+    Compiles the circuit components into the numerator polynomials of the ABCD entries and their common denominator, which is a power of x.
+    The variable of the polynomials is x = s / angularScale, where s = jw.
+
+    Each entry is laid out as:
+        A(s) = (a0 + a1*x + a2*x^2 + ...) / x^denominatorPower
+
+    The polynomials are stored in descending powers so that they can be used with np.polyval and np.roots directly.
+
+    Args:
+        circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+        angularScale (float, optional): Angular frequency that s is scaled by. Defaults to 1.0
+
+    Returns:
+        rationalCircuit (dict): Dictionary containing the numerators "A", "B", "C", "D", the "denominatorPower" and the "angularScale"
+    """
+    # Polynomials are built in ascending powers, as that is simpler to shift when the denominator grows
+    numerators = {"A": np.array([1.0]), "B": np.array([0.0]), "C": np.array([0.0]), "D": np.array([1.0])}
+    denominatorPower = 0
+
+    for individualComponent in ExpandSections(circuitComponents):
+        if individualComponent[0] == "M":
+            blockA, blockB, blockC, blockD = individualComponent[2]
+            numerators = {"A": AddPolynomials(numerators["A"]*blockA, numerators["B"]*blockC), "B": AddPolynomials(numerators["A"]*blockB, numerators["B"]*blockD),
+                          "C": AddPolynomials(numerators["C"]*blockA, numerators["D"]*blockC), "D": AddPolynomials(numerators["C"]*blockB, numerators["D"]*blockD)}
+            continue
+
+        coefficient, power = GetComponentMonomial(individualComponent, angularScale)
+        if coefficient == 0: continue
+
+        # Dividing by x increases the common denominator, so every numerator is multiplied by x to keep the same value
+        if power < 0:
+            numerators = {entry: np.concatenate(([0.0], numerators[entry])) for entry in numerators}
+            denominatorPower += 1
+
+        if individualComponent[0] == "S": pairs = (("B", "A"), ("D", "C"))      # B += A*Z, D += C*Z
+        else:                             pairs = (("A", "B"), ("C", "D"))      # A += B*Y, C += D*Y
+
+        for target, source in pairs:
+            if   power < 0:  term = numerators[source][1:]                          # Removes the x that was just multiplied in
+            elif power == 0: term = numerators[source]
+            else:            term = np.concatenate(([0.0], numerators[source]))     # Multiplies by x
+            numerators[target] = AddPolynomials(numerators[target], term*coefficient)
+
+    rationalCircuit = {entry: np.trim_zeros(numerators[entry], "b")[::-1] for entry in numerators}
+    for entry in ("A", "B", "C", "D"):
+        if len(rationalCircuit[entry]) == 0: rationalCircuit[entry] = np.array([0.0])
+    rationalCircuit["denominatorPower"] = denominatorPower
+    rationalCircuit["angularScale"] = float(angularScale)
+    return rationalCircuit
+
+def GetDenominator(rationalCircuit):
+    """
+    Gets the common denominator of the ABCD entries as a polynomial in descending powers of x
+
+    Args:
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+
+    Returns:
+        ndarray: Coefficients of the denominator x^denominatorPower in descending powers
+    """
+    return np.concatenate(([1.0], np.zeros(rationalCircuit["denominatorPower"])))
+
+# ==================================================================================================================================
+# ========================================================== EVALUATION ============================================================
+# ==================================================================================================================================
+
+def EvaluatePolynomial(coefficients, x):
+    """
+    Evaluates a polynomial with Horner's rule over every value of x at once
+
+    Args:
+        coefficients (ndarray): Coefficients of the polynomial in descending powers
+        x (ndarray): Values to evaluate the polynomial at
+
+    Returns:
+        ndarray: Value of the polynomial at each x
+    """
+    value = np.full(np.shape(x), coefficients[0], dtype=complex)
+    for coefficient in coefficients[1:]:
+        value *= x
+        value += coefficient
+    return value
+
+def EvaluateRationalCircuit(rationalCircuit, angularFrequencies):
+    """
+    Evaluates the ABCD entries of the compiled circuit at every frequency. This is the same output as CascadeCircuit.CalculateCoefficients
+
+    Args:
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Raises:
+        ZeroDivisionError: Raised when a frequency of 0 is evaluated on a circuit with a denominator in s
+
+    Returns:
+        A, B, C, D (ndarray): Arrays of each ABCD entry of the circuit, with one value per frequency
+    """
+    x = 1j*np.asarray(angularFrequencies, dtype=float) / rationalCircuit["angularScale"]
+    if (rationalCircuit["denominatorPower"] > 0) and not np.all(x): raise ZeroDivisionError("Cannot divide by 0: The rational circuit cannot be evaluated at 0 Hz")
+
+    denominator = x ** rationalCircuit["denominatorPower"]
+    return tuple(EvaluatePolynomial(rationalCircuit[entry], x) / denominator for entry in ("A", "B", "C", "D"))
+
+def EvaluateRationalRow(rationalCircuit, rowIndex, angularFrequencies):
+    """
+    Evaluates one row of the ABCD entries of the compiled circuit at every frequency, which is (A, B) for row 0 and (C, D) for row 1. The entries are
+    the same as the row from EvaluateRationalCircuit, without evaluating the polynomials of the other row.
+
+    Args:
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+        rowIndex (int): 0 for the (A, B) row or 1 for the (C, D) row
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Raises:
+        ZeroDivisionError: Raised when a frequency of 0 is evaluated on a circuit with a denominator in s
+
+    Returns:
+        first, second (ndarray): Arrays of the entries of the row, with one value per frequency
+    """
+    x = 1j*np.asarray(angularFrequencies, dtype=float) / rationalCircuit["angularScale"]
+    if (rationalCircuit["denominatorPower"] > 0) and not np.all(x): raise ZeroDivisionError("Cannot divide by 0: The rational circuit cannot be evaluated at 0 Hz")
+
+    denominator = x ** rationalCircuit["denominatorPower"]
+    return tuple(EvaluatePolynomial(rationalCircuit[entry], x) / denominator for entry in (("A", "B"), ("C", "D"))[rowIndex])
+
+def GetSampleFrequencies(angularFrequencies, numberOfSamples=32):
+    """
+    Gets a few frequencies spread evenly through the sorted sweep, including both ends, to check the rational circuit on
+
+    Args:
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        numberOfSamples (int, optional): Largest number of frequencies to check. Defaults to 32
+
+    Returns:
+        ndarray: Non-zero sample frequencies (IN RADS)
+    """
+    angularFrequencies = np.sort(np.asarray(angularFrequencies, dtype=float))
+    angularFrequencies = angularFrequencies[angularFrequencies != 0]
+    if len(angularFrequencies) == 0: return angularFrequencies
+    return np.unique(angularFrequencies[np.linspace(0, len(angularFrequencies) - 1, numberOfSamples).astype(int)])
+
+def CheckRationalCircuit(rationalCircuit, angularFrequencies, coefficients, tolerance=1e-6):
+    """
+    Checks the rational circuit against the ABCD entries of the cascade at a few frequencies. The coefficients of high order circuits span too many
+    orders of magnitude for double precision, whatever the scale of s, so the polynomials can be wrong by many orders of magnitude without overflowing.
+
+    Args:
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+        angularFrequencies (ndarray): Sample frequencies (IN RADS) from GetSampleFrequencies
+        coefficients (tuple): A, B, C and D arrays of the cascade at the sample frequencies
+        tolerance (float, optional): Largest error of the entries, relative to the largest entry at each frequency. Defaults to 1e-6
+
+    Returns:
+        bool: True if the rational circuit matches the cascade at every sample frequency
+    """
+    if len(angularFrequencies) == 0: return True
+    coefficients = np.array(coefficients)
+    with np.errstate(all="ignore"):
+        rationalCoefficients = np.array(EvaluateRationalCircuit(rationalCircuit, angularFrequencies))
+        errors = np.max(np.abs(rationalCoefficients - coefficients), axis=0) / np.max(np.abs(coefficients), axis=0)
+    return bool(np.all(errors <= tolerance))         # NaN and inf errors fail the check
+
+# ==================================================================================================================================
+# ========================================================== FILE HANDLING =========================================================
+# ==================================================================================================================================
+
+def GetCircuitKey(circuitComponents):
+    """
+    Gets the key that identifies the circuit components, which is stored with the saved polynomials so that a stale file is not reused
+
+    Args:
+        circuitComponents (list): List of the circuit component data
+
+    Returns:
+        str: Text key of the circuit components
+    """
+    return repr([tuple(individualComponent) for individualComponent in circuitComponents])
+
+def SaveRationalCircuit(fileName, rationalCircuit, circuitKey=""):
+    """
+    Saves the compiled rational circuit to a .npz file so that it can be reused across runs
+
+    Args:
+        fileName (str): Name of the .npz file to write to
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+        circuitKey (str, optional): Key of the circuit components from GetCircuitKey. Defaults to ""
+    """
+    with open(fileName, 'wb') as file:
+        np.savez(file, A=rationalCircuit["A"], B=rationalCircuit["B"], C=rationalCircuit["C"], D=rationalCircuit["D"],
+                 denominatorPower=rationalCircuit["denominatorPower"], angularScale=rationalCircuit["angularScale"], circuitKey=circuitKey)
+    return
+
+def LoadRationalCircuit(fileName, circuitKey=None):
+    """
+    Loads a compiled rational circuit from a .npz file. When a circuit key is given, the file is only used if it was saved for the same circuit
+
+    Args:
+        fileName (str): Name of the .npz file to read from
+        circuitKey (str, optional): Key of the circuit components from GetCircuitKey. Defaults to None
+
+    Returns:
+        rationalCircuit (dict): Compiled rational circuit, or None if the file does not exist or is for a different circuit
+    """
+    if not os.path.isfile(fileName): return None
+    with np.load(fileName) as data:
+        if (circuitKey != None) and (str(data["circuitKey"]) != circuitKey): return None
+        rationalCircuit = {entry: data[entry] for entry in ("A", "B", "C", "D")}
+        rationalCircuit["denominatorPower"] = int(data["denominatorPower"])
+        rationalCircuit["angularScale"] = float(data["angularScale"])
+    return rationalCircuit
+
+def GetRationalCircuit(fileName, circuitComponents, angularScale=1.0):
+    """
+    Gets the compiled rational circuit for the circuit components, by loading it from the file if it was saved for the same circuit, or by compiling
+    it and saving it to the file otherwise.
+
+    Args:
+        fileName (str): Name of the .npz file to reuse
+        circuitComponents (list): List of the circuit component data
+        angularScale (float, optional): Angular frequency that s is scaled by when the circuit is compiled. Defaults to 1.0
+
+    Returns:
+        rationalCircuit (dict): Compiled rational circuit
+    """
+    circuitKey = GetCircuitKey(circuitComponents)
+    rationalCircuit = LoadRationalCircuit(fileName, circuitKey)
+    if rationalCircuit == None:
+        rationalCircuit = CompileRationalCircuit(circuitComponents, angularScale)
+        SaveRationalCircuit(fileName, rationalCircuit, circuitKey)
+    return rationalCircuit
+
+# ==================================================================================================================================
+# ========================================================== ANALYSIS ==============================================================
+# ==================================================================================================================================
+
+def SimplifyRationalFunction(numerator, denominator):
+    """
+    Simplifies a rational function by removing leading zero coefficients and cancelling the common factors of x at the origin
+
+    Args:
+        numerator (ndarray): Coefficients of the numerator in descending powers
+        denominator (ndarray): Coefficients of the denominator in descending powers
+
+    Returns:
+        numerator, denominator (ndarray): Simplified coefficients in descending powers
+    """
+    numerator = np.trim_zeros(np.asarray(numerator, dtype=float), "f")
+    denominator = np.trim_zeros(np.asarray(denominator, dtype=float), "f")
+    while (len(numerator) > 1) and (len(denominator) > 1) and (numerator[-1] == 0) and (denominator[-1] == 0):
+        numerator = numerator[:-1]
+        denominator = denominator[:-1]
+    return numerator, denominator
+
+def GetTransferFunctions(rationalCircuit, sourceImpedance, loadImpedance):
+    """
+    Gets the transfer functions of the cascade as rational functions of x = s / angularScale, using the same equations as the frequency sweep.
+    The common denominator of the ABCD entries cancels out of Zin and Zout, and moves to the numerator of Av and Ai.
+
+    Supporting Mathematics (Page 14): https://moodle.bath.ac.uk/pluginfile.php/2016444/mod_resource/content/6/Coursework_definition_2022_23_v01_pngfigs.pdf-correctedByPAVE%20%281%29.pdf
+
+    Args:
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+
+    Returns:
+        transferFunctions (dict): Dictionary of (numerator, denominator) tuples for "Av", "Ai", "Zin" and "Zout"
+    """
+    A, B, C, D = (rationalCircuit[entry] for entry in ("A", "B", "C", "D"))
+    denominator = GetDenominator(rationalCircuit)
+
+    transferFunctions = {"Av":   (denominator * loadImpedance,                   np.polyadd(A * loadImpedance, B)),
+                         "Ai":   (denominator,                                   np.polyadd(C * loadImpedance, D)),
+                         "Zin":  (np.polyadd(A * loadImpedance, B),              np.polyadd(C * loadImpedance, D)),
+                         "Zout": (np.polyadd(D * sourceImpedance, B),            np.polyadd(C * sourceImpedance, A))}
+    
+    return {name: SimplifyRationalFunction(*transferFunctions[name]) for name in transferFunctions}
+
+def GetMagnitudeSquared(coefficients):
+    """
+    Gets |P(ju)|^2 as a real polynomial in u, where P is a polynomial in x and x = ju
+
+    Args:
+        coefficients (ndarray): Coefficients of P in descending powers of x
+
+    Returns:
+        ndarray: Coefficients of |P(ju)|^2 in ascending powers of u
+    """
+    ascending = np.asarray(coefficients, dtype=complex)[::-1] * (1j ** np.arange(len(coefficients)))
+    return np.real(np.polynomial.polynomial.polymul(ascending, np.conj(ascending)))
+
+def GetPositiveRealRoots(coefficients):
+    """
+    Gets the positive real roots of a real polynomial
+
+    Args:
+        coefficients (ndarray): Coefficients of the polynomial in ascending powers
+
+    Returns:
+        ndarray: Sorted positive real roots
+    """
+    coefficients = np.trim_zeros(coefficients, "b")
+    if len(coefficients) < 2: return np.array([])
+    roots = np.polynomial.polynomial.polyroots(coefficients)
+    roots = np.real(roots[(np.abs(np.imag(roots)) <= 1e-7 * np.abs(roots)) & (np.real(roots) > 0)])
+    return np.sort(roots)
+
+def GetResonances(roots):
+    """
+    Gets the resonant frequencies and quality factors from complex conjugate roots. Only the root with the positive imaginary part of each pair is used.
+
+    Args:
+        roots (ndarray): Roots in the s plane (IN RADS)
+
+    Returns:
+        resonances (list): List of tuples in the form (Resonant Frequency (Hz), Quality Factor)
+    """
+    resonances = []
+    for root in roots:
+        if np.imag(root) <= 0: continue
+        naturalFrequency = abs(root)
+        qualityFactor = np.inf if np.real(root) == 0 else naturalFrequency / (-2 * np.real(root))
+        resonances.append((naturalFrequency / (2 * np.pi), qualityFactor))
+    return sorted(resonances)
+
+def GetCornerFrequencies(numerator, denominator, angularScale):
+    """
+    Gets the peak magnitude of a rational function on the jw axis and the -3 dB corner frequencies around it. The peak is found from the roots of the
+    derivative of |H(ju)|^2, and the corners are the positive real roots of |N(ju)|^2 - (peak^2 / 2) |D(ju)|^2.
+
+    Args:
+        numerator (ndarray): Coefficients of the numerator in descending powers of x
+        denominator (ndarray): Coefficients of the denominator in descending powers of x
+        angularScale (float): Angular frequency that s was scaled by
+
+    Returns:
+        peakMagnitude (float): Peak magnitude of the function, inf if it is unbounded
+        peakFrequency (float): Frequency (Hz) of the peak magnitude, inf when the peak is at infinite frequency
+        corners (list): List of the -3 dB corner frequencies (Hz)
+        bandwidth (float): The -3 dB bandwidth (Hz) around the peak, inf when there is no upper corner
+    """
+    polynomial = np.polynomial.polynomial
+    numeratorSquared = GetMagnitudeSquared(numerator)
+    denominatorSquared = GetMagnitudeSquared(denominator)
+
+    # Candidates for the peak are the stationary points, zero frequency and infinite frequency, laid out as (Magnitude, u)
+    stationaryPoints = polynomial.polysub(polynomial.polymul(polynomial.polyder(numeratorSquared), denominatorSquared),
+                                          polynomial.polymul(numeratorSquared, polynomial.polyder(denominatorSquared)))
+    candidates = [(np.sqrt(polynomial.polyval(u, numeratorSquared) / polynomial.polyval(u, denominatorSquared)), u) for u in GetPositiveRealRoots(stationaryPoints)]
+    
+    if denominatorSquared[0] != 0:  candidates.append((np.sqrt(numeratorSquared[0] / denominatorSquared[0]), 0.0))
+    elif numeratorSquared[0] != 0:  candidates.append((np.inf, 0.0))
+    
+    numeratorOrder, denominatorOrder = len(numerator) - 1, len(denominator) - 1
+    if   numeratorOrder > denominatorOrder:  candidates.append((np.inf, np.inf))
+    elif numeratorOrder == denominatorOrder: candidates.append((abs(numerator[0] / denominator[0]), np.inf))
+
+    peakMagnitude, peakU = max(candidates)
+    if not np.isfinite(peakMagnitude) or peakMagnitude == 0: return peakMagnitude, peakU * angularScale / (2 * np.pi), [], np.inf
+
+    cornerU = GetPositiveRealRoots(polynomial.polysub(numeratorSquared, (peakMagnitude**2 / 2) * denominatorSquared))
+    corners = list(cornerU * angularScale / (2 * np.pi))
+    peakFrequency = peakU * angularScale / (2 * np.pi)
+
+    # The bandwidth is between the closest corners either side of the peak, with a peak at 0 Hz counting from 0 Hz
+    lowerCorners = [corner for corner in corners if corner < peakFrequency]
+    upperCorners = [corner for corner in corners if corner > peakFrequency]
+    if len(upperCorners) == 0: bandwidth = np.inf
+    elif len(lowerCorners) == 0: bandwidth = upperCorners[0]
+    else: bandwidth = upperCorners[0] - lowerCorners[-1]
+
+    return peakMagnitude, peakFrequency, corners, bandwidth
+
+def AnalyseRationalCircuit(rationalCircuit, sourceImpedance, loadImpedance):
+    """
+    Analyses the transfer functions of the compiled circuit directly from their rational functions, without a frequency sweep. The poles and zeros of
+    Av, Ai, Zin and Zout are found, along with their resonances, peak magnitude, -3 dB corners and bandwidth.
+
+    Args:
+        rationalCircuit (dict): Compiled rational circuit from CompileRationalCircuit
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+
+    Raises:
+        OverflowError: Raised when the polynomials of the circuit are too high an order to be represented
+
+    Returns:
+        analysisResults (dict): Dictionary for each transfer function, which contains a dictionary of the results
+    """
+    if not all(np.all(np.isfinite(rationalCircuit[entry])) for entry in ("A", "B", "C", "D")): 
+        raise OverflowError("Circuit order is too high for the rational function analysis: The polynomial coefficients overflowed")
+    angularScale = rationalCircuit["angularScale"]
+    analysisResults = {}
+
+    for name, (numerator, denominator) in GetTransferFunctions(rationalCircuit, sourceImpedance, loadImpedance).items():
+        zeros = np.roots(numerator) * angularScale if len(numerator) > 1 else np.array([])
+        poles = np.roots(denominator) * angularScale if len(denominator) > 1 else np.array([])
+        peakMagnitude, peakFrequency, corners, bandwidth = GetCornerFrequencies(numerator, denominator, angularScale)
+
+        analysisResults[name] = {"zeros": zeros, "poles": poles, "resonances": GetResonances(poles), "antiresonances": GetResonances(zeros),
+                                 "peakMagnitude": peakMagnitude, "peakFrequency": peakFrequency, "corners": corners, "bandwidth": bandwidth}
+    return analysisResults
@@ -0,0 +1,187 @@
+# ====================================================================================================================================
+#   Filename:     CircuitSensitivity.py
+#   Summary:      The module that calculates the sensitivity of the outputs to every component value
+#   Description:  This is a set of functions that find the derivative of Av, Zin and Pout with respect to the value of every component at
+#                 every frequency. The cascade is split into the products before and after each component, so every derivative is found
+#                 from one backward sweep and one forward sweep of the circuit instead of a separate sweep for each perturbed component.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+import CascadeCircuit as cascade
+
+# =============================================================================================================================
+# ========================================================== GENERAL ==========================================================
+# =============================================================================================================================
+
+def GetImmittanceDerivative(individualComponent, angularFrequencies):
+    """
+    Gets the derivative of the immittance that the cascade uses for a component, with respect to the component value. Series components use their
+    impedance Z and parallel components use their admittance Y = 1/Z, the same as CascadeCircuit.CascadeComponent.
+
+    Args:
+        individualComponent (tuple): The component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Returns:
+        ndarray: Derivative of the immittance at each frequency
+    """
+    connectionType, componentType, componentValue = individualComponent[:3]
+    impedance = np.broadcast_to(cascade.GetComponentImpedance(individualComponent, angularFrequencies), np.shape(angularFrequencies))
+
+    # Derivative of the impedance for series components and of the admittance for parallel components
+    if connectionType == "S":
+        if   componentType == "R": derivative = np.ones(np.shape(angularFrequencies))
+        elif componentType == "G": derivative = np.full(np.shape(angularFrequencies), -1/componentValue**2)
+        elif componentType == "L": derivative = 1j*angularFrequencies
+        else:                      derivative = -impedance/componentValue
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if   componentType == "R": derivative = np.full(np.shape(angularFrequencies), -1/componentValue**2 if componentValue != 0 else 0.0)
+            elif componentType == "G": derivative = np.ones(np.shape(angularFrequencies))
+            elif componentType == "L": derivative = -1/(impedance*componentValue)
+            else:                      derivative = 1j*angularFrequencies
+        derivative = np.where(impedance != 0, derivative, 0)     # Parallel components with no impedance are skipped by the cascade
+    return derivative.astype(complex)
+
+def GetIdentityEntries(numberOfFrequencies):
+    """
+    Gets the ABCD entries of the identity matrix at every frequency
+
+    Args:
+        numberOfFrequencies (int): Number of frequencies
+
+    Returns:
+        tuple: A, B, C and D arrays of the identity matrix
+    """
+    entries = np.zeros((4, numberOfFrequencies), dtype=complex)
+    entries[0] = 1
+    entries[3] = 1
+    return tuple(entries)
+
+def GetComponentEntries(individualComponent, angularFrequencies):
+    """
+    Gets the ABCD entries of a single component at every frequency
+
+    Args:
+        individualComponent (tuple): The component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Returns:
+        tuple: A, B, C and D arrays of the component
+    """
+    return cascade.ApplyComponent(*GetIdentityEntries(len(angularFrequencies)), individualComponent, angularFrequencies)
+
+# ===================================================================================================================================
+# ========================================================== SENSITIVITY ============================================================
+# ===================================================================================================================================
+
+def CalculateMatrixDerivatives(circuitComponents, angularFrequencies):
+    """
+    Calculates the derivative of the circuit ABCD Matrix with respect to every component value. The circuit matrix is split as M = P * Mi * S, where P is
+    the product of the components before component i and S is the product after it, so dM/dx = P * (dMi/dx) * S.
+
+    Supporting Mathematics:
+        Series:     P [0 dZ] S  =  dZ * [P00*S10  P00*S11]
+                      [0  0]            [P10*S10  P10*S11]
+
+        Parallel:   P [ 0 0] S  =  dY * [P01*S00  P01*S01]
+                      [dY 0]            [P11*S00  P11*S01]
+
+    The suffix products are stored on a backward sweep and the prefix product is built up on a forward sweep, so this yields the derivatives one
+    component at a time.
+
+    Args:
+        circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Yields:
+        index (int): Index of the component
+        derivatives (tuple): dA, dB, dC and dD arrays for the component
+        coefficients (tuple): A, B, C and D arrays of the whole circuit
+    """
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    identity = GetIdentityEntries(len(angularFrequencies))
+
+    # Backward sweep, storing the product of the components after each component
+    suffixProducts = [None] * len(circuitComponents)
+    suffix = identity
+    for index in range(len(circuitComponents) - 1, -1, -1):
+        suffixProducts[index] = suffix
+        suffix = cascade.CascadeMatrix(*GetComponentEntries(circuitComponents[index], angularFrequencies), suffix)
+    coefficients = suffix
+
+    # Forward sweep, building the product of the components before each component
+    prefix = identity
+    for index, individualComponent in enumerate(circuitComponents):
+        P00, P01, P10, P11 = prefix
+        S00, S01, S10, S11 = suffixProducts[index]
+        derivative = GetImmittanceDerivative(individualComponent, angularFrequencies)
+        if individualComponent[0] == "S": derivatives = (derivative*P00*S10, derivative*P00*S11, derivative*P10*S10, derivative*P10*S11)
+        else:                             derivatives = (derivative*P01*S00, derivative*P01*S01, derivative*P11*S00, derivative*P11*S01)
+        suffixProducts[index] = None        # Frees the suffix product once it has been used
+        yield index, derivatives, coefficients
+        prefix = cascade.CascadeMatrix(*prefix, GetComponentEntries(individualComponent, angularFrequencies))
+
+def CalculateOutputDerivatives(derivatives, coefficients, inputSource, sourceImpedance, loadImpedance):
+    """
+    Calculates the derivatives of Av, Zin and Pout from the derivatives of the ABCD entries, using the same equations as the frequency sweep.
+
+    Supporting Mathematics:
+        Av = ZL / (A*ZL + B)
+        Zin = (A*ZL + B) / (C*ZL + D)
+        Pout = Vout * conj(Iout) = ZL * |E|^2 / |A*ZL + B + ZS*(C*ZL + D)|^2, where E = VT for a Thevenin source and E = IN*ZS for a Norton source
+
+    Args:
+        derivatives (tuple): dA, dB, dC and dD arrays for the component
+        coefficients (tuple): A, B, C and D arrays of the whole circuit
+        inputSource (tuple): Source in the form (Source Type, Source Value)
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+
+    Returns:
+        outputDerivatives (dict): Dictionary of the derivatives of "Av", "Zin" and "Pout" at each frequency
+    """
+    A, B, C, D = coefficients
+    dA, dB, dC, dD = derivatives
+    sourceVoltage = inputSource[1] if "V" in inputSource[0] else inputSource[1] * sourceImpedance
+
+    inputNumerator = A*loadImpedance + B
+    inputDenominator = C*loadImpedance + D
+    dInputNumerator = dA*loadImpedance + dB
+    dInputDenominator = dC*loadImpedance + dD
+    outputDenominator = inputNumerator + sourceImpedance*inputDenominator
+    dOutputDenominator = dInputNumerator + sourceImpedance*dInputDenominator
+
+    outputDerivatives = {}
+    outputDerivatives["Av"] = -loadImpedance * dInputNumerator / inputNumerator**2
+    outputDerivatives["Zin"] = (dInputNumerator*inputDenominator - inputNumerator*dInputDenominator) / inputDenominator**2
+    outputDerivatives["Pout"] = -2 * loadImpedance * abs(sourceVoltage)**2 * np.real(np.conj(outputDenominator)*dOutputDenominator) / np.abs(outputDenominator)**4 + 0j
+    return outputDerivatives
+
+def CalculateSensitivities(circuitComponents, angularFrequencies, inputSource, sourceImpedance, loadImpedance, chunkSize=4096):
+    """
+    Calculates the sensitivity of Av, Zin and Pout to every component value at every frequency. The frequencies are processed in chunks so that the
+    stored suffix products stay within memory for long ladders.
+
+    Args:
+        circuitComponents (list): List of the circuit component data, which must not be compiled so that each entry is a single component
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        inputSource (tuple): Source in the form (Source Type, Source Value)
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+        chunkSize (int, optional): Number of frequencies processed at once. Defaults to 4096
+
+    Returns:
+        sensitivities (dict): Dictionary of (components, frequencies) arrays for "Av", "Zin" and "Pout"
+    """
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    sensitivities = {name: np.zeros((len(circuitComponents), len(angularFrequencies)), dtype=complex) for name in ("Av", "Zin", "Pout")}
+
+    for start in range(0, len(angularFrequencies), chunkSize):
+        chunk = slice(start, start + chunkSize)
+        for index, derivatives, coefficients in CalculateMatrixDerivatives(circuitComponents, angularFrequencies[chunk]):
+            outputDerivatives = CalculateOutputDerivatives(derivatives, coefficients, inputSource, sourceImpedance, loadImpedance)
+            for name in sensitivities: sensitivities[name][index, chunk] = outputDerivatives[name]
+    return sensitivities
@@ -0,0 +1,118 @@
+# ====================================================================================================================================
+#   Filename:     CircuitTolerance.py
+#   Summary:      The module that runs the Monte Carlo tolerance analysis of the circuit
+#   Description:  This is a set of functions that evaluate thousands of random instances of the circuit, where every component value is
+#                 drawn from within its tolerance. All of the samples are evaluated together as a (samples x frequencies) array, so the
+#                 analysis is a single tensor calculation instead of a separate run of the program for each sample. The results are
+#                 reduced to the 5%, 50% and 95% percentile bands of each output.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+import CascadeCircuit as cascade
+import DataWriting as dataWrite
+
+# ===================================================================================================================================
+# ========================================================== TOLERANCE ==============================================================
+# ===================================================================================================================================
+
+def SampleComponentValues(circuitComponents, componentTolerances, numberOfSamples, seed=None):
+    """
+    Samples random values for every component, uniformly distributed within the tolerance of the component. Components without a tolerance keep
+    their value for every sample.
+
+    Args:
+        circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+        componentTolerances (list): List of the tolerance of each component as a fraction
+        numberOfSamples (int): Number of random circuits
+        seed (int, optional): Seed for the random number generator, for repeatable results. Defaults to None
+
+    Returns:
+        sampledComponents (list): List of the components, where each value is a (samples, 1) array
+    """
+    generator = np.random.default_rng(seed)
+    sampledComponents = []
+    for individualComponent, tolerance in zip(circuitComponents, componentTolerances):
+        deviations = generator.uniform(-tolerance, tolerance, (numberOfSamples, 1)) if tolerance > 0 else np.zeros((numberOfSamples, 1))
+        sampledComponents.append(individualComponent[:2] + (individualComponent[2] * (1 + deviations),))
+    return sampledComponents
+
+def CalculateSampleCoefficients(sampledComponents, angularFrequencies):
+    """
+    Calculates the ABCD entries of every sampled circuit at every frequency. The component values are (samples, 1) arrays, so the impedances broadcast
+    against the frequencies into (samples, frequencies) arrays that are cascaded with the same kernel as the frequency sweep.
+
+    Args:
+        sampledComponents (list): List of the sampled components from SampleComponentValues
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+    Returns:
+        A, B, C, D (ndarray): (samples, frequencies) arrays of each ABCD entry
+    """
+    numberOfSamples = len(sampledComponents[0][2]) if len(sampledComponents) > 0 else 1
+    shape = (numberOfSamples, len(angularFrequencies))
+    A = np.ones(shape, dtype=complex)
+    B = np.zeros(shape, dtype=complex)
+    C = np.zeros(shape, dtype=complex)
+    D = np.ones(shape, dtype=complex)
+
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)[np.newaxis, :]
+    for individualComponent in sampledComponents:
+        A, B, C, D = cascade.ApplyComponent(A, B, C, D, individualComponent, angularFrequencies)
+    return A, B, C, D
+
+def UnwrapPhase(phases, nominalPhases):
+    """
+    Moves each sampled phase by a whole number of turns so that it lies within pi of the phase of the nominal circuit. np.angle wraps the phase into
+    (-pi, pi], so near +-pi the samples would otherwise be split between both ends of the range and their percentiles would not describe the spread.
+
+    Args:
+        phases (ndarray): (samples, frequencies) array of the sampled phases in rads
+        nominalPhases (ndarray): Phase of the nominal circuit at each frequency in rads
+
+    Returns:
+        ndarray: (samples, frequencies) array of the unwrapped phases
+    """
+    return nominalPhases + np.angle(np.exp(1j*(phases - nominalPhases)))
+
+def CalculateToleranceBands(circuitComponents, componentTolerances, angularFrequencies, inputSource, sourceImpedance, loadImpedance, outputTerms,
+                            numberOfSamples=1000, seed=None, chunkSize=None):
+    """
+    Calculates the 5%, 50% and 95% percentile bands of every requested output over the random circuits. The percentiles are taken on the parts that are
+    written to the file (real and imaginary parts, or magnitude in decibels and phase), so they match the columns of the main .csv file. Phases are
+    unwrapped around the phase of the nominal circuit first, so the bands of a phase close to +-pi can run slightly past +-pi instead of jumping
+    across the whole range. The frequencies are processed in chunks so that the (samples x frequencies) arrays stay within memory.
+
+    Args:
+        circuitComponents (list): List of the circuit component data, which must not be compiled so that each entry is a single component
+        componentTolerances (list): List of the tolerance of each component as a fraction
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        inputSource (tuple): Source in the form (Source Type, Source Value)
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+        outputTerms (list): List of all of the output terms
+        numberOfSamples (int, optional): Number of random circuits. Defaults to 1000
+        seed (int, optional): Seed for the random number generator. Defaults to None
+        chunkSize (int, optional): Number of frequencies processed at once. Defaults to keeping each array to about a million values
+
+    Returns:
+        toleranceBands (list): List of (firstPart, secondPart) tuples for each output term, where each part is a (3, N) array of the percentiles
+    """
+    angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+    if chunkSize == None: chunkSize = max(1, 2**20 // numberOfSamples)
+    sampledComponents = SampleComponentValues(circuitComponents, componentTolerances, numberOfSamples, seed)
+    toleranceBands = [(np.zeros((3, len(angularFrequencies))), np.zeros((3, len(angularFrequencies)))) for outputTerm in outputTerms]
+
+    for start in range(0, len(angularFrequencies), chunkSize):
+        chunk = slice(start, start + chunkSize)
+        A, B, C, D = CalculateSampleCoefficients(sampledComponents, angularFrequencies[chunk])
+        outputValues = cascade.CalculateOutputs(A, B, C, D, inputSource, sourceImpedance, loadImpedance)
+        nominalValues = cascade.CalculateOutputs(*cascade.CalculateCoefficients(circuitComponents, angularFrequencies[chunk]), inputSource, sourceImpedance, loadImpedance)
+
+        for outputTerm, (firstBand, secondBand) in zip(outputTerms, toleranceBands):
+            firstPart, secondPart = dataWrite.ConvertOutputColumns(outputValues[outputTerm[0]], outputTerm)
+            if outputTerm[3]: secondPart = UnwrapPhase(secondPart, np.angle(nominalValues[outputTerm[0]]))
+            firstBand[:, chunk] = np.percentile(firstPart, (5, 50, 95), axis=0)
+            secondBand[:, chunk] = np.percentile(secondPart, (5, 50, 95), axis=0)
+    return toleranceBands
@@ -0,0 +1,193 @@
+# ====================================================================================================================================
+#   Filename:     CircuitTuning.py
+#   Summary:      The module that caches the partial products of the circuit for interactive tuning
+#   Description:  This contains the CascadeTree class, which keeps a segment tree of the ABCD Matrix products of the circuit components over
+#                 the whole frequency sweep. Changing a single component only recalculates the products above it in the tree, and
+#                 previewing different values of the same component reuses the cached prefix and suffix products, so tuning a long
+#                 ladder does not re-multiply every component at every frequency.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+import CascadeCircuit as cascade
+
+# ===================================================================================================================================
+# ========================================================== CASCADE TREE ===========================================================
+# ===================================================================================================================================
+
+class CascadeTree:
+    """
+    Segment tree of the ABCD Matrix products of the circuit components, with every node holding the (A, B, C, D) entries at each frequency.
+    The root of the tree is the ABCD Matrix of the whole circuit.
+
+    Each node is stored as a (4, N) array of the entries in the order A, B, C, D. The tree takes 2 * 4 * N complex values for each leaf,
+    so the number of frequencies should be kept to the sweep that is being tuned.
+
+    Example:
+        tree = CascadeTree(circuitComponents, 2*math.pi*frequencies)
+        A, B, C, D = tree.PreviewComponentValue(5, 1.2e-6)      # O(1) for each frequency once the prefix and suffix are cached
+        tree.SetComponentValue(5, 1.2e-6)                       # O(log n) for each frequency
+        A, B, C, D = tree.GetCoefficients()
+    """
+
+    def __init__(self, circuitComponents, angularFrequencies):
+        """
+        Builds the tree from the circuit components.
+
+        Args:
+            circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+            angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        """
+        self.angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+        self.circuitComponents = list(circuitComponents)
+        self.leafCount = 1
+        while self.leafCount < len(self.circuitComponents): self.leafCount *= 2
+
+        # Every node starts as the identity matrix, so the padding leaves do not change the products
+        self.tree = np.zeros((2*self.leafCount, 4, len(self.angularFrequencies)), dtype=complex)
+        self.tree[:, 0] = 1
+        self.tree[:, 3] = 1
+
+        for index, individualComponent in enumerate(self.circuitComponents):
+            self.tree[self.leafCount + index] = self.GetComponentEntries(individualComponent)
+        for node in range(self.leafCount - 1, 0, -1):
+            self.tree[node] = self.CombineEntries(self.tree[2*node], self.tree[2*node + 1])
+
+        self.tunedIndex = None
+        self.tunedPrefix = None
+        self.tunedSuffix = None
+
+    def GetComponentEntries(self, individualComponent):
+        """
+        Gets the ABCD entries of a single component at every frequency
+
+        Args:
+            individualComponent (tuple): The component data in the form (Connection Type, Component Type, Component Value)
+
+        Returns:
+            ndarray: (4, N) array of the A, B, C and D entries of the component
+        """
+        entries = np.zeros((4, len(self.angularFrequencies)), dtype=complex)
+        entries[0] = 1
+        entries[3] = 1
+        return np.array(cascade.ApplyComponent(*entries, individualComponent, self.angularFrequencies))
+
+    def CombineEntries(self, leftEntries, rightEntries):
+        """
+        Multiplies two sets of ABCD entries together, with the left entries coming first in the circuit
+
+        Args:
+            leftEntries (ndarray): (4, N) array of the entries closer to the input
+            rightEntries (ndarray): (4, N) array of the entries closer to the output
+
+        Returns:
+            ndarray: (4, N) array of the product
+        """
+        return np.array(cascade.CascadeMatrix(*leftEntries, tuple(rightEntries)))
+
+    def QueryProduct(self, start, end):
+        """
+        Gets the product of the components from index start up to, but not including, index end
+
+        Args:
+            start (int): Index of the first component in the product
+            end (int): Index after the last component in the product
+
+        Returns:
+            ndarray: (4, N) array of the A, B, C and D entries of the product
+        """
+        leftProduct = self.tree[0].copy()       # Node 0 is never used by the tree, so it stays as the identity matrix
+        rightProduct = self.tree[0].copy()
+        start += self.leafCount
+        end += self.leafCount
+
+        # The left product collects nodes from the input side and the right product from the output side, as the multiplication is not commutative
+        while start < end:
+            if start % 2 == 1:
+                leftProduct = self.CombineEntries(leftProduct, self.tree[start])
+                start += 1
+            if end % 2 == 1:
+                end -= 1
+                rightProduct = self.CombineEntries(self.tree[end], rightProduct)
+            start //= 2
+            end //= 2
+        return self.CombineEntries(leftProduct, rightProduct)
+
+    def GetCoefficients(self):
+        """
+        Gets the ABCD entries of the whole circuit. This is the same output as CascadeCircuit.CalculateCoefficients
+
+        Returns:
+            A, B, C, D (ndarray): Arrays of each ABCD entry of the circuit, with one value per frequency
+        """
+        return tuple(self.tree[1].copy())
+
+    def UpdateComponent(self, index, individualComponent):
+        """
+        Replaces a component in the circuit and updates the products above it in the tree, which is O(log n) for each frequency
+
+        Args:
+            index (int): Index of the component in the circuit
+            individualComponent (tuple): The new component data in the form (Connection Type, Component Type, Component Value)
+        """
+        if not (0 <= index < len(self.circuitComponents)): raise IndexError("Component " + str(index) + " is out of range. Enter a value between 0-" + str(len(self.circuitComponents) - 1))
+        self.circuitComponents[index] = individualComponent
+
+        node = self.leafCount + index
+        self.tree[node] = self.GetComponentEntries(individualComponent)
+        node //= 2
+        while node >= 1:
+            self.tree[node] = self.CombineEntries(self.tree[2*node], self.tree[2*node + 1])
+            node //= 2
+
+        # The cached prefix and suffix only exclude the tuned component, so they are invalid when any other component changes
+        if index != self.tunedIndex: self.tunedIndex = None
+        return
+
+    def SetComponentValue(self, index, componentValue):
+        """
+        Changes the value of a component, keeping its connection type and component type
+
+        Args:
+            index (int): Index of the component in the circuit
+            componentValue (float): New value of the component
+        """
+        individualComponent = self.circuitComponents[index]
+        self.UpdateComponent(index, (individualComponent[0], individualComponent[1], componentValue))
+        return
+
+    def PreviewComponent(self, index, individualComponent):
+        """
+        Gets the ABCD entries of the circuit with a component replaced, without changing the tree. The products before and after the component are
+        cached, so previewing more values for the same component is O(1) for each frequency.
+
+        Args:
+            index (int): Index of the component in the circuit
+            individualComponent (tuple): The component data to preview in the form (Connection Type, Component Type, Component Value)
+
+        Returns:
+            A, B, C, D (ndarray): Arrays of each ABCD entry of the circuit, with one value per frequency
+        """
+        if not (0 <= index < len(self.circuitComponents)): raise IndexError("Component " + str(index) + " is out of range. Enter a value between 0-" + str(len(self.circuitComponents) - 1))
+        if index != self.tunedIndex:
+            self.tunedPrefix = self.QueryProduct(0, index)
+            self.tunedSuffix = self.QueryProduct(index + 1, len(self.circuitComponents))
+            self.tunedIndex = index
+
+        entries = self.CombineEntries(self.tunedPrefix, self.GetComponentEntries(individualComponent))
+        return tuple(self.CombineEntries(entries, self.tunedSuffix))
+
+    def PreviewComponentValue(self, index, componentValue):
+        """
+        Gets the ABCD entries of the circuit with the value of a component changed, without changing the tree
+
+        Args:
+            index (int): Index of the component in the circuit
+            componentValue (float): Value of the component to preview
+
+        Returns:
+            A, B, C, D (ndarray): Arrays of each ABCD entry of the circuit, with one value per frequency
+        """
+        individualComponent = self.circuitComponents[index]
+        return self.PreviewComponent(index, (individualComponent[0], individualComponent[1], componentValue))
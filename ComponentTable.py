@@ -0,0 +1,260 @@
+# ====================================================================================================================================
+#   Filename:     ComponentTable.py
+#   Summary:      The module that stores the circuit components as parallel arrays
+#   Description:  This contains the ComponentTable class, which keeps the connection type, component type and value of every component in
+#                 compact numpy arrays instead of a list of tuples of strings. The table is produced by the file reading and consumed by
+#                 the mathematics, where the impedance of every component of the same type is calculated at once with a boolean mask.
+#                 Iterating over the table still gives the (Connection Type, Component Type, Component Value) tuples, so the table can be
+#                 used anywhere a list of circuit components is expected.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+
+# ===================================================================================================================================
+# ========================================================== COMPONENT TABLE ========================================================
+# ===================================================================================================================================
+
+class ComponentTable:
+    """
+    Parallel arrays of the circuit components in circuit order. Each component takes an int8 connection code, an int8 type code and a float64 value,
+    plus two float64 nodes when the table comes from the file, so a component takes 10 to 26 bytes instead of a tuple of Python objects.
+
+    Codes:
+        Connection codes index CONNECTION_TYPES: 0 'S' (Series), 1 'P' (Parallel), 2 'M' (Constant ABCD block from CascadeCircuit.CompileCircuit),
+                                                 3 'N' (Repeated section from CascadeCircuit.CompileCircuit)
+        Type codes index COMPONENT_TYPES: 0 'R', 1 'G', 2 'L', 3 'C', 4 'K' (Constant ABCD block or repeated section)
+
+    The value of an 'M' entry is the index of its (A, B, C, D) row in the blocks array, and the value of an 'N' entry is the index of its
+    (section table, count) pair in the sections list. The REPEAT sections of a table from the file are kept as (start, length, count) rows of repeats.
+
+    Example:
+        table = ComponentTable.FromComponents([('S', 'R', 8.55), ('P', 'C', 3.18e-9)])
+        table[1]                                            # ('P', 'C', 3.18e-09)
+        impedances = table.GetImpedances(angularFrequencies) # (components, frequencies) array of the reactive components
+    """
+
+    CONNECTION_TYPES = ("S", "P", "M", "N")
+    COMPONENT_TYPES = ("R", "G", "L", "C", "K")
+
+    def __init__(self, connectionCodes, typeCodes, componentValues, nodes=None, blocks=None, sections=None, repeats=None):
+        """
+        Builds the table from the arrays of the components
+
+        Args:
+            connectionCodes (ndarray): Connection code of each component
+            typeCodes (ndarray): Type code of each component
+            componentValues (ndarray): Value of each component
+            nodes (ndarray, optional): (N, 2) array of the nodes of each component. Defaults to None
+            blocks (ndarray, optional): (blocks, 4) array of the entries of the constant ABCD blocks. Defaults to None
+            sections (list, optional): List of the (ComponentTable, count) pairs of the repeated sections. Defaults to None
+            repeats (ndarray, optional): (repeats, 3) array of the (start, section length, count) of each REPEAT section. Defaults to None
+        """
+        self.connectionCodes = np.asarray(connectionCodes, dtype=np.int8)
+        self.typeCodes = np.asarray(typeCodes, dtype=np.int8)
+        self.componentValues = np.asarray(componentValues, dtype=float)
+        self.nodes = None if nodes is None else np.asarray(nodes, dtype=float).reshape(-1, 2)
+        self.blocks = np.zeros((0, 4)) if blocks is None else np.asarray(blocks).reshape(-1, 4)
+        self.sections = [] if sections is None else list(sections)
+        self.repeats = np.zeros((0, 3), dtype=np.int64) if repeats is None else np.asarray(repeats, dtype=np.int64).reshape(-1, 3)
+
+    @classmethod
+    def FromComponents(cls, circuitComponents):
+        """
+        Builds the table from a list of circuit components or compiled circuit entries
+
+        Args:
+            circuitComponents (list): List of the circuit component data (Each element should be laid out as a tuple in the form (Connection Type, Component Type, Component Value))
+
+        Returns:
+            ComponentTable: Table of the components
+        """
+        connectionCodes, typeCodes, componentValues, blocks, sections = [], [], [], [], []
+        for individualComponent in circuitComponents:
+            connectionCodes.append(cls.CONNECTION_TYPES.index(individualComponent[0]))
+            typeCodes.append(cls.COMPONENT_TYPES.index(individualComponent[1]))
+            if individualComponent[0] == "M":
+                componentValues.append(len(blocks))
+                blocks.append(individualComponent[2])
+            elif individualComponent[0] == "N":
+                componentValues.append(len(sections))
+                sections.append((cls.FromComponents(individualComponent[2][0]), int(individualComponent[2][1])))
+            else:
+                componentValues.append(individualComponent[2])
+        return cls(connectionCodes, typeCodes, componentValues, blocks=blocks if len(blocks) > 0 else None, sections=sections)
+
+    @classmethod
+    def FromNodeComponents(cls, nodeComponents, repeats=None):
+        """
+        Builds the table from the list of components with their node data from DataReading.GetCircuitNodeComponents
+
+        Args:
+            nodeComponents (list): List of tuples in the form (Connection Type, Node 1, Node 2, Component Type, Component Value, ...)
+            repeats (list, optional): List of the (start, section length, count) of each REPEAT section in circuit order. Defaults to None
+
+        Returns:
+            ComponentTable: Table of the components, including their nodes
+        """
+        return cls([cls.CONNECTION_TYPES.index(individualComponent[0]) for individualComponent in nodeComponents],
+                   [cls.COMPONENT_TYPES.index(individualComponent[3]) for individualComponent in nodeComponents],
+                   [individualComponent[4] for individualComponent in nodeComponents],
+                   nodes=[individualComponent[1:3] for individualComponent in nodeComponents], repeats=repeats)
+
+    def __len__(self):
+        return len(self.typeCodes)
+
+    def __getitem__(self, index):
+        """
+        Gets a single component as a tuple in the form (Connection Type, Component Type, Component Value), or a run of components as a ComponentTable.
+        A run shares the blocks and sections of the table, and does not keep the REPEAT sections
+
+        Args:
+            index (int or slice): Index of the component in the circuit, or a slice of the components
+
+        Returns:
+            tuple or ComponentTable: The component data
+        """
+        if isinstance(index, slice):
+            return ComponentTable(self.connectionCodes[index], self.typeCodes[index], self.componentValues[index], nodes=None if self.nodes is None else self.nodes[index],
+                                  blocks=self.blocks, sections=self.sections)
+        if not (-len(self) <= index < len(self)): raise IndexError("Component " + str(index) + " is out of range. Enter a value between 0-" + str(len(self) - 1))
+        connectionType = self.CONNECTION_TYPES[self.connectionCodes[index]]
+        componentType = self.COMPONENT_TYPES[self.typeCodes[index]]
+        if connectionType == "M": return (connectionType, componentType, tuple(self.blocks[int(self.componentValues[index])].tolist()))
+        if connectionType == "N":
+            sectionTable, count = self.sections[int(self.componentValues[index])]
+            return (connectionType, componentType, (tuple(sectionTable), count))
+        return (connectionType, componentType, float(self.componentValues[index]))
+
+    def __iter__(self):
+        for index in range(len(self)): yield self[index]
+
+    def Expand(self):
+        """
+        Writes out every REPEAT section of the table into its copies, for the analyses that need every component of the circuit on its own, such as
+        the sensitivities, the tolerance bands and the nodal analysis. The copies are only made when this is called, so the table from the file
+        keeps one copy of each section
+
+        Returns:
+            ComponentTable: Table of the components with every section written out, or the same table when it has no REPEAT sections
+        """
+        if len(self.repeats) == 0: return self
+        tableArrays = {"connectionCodes": self.connectionCodes, "typeCodes": self.typeCodes, "componentValues": self.componentValues, "nodes": self.nodes}
+        expandedArrays = RepeatRows(tableArrays, self.repeats.tolist(), self.repeats[:, 2].tolist())[0]
+        return ComponentTable(**expandedArrays, blocks=self.blocks, sections=self.sections)
+
+    def GetNodeComponents(self):
+        """
+        Gets the components with their node data, in the same form as DataReading.GetCircuitNodeComponents
+
+        Returns:
+            nodeComponents (list): List of tuples in the form (Connection Type, Node 1, Node 2, Component Type, Component Value)
+        """
+        if self.nodes is None: raise ValueError("Component Table has no node data")
+        return [(individualComponent[0], float(nodePair[0]), float(nodePair[1])) + individualComponent[1:] for individualComponent, nodePair in zip(self, self.nodes)]
+
+    def CheckImpedances(self, angularFrequencies):
+        """
+        Checks that every component has a finite impedance at every frequency, which fails for a conductor of 0 or a capacitor at 0 Hz
+
+        Args:
+            angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+        Raises:
+            ZeroDivisionError: Raised for the first component in circuit order with an impedance that divides by 0
+        """
+        angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+        zeroFrequencyBoolean = bool(np.any(angularFrequencies == 0))
+        failedMask = (self.typeCodes == 1) & (self.componentValues == 0)
+        failedMask |= (self.typeCodes == 3) & ((self.componentValues == 0) | zeroFrequencyBoolean)
+        if np.any(failedMask):
+            raise ZeroDivisionError("Cannot divide by 0:\n(Connection Type, Component Type, Component Value, Exponent)\n" + " ".join(str(self[int(np.argmax(failedMask))])))
+        return
+
+    def GetConstantImpedances(self):
+        """
+        Gets the impedance of the frequency independent components. Rows for the other components are left at 0
+
+        Returns:
+            ndarray: Impedance of each 'R' and 'G' component
+        """
+        impedances = np.zeros(len(self))
+        resistorMask = self.typeCodes == 0
+        conductorMask = (self.typeCodes == 1) & (self.componentValues != 0)
+        impedances[resistorMask] = self.componentValues[resistorMask]
+        impedances[conductorMask] = 1/self.componentValues[conductorMask]
+        return impedances
+
+    def GetImpedances(self, angularFrequencies, start=0, end=None):
+        """
+        Gets the impedance of the reactive components between start and end at every frequency, using a boolean mask for each component type.
+        Rows for the other components are left at 0
+
+        Args:
+            angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+            start (int, optional): Index of the first component. Defaults to 0
+            end (int, optional): Index after the last component. Defaults to the end of the table
+
+        Returns:
+            impedances (ndarray): (components, frequencies) array of the impedances
+        """
+        angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+        typeCodes = self.typeCodes[start:end]
+        componentValues = self.componentValues[start:end]
+        impedances = np.zeros((len(typeCodes), len(angularFrequencies)), dtype=complex)
+
+        inductorMask = typeCodes == 2
+        capacitorMask = typeCodes == 3
+        impedances[inductorMask] = 1j*angularFrequencies[np.newaxis, :]*componentValues[inductorMask, np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            impedances[capacitorMask] = 1/(1j*angularFrequencies[np.newaxis, :]*componentValues[capacitorMask, np.newaxis])
+        return impedances
+
+# ===================================================================================================================================
+# ========================================================== REPEAT SECTIONS ========================================================
+# ===================================================================================================================================
+
+def GetSectionSpan(sectionNodes):
+    """
+    Gets the span of a REPEAT section, which is the distance between its lowest and highest node apart from the common node
+
+    Args:
+        sectionNodes (ndarray): (N, 2) array of the nodes of one copy of the section
+
+    Returns:
+        float: Span of the section, or 0 if it only connects to the common node
+    """    
+    sectionNodes = sectionNodes[sectionNodes != 0]
+    return float(sectionNodes.max() - sectionNodes.min()) if len(sectionNodes) > 0 else 0.0
+
+def RepeatRows(circuitArrays, repeatSections, copies):
+    """
+    Writes out copies of each REPEAT section in the arrays, with every node of a copy apart from the common node moved up by the span of the section
+
+    Args:
+        circuitArrays (dict): Dictionary of the "connectionCodes", "typeCodes", "componentValues" and "nodes" arrays of the components
+        repeatSections (list): List of (First Row, Section Length, Count) of each REPEAT section in the arrays
+        copies (list): Number of copies to write out for each section
+
+    Returns:
+        circuitArrays (dict): Dictionary of the component arrays with the copies written out
+        sectionRows (list): List of (First Row, Section Length, Copies) of each section in the new arrays
+        rowIndexes (ndarray): Row of the arrays that each new row was copied from
+    """    
+    rowPieces, offsetPieces, sectionRows = [], [], []
+    position, rowCount = 0, 0
+    for (firstRow, sectionLength, count), copyCount in zip(repeatSections, copies):
+        span = GetSectionSpan(circuitArrays["nodes"][firstRow:firstRow + sectionLength])
+        rowPieces.extend((np.arange(position, firstRow), np.tile(np.arange(firstRow, firstRow + sectionLength), copyCount)))
+        offsetPieces.extend((np.zeros(firstRow - position), np.repeat(np.arange(copyCount)*span, sectionLength)))
+        sectionRows.append((rowCount + firstRow - position, sectionLength, copyCount))
+        rowCount += firstRow - position + sectionLength*copyCount
+        position = firstRow + sectionLength
+    rowPieces.append(np.arange(position, len(circuitArrays["typeCodes"])))
+    offsetPieces.append(np.zeros(len(rowPieces[-1])))
+
+    rowIndexes, nodeOffsets = np.concatenate(rowPieces).astype(int), np.concatenate(offsetPieces)
+    repeatedArrays = {entry: circuitArrays[entry][rowIndexes] for entry in circuitArrays}
+    repeatedArrays["nodes"] = np.where(repeatedArrays["nodes"] != 0, repeatedArrays["nodes"] + nodeOffsets[:, np.newaxis], 0.0)
+    return repeatedArrays, sectionRows, rowIndexes
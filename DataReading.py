@@ -8,7 +8,10 @@
 #   Author:       C.J. Gacay 
 # ====================================================================================================================================
 
-import re, warnings
+import numpy as np
+import re, os, io, mmap, hashlib, functools, warnings, array, tempfile, zipfile
+from concurrent.futures import ProcessPoolExecutor
+import ComponentTable as compTable
 
 # =============================================================================================================================
 # ========================================================== GENERAL ==========================================================
@@ -45,42 +48,21 @@ def CheckEmptyListError(myList, block="UNDEFINED"):
     if (len(myList) <= 0): raise ValueError("Empty Block Detected! Check: " + block + " Block")
     return
 
-def RemoveComments(file):
+def StripComment(line):
     """
-    Removes the comments from the .NET file that is being read
+    Removes the comment from a single line of the .NET file. Lines that start with a # are removed completely, otherwise everything from the # to the
+    end of the line is removed and the line break is kept
 
     Args:
-        file (_io.TextIOWrapper): This is the file that will be read
-
-    Returns:
-        text (str): String of file without the comments 
-    """
-    text = ""
-    for line in file:
-        # Checks if the line doesn't start with a #
-        if not (line.startswith('#')):
-            text += line
-            text = re.sub(r"#.*", "", text)
-    return text
-
-def ExtractBlock(text, start, end):
-    """
-    Uses indexing to return the parts between start and end.
-    Finds the instance of the start delimiter, then uses that as the beginning index, 
-    then adds the length of the delimiter in case it is longer than a character. 
-    Finds the final instance of the ending delimiter and uses that as the end of the index. 
-    This can be used as each file has specific code blocks in the .NET files
-
-    Args:
-        text (str): Text to extract from
-        start (str): The delimiter for the start of the block
-        end (str): The delimiter for the end of the block
+        line (str): Line of the file to strip
 
     Returns:
-        text (str): Text between the start and end delimiters
+        line (str): Line without the comment
     """
-    if not ((start in text) or (end in text)): raise ValueError(start + " block is missing")
-    return text[text.find(start)+len(start):text.rfind(end)]     
+    if line.startswith('#'): return ""
+    commentIndex = line.find('#')
+    if commentIndex == -1: return line
+    return line[:commentIndex] + ("\n" if line.endswith("\n") else "")
 
 def RemoveEmptyElements(myList):
     """
@@ -143,18 +125,18 @@ def CheckNodeConnections(seriesComponents):
         ValueError: Raised when there is a conflicting circuit connection in the series section
         ValueError: Raised when there is a missing node connection
     """    
-    # Gets the number of series components and makes a list of the first node values
-    seriesLength = len(seriesComponents)
-    seriesCheckList = [item[0] for item in seriesComponents]
+    # Gets the number of series components and makes an array of the first node values, so lists and (N, 2) arrays are both accepted
+    seriesCheckList = np.reshape(np.asarray(seriesComponents, dtype=float), (-1, 2))[:, 0]
+    seriesLength = len(seriesCheckList)
 
     # Check if there are repeated series components (If they share two nodes).
-    # Checks the length of the list against a set of itself, if they differ, there are duplicates.
-    if seriesLength != len(set(seriesCheckList)): raise ValueError("Conflicting Circuit Connection: Series components cannot share the same nodes.\n\nCheck CIRCUIT Block")
+    # Checks the length of the array against its unique values, if they differ, there are duplicates.
+    if seriesLength != len(np.unique(seriesCheckList)): raise ValueError("Conflicting Circuit Connection: Series components cannot share the same nodes.\n\nCheck CIRCUIT Block")
 
-    # Check if there are disconnected nodes, by creating a list from 1 to seriesLength and comparing it to the original seriesComponent list
+    # Check if there are disconnected nodes, by creating an array from 1 to the last node and comparing it to the first nodes of the series components
     if seriesLength != 0:
-        nodeCheckList = [i for i in range(1, int(seriesCheckList[seriesLength-1])+1)]          
-        if seriesCheckList != nodeCheckList: raise ValueError("Missing Node Connection: All nodes must be connected by a component\n\nCheck CIRCUIT Block")
+        nodeCheckList = np.arange(1, int(seriesCheckList[seriesLength-1])+1)
+        if not np.array_equal(seriesCheckList, nodeCheckList): raise ValueError("Missing Node Connection: All nodes must be connected by a component\n\nCheck CIRCUIT Block")
     return
 
 def ValidateCircuit(componentData, componentText):
@@ -253,6 +235,213 @@ def ConvertCircuitData(component):
 
     return tuple(componentData)     # Returns the list as a tuple to avoid coupling issues
 
+def ParseCircuitLines(circuitLines, nodeMode="numbered"):
+    """
+    Parses the component lines of the circuit block straight into typed arrays, one line at a time, so the circuit is never held as a list of tuples.
+    A REPEAT section is written once between "REPEAT N=<count>" and "END REPEAT" with the nodes of its first copy, and its components are added to the
+    arrays once and recorded with their count. Each copy moves every node apart from the common node up by the span of the section, so the output
+    node of a copy is the input node of the next one. Components after the section carry on from the last node.
+
+    Examples shown below:
+        REPEAT N=3                  n1=2 n2=3 L=1m, n1=3 n2=0 C=1u
+        n1=2 n2=3 L=1m        ->    n1=3 n2=4 L=1m, n1=4 n2=0 C=1u
+        n1=3 n2=0 C=1u              n1=4 n2=5 L=1m, n1=5 n2=0 C=1u
+        END REPEAT
+
+    Args:
+        circuitLines (iterable): Lines of the circuit block
+        nodeMode (str, optional): Node mode of GetCircuitTable, only "numbered" nodes must be adjacent. Defaults to "numbered"
+
+    Raises:
+        ValueError: Invalid circuit connections: Series nodes must be adjacent
+        ValueError: Raised when a REPEAT section has an invalid count, is nested, is empty or is not closed
+
+    Returns:
+        circuitArrays (dict): Dictionary of the "connectionCodes", "typeCodes", "componentValues" and "nodes" arrays of the components in the file order
+        repeatSections (list): List of (First Row, Section Length, Count) of each REPEAT section in the arrays
+    """    
+    connectionCodes, typeCodes = array.array("b"), array.array("b")
+    componentValues, nodes = array.array("d"), array.array("d")
+    repeatSections = []
+    sectionStart = None
+
+    for line in circuitLines:
+        line = StripComment(line)
+        if line == "": continue
+        keyword = CleanTextLine(line).upper()
+        if keyword.startswith("REPEAT"):
+            if sectionStart != None: raise ValueError("Invalid REPEAT Section: Sections cannot be nested\n" + line + "\n Please Check Circuit")
+            try:
+                count = int(keyword.split("=")[1])
+            except:
+                raise ValueError("Invalid REPEAT Section: " + line + "\n Use REPEAT N=<count>\n Please Check Circuit")
+            if count < 1: raise ValueError("Invalid REPEAT Section: The count must be at least 1\n" + line + "\n Please Check Circuit")
+            sectionStart = len(typeCodes)
+            continue
+
+        if keyword.startswith("END"):
+            if (sectionStart == None) or (sectionStart == len(typeCodes)): raise ValueError("Invalid REPEAT Section: END REPEAT without any components\n Please Check Circuit")
+            repeatSections.append((sectionStart, len(typeCodes) - sectionStart, count))
+            sectionStart = None
+            continue
+
+        # A zero anywhere in the component data connects it to the common node
+        componentData = ConvertCircuitData(line)
+        parallelBoolean = componentData.count(0) != 0
+        if (not parallelBoolean) and (nodeMode == "numbered") and (abs(componentData[0] - componentData[1]) != 1):
+            raise ValueError("Invalid Circuit Connection: Series nodes must be adjacent\n" + line)
+        connectionCodes.append(int(parallelBoolean))
+        typeCodes.append(compTable.ComponentTable.COMPONENT_TYPES.index(componentData[2]))
+        componentValues.append(componentData[3])
+        nodes.extend(componentData[:2])
+
+    if sectionStart != None: raise ValueError("Invalid REPEAT Section: Missing END REPEAT\n Please Check Circuit")
+    circuitArrays = {"connectionCodes": np.frombuffer(connectionCodes, dtype=np.int8), "typeCodes": np.frombuffer(typeCodes, dtype=np.int8),
+                     "componentValues": np.frombuffer(componentValues, dtype=float), "nodes": np.frombuffer(nodes, dtype=float).reshape(-1, 2)}
+    return circuitArrays, repeatSections
+
+def GetRepeatPositions(circuitOrder, sectionRows):
+    """
+    Gets the positions of the REPEAT sections in circuit order. The copies of each section must still follow each other in circuit order with their
+    components in the same order, otherwise the section has to be evaluated one component at a time like the rest of the circuit.
+
+    Args:
+        circuitOrder (ndarray): Indices of the components in circuit order
+        sectionRows (list): List of (First Row, Section Length, Copies) of each section, with the copies written out
+
+    Returns:
+        sectionPositions (list): List of (Start, Section Length, Copies) of each section in circuit order, or None for a section that is split up
+    """    
+    positions = np.empty(len(circuitOrder), dtype=int)
+    positions[circuitOrder] = np.arange(len(circuitOrder))
+    sectionPositions = []
+
+    for firstRow, sectionLength, copyCount in sectionRows:
+        start = int(positions[firstRow:firstRow + sectionLength*copyCount].min())
+        copyRows = circuitOrder[start:start + sectionLength*copyCount] - firstRow
+        if len(copyRows) == sectionLength*copyCount:
+            copyRows = copyRows.reshape(copyCount, sectionLength)
+            if np.all((copyRows[0] >= 0) & (copyRows[0] < sectionLength)) and np.array_equal(copyRows, copyRows[:1] + sectionLength*np.arange(copyCount)[:, np.newaxis]):
+                sectionPositions.append((start, sectionLength, copyCount))
+                continue
+        sectionPositions.append(None)
+    return sectionPositions
+
+def GetCircuitTable(circuitArrays, repeatSections=[], nodeMode="numbered"):
+    """
+    Puts the component arrays into circuit order and checks the node connections, then builds the ComponentTable of the circuit. Each REPEAT section
+    is kept as one copy and its count, so the size of the table does not depend on the count. A section is checked and ordered with up to three
+    copies, which is enough for the middle copy to meet a copy on both sides, and every node after the section is moved down by the span of the other
+    copies. A section is written out in full instead when another component connects inside it or when its copies do not follow each other in
+    circuit order.
+
+    Node modes:
+        "numbered":     Series nodes are numbered 1, 2, 3, ... and the components are sorted by their nodes
+        "normalised":   The nodes can have any labels and the components are put into circuit order by GetCascadeOrder
+        "general":      The nodes can have any labels and any connections, and the components are kept in the order of the file for CircuitMNA
+
+    Args:
+        circuitArrays (dict): Dictionary of the component arrays, from ParseCircuitLines
+        repeatSections (list, optional): List of (First Row, Section Length, Count) of each REPEAT section in the arrays. Defaults to []
+        nodeMode (str, optional): How the nodes are checked and ordered. Defaults to "numbered"
+
+    Raises:
+        ValueError: Conflicting circuit connections: Series components cannot share the same nodes
+        ValueError: Missing node connection: All nodes must be connected by a component
+
+    Returns:
+        ComponentTable: Table of the components with their node data in circuit order, with one copy of each REPEAT section
+    """    
+    compactMask = [count > 1 for firstRow, sectionLength, count in repeatSections]
+    while True:
+        # The sections that are not kept compact are written out in full, and the others keep their one copy
+        copies = [1 if compactBoolean else count for compactBoolean, (firstRow, sectionLength, count) in zip(compactMask, repeatSections)]
+        baseArrays, baseRows = compTable.RepeatRows(circuitArrays, repeatSections, copies)[:2]
+        sectionIndexes = [sectionIndex for sectionIndex, compactBoolean in enumerate(compactMask) if compactBoolean]
+        compactSections = [(baseRows[sectionIndex][0],) + tuple(repeatSections[sectionIndex][1:]) for sectionIndex in sectionIndexes]
+        checkNodes = baseArrays["nodes"]
+        splitSections = []
+
+        if nodeMode != "general":
+            checkNodes = baseArrays["nodes"].copy()
+            for sectionIndex, (firstRow, sectionLength, count) in zip(sectionIndexes, compactSections):
+                sectionNodes = baseArrays["nodes"][firstRow:firstRow + sectionLength]
+                span = compTable.GetSectionSpan(sectionNodes)
+                firstNode = sectionNodes[sectionNodes != 0].min() if np.any(sectionNodes != 0) else 0.0
+                lastNode = firstNode + count*span
+
+                # A component outside of the section with a node between the first and last node would connect inside one of the copies
+                innerMask = (baseArrays["nodes"] > firstNode) & (baseArrays["nodes"] < lastNode)
+                innerMask[firstRow:firstRow + sectionLength] = False
+                if np.any(innerMask): splitSections.append(sectionIndex)
+                checkNodes -= np.where((baseArrays["nodes"] >= lastNode) & (baseArrays["nodes"] != 0), (count - min(count, 3))*span, 0.0)
+
+        if len(splitSections) == 0:
+            checkCopies = [min(count, 3) if nodeMode != "general" else 1 for firstRow, sectionLength, count in compactSections]
+            checkArrays, checkRows, sourceRows = compTable.RepeatRows(dict(baseArrays, nodes=checkNodes), compactSections, checkCopies)
+
+            if nodeMode == "general":
+                circuitOrder = np.arange(len(checkArrays["typeCodes"]))
+            elif nodeMode == "normalised":
+                circuitOrder = GetCascadeOrder(checkArrays["nodes"], checkArrays["connectionCodes"])
+            else:
+                # Sorts the components by nodes 1 and 2, lexsort is stable so components on the same nodes keep their order in the file
+                circuitOrder = np.lexsort((checkArrays["nodes"][:, 1], checkArrays["nodes"][:, 0]))
+                seriesNodes = np.sort(checkArrays["nodes"][checkArrays["connectionCodes"] == 0], axis=1)
+                CheckNodeConnections(seriesNodes[np.lexsort((seriesNodes[:, 1], seriesNodes[:, 0]))])
+
+            sectionPositions = GetRepeatPositions(circuitOrder, checkRows)
+            splitSections = [sectionIndex for sectionIndex, sectionPosition in zip(sectionIndexes, sectionPositions) if sectionPosition == None]
+            if len(splitSections) == 0: break
+
+        for sectionIndex in splitSections:
+            warnings.warn("WARNING: REPEAT section " + str(sectionIndex + 1) + " is split up in circuit order. Evaluating it one component at a time")
+            compactMask[sectionIndex] = False
+
+    # Only the first copy of each section is kept, with the nodes from the file
+    keepMask = np.ones(len(circuitOrder), dtype=bool)
+    for start, sectionLength, copyCount in sectionPositions: keepMask[start + sectionLength:start + sectionLength*copyCount] = False
+    removedCounts = np.cumsum(~keepMask)
+    repeats = [(start - int(removedCounts[start]), sectionLength, count) for (start, sectionLength, copyCount), (firstRow, _, count) in zip(sectionPositions, compactSections)]
+    tableRows = sourceRows[circuitOrder[keepMask]]
+    return compTable.ComponentTable(**{entry: baseArrays[entry][tableRows] for entry in baseArrays}, repeats=repeats)
+
+def ReadCircuitTable(circuit, nodeMode="numbered"):
+    """
+    Reads the circuit block into a ComponentTable. The lines are taken from the text one at a time by ParseCircuitLines
+
+    Args:
+        circuit (str): String containing all of the information of the circuit components
+        nodeMode (str, optional): How the nodes are checked and ordered, see GetCircuitTable. Defaults to "numbered"
+
+    Returns:
+        ComponentTable: Table of the components with their node data, in circuit order
+    """    
+    circuitLines = (line[:-1] if line.endswith("\n") else line for line in io.StringIO(circuit))
+    return GetCircuitTable(*ParseCircuitLines(circuitLines, nodeMode), nodeMode)
+
+def GetCircuitNodeComponents(circuit, nodeMode="numbered"):
+    """
+    Gets the components and relevant information of each component included in the circuit, keeping the node data of each component.
+    REPEAT sections are expanded into their copies.
+
+    Args:
+        circuit (str): String containing all of the information of the circuit components
+        nodeMode (str, optional): How the nodes are checked and ordered. Defaults to "numbered"
+
+    Raises:
+        ValueError: Invalid circuit connections: Series nodes must be adjacent
+        ValueError: Conflicting circuit connections: Series components cannot share the same nodes
+        ValueError: Missing node connection: All nodes must be connected by a component
+
+    Returns:
+        circuitComponents (list): List of tuples where each tuple contains the component information, sorted into circuit order
+
+    Additional Information:
+        Format of circuitComponents: (Connection Type (str), Node 1 (float), Node 2 (float), Component Type(str), Component Value(float))
+    """        
+    return ReadCircuitTable(circuit, nodeMode).Expand().GetNodeComponents()
+
 def GetCircuitComponents(circuit):
     """
     Gets the components and relevant information of each component included in the circuit
@@ -271,38 +460,120 @@ def GetCircuitComponents(circuit):
     Additional Information:
         Format of circuitComponents: (Connection Type (str), Component Type(str), Component Value(float))
     """        
-    circuitComponents = []
-    seriesComponents = []
-    circuitLines = circuit.split("\n")
-    circuitLines = RemoveEmptyElements(circuitLines)
+    return RemoveNodeData(GetCircuitNodeComponents(circuit))
 
-    for i in range(0, len(circuitLines)):
-        if not (circuitLines[i] == ""): circuitComponents.append(ConvertCircuitData(circuitLines[i]))   # Appends all of the available components
-        
-    # Removes empty elements from list
-    circuitComponents = RemoveEmptyElements(circuitComponents)
+def RemoveNodeData(nodeComponents):
+    """
+    Removes the node data from the components, as it is no longer needed once the components are sorted into circuit order
+
+    Args:
+        nodeComponents (list): List of the components with their node data, from GetCircuitNodeComponents
+
+    Returns:
+        circuitComponents (list): List of tuples in the form (Connection Type (str), Component Type(str), Component Value(float))
+    """    
+    return [individualComponent[:1] + individualComponent[3:5] for individualComponent in nodeComponents]
+
+def GetComponentLabels(nodeComponents):
+    """
+    Gets a label for each component in circuit order, which is the cleaned component line with the value after the exponent has been applied.
+    The labels are in the same order as the list from GetCircuitComponents.
+
+    Example:
+        "n1=1 n2=2 R=8.55"
+
+    Args:
+        nodeComponents (list): List of the components with their node data, from GetCircuitNodeComponents
+
+    Returns:
+        componentLabels (list): List of the label for each component
+    """    
+    componentLabels = []
+    for individualComponent in nodeComponents:
+        componentLabels.append("n1=" + "%g" % individualComponent[1] + " n2=" + "%g" % individualComponent[2] + " " + individualComponent[3] + "=" + "%g" % individualComponent[4])
+    return componentLabels
+
+# ======================================================================================================================================
+# ========================================================== NODE NORMALISATION ========================================================
+# ======================================================================================================================================
+
+def FindNodeRoot(parents, node):
+    """
+    Finds the root of a node in the union-find forest, halving the path on the way so that later searches are shorter
 
-    # Checks if there is a connection to the common node, then inserts a 'P' or 'S' to the tuple depending on the connection type
-    for i in range(0, len(circuitComponents)):
-        if (circuitComponents[i].count(0) != 0): circuitComponents[i] = ('P',) + circuitComponents[i]       
-        else: 
-            # Checks if the nodes are 1 value apart, if they aren't raise an error (n1=1 n2=3)
-            if (abs(circuitComponents[i][0] - circuitComponents[i][1]) != 1): raise ValueError("Invalid Circuit Connection: Series nodes must be adjacent\n" + "".join(circuitLines[i]))
+    Args:
+        parents (list): Parent of each node in the forest
+        node (int): Index of the node
 
-            seriesComponents.append(sorted(circuitComponents[i][:2]))   # Appends series components to a separate list and only takes in the node values
-            circuitComponents[i] = ('S',) + circuitComponents[i]
+    Returns:
+        int: Index of the root of the node
+    """    
+    while parents[node] != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+    return node
 
-    # Sorts the list of tuples by values in nodes 1 and 2
-    circuitComponents = sorted(circuitComponents, key=lambda x: (x[1], x[2]))
-    seriesComponents = sorted(seriesComponents, key=lambda x: (x[0], x[1]))
+def GetCascadeOrder(nodes, connectionCodes):
+    """
+    Gets the circuit order of the components for any node labels. The series components must form a single chain between the input and the output,
+    which is checked with a union-find of the series nodes, then the chain is walked from the end with the lowest label to give every node its
+    position in the cascade. Each parallel component is placed at the position of its node, before the series component that leaves that node.
+    Every step is linear in the number of components apart from sorting the labels, so no renumbering is needed beforehand.
 
-    CheckNodeConnections(seriesComponents)
+    Example:
+        "n1=10 n2=40 R=1", "n1=40 n2=0 C=1u", "n1=40 n2=7 L=1m" has the cascade 10 -> 40 -> 7
 
-    # Removes the node data from the circuitComponents tuples as they are no longer needed
-    for i in range(0, len(circuitComponents)):
-        circuitComponents[i] = circuitComponents[i][:1] + circuitComponents[i][3:]
+    Args:
+        nodes (ndarray): (N, 2) array of the node labels of each component, where 0 is the common node
+        connectionCodes (ndarray): Connection code of each component, 0 for Series and 1 for Parallel
 
-    return circuitComponents
+    Raises:
+        ValueError: Invalid circuit connection: Series nodes must form a single chain
+        ValueError: Conflicting circuit connection: Series components cannot form a loop
+        ValueError: Missing node connection: All nodes must be connected by a component
+
+    Returns:
+        circuitOrder (ndarray): Indices of the components in circuit order
+    """    
+    nodes = np.reshape(np.asarray(nodes, dtype=float), (-1, 2))
+    seriesMask = np.asarray(connectionCodes) == 0
+    labels, nodeIndexes = np.unique(nodes, return_inverse=True)
+    nodeIndexes = nodeIndexes.reshape(-1, 2)
+    commonMask = labels == 0
+
+    # Every series node can only connect to the nodes before and after it in the chain
+    seriesEdges = nodeIndexes[seriesMask]
+    degree = np.bincount(seriesEdges.ravel(), minlength=len(labels))
+    if np.any(degree > 2): raise ValueError("Invalid Circuit Connection: Series nodes must form a single chain\n" + "%g" % labels[np.argmax(degree > 2)] + "\n\nCheck CIRCUIT Block")
+
+    # Joining two nodes that are already connected would close a loop, which includes two series components on the same nodes
+    parents = list(range(len(labels)))
+    neighbours = [[] for label in labels]
+    for firstNode, secondNode in seriesEdges.tolist():
+        firstRoot, secondRoot = FindNodeRoot(parents, firstNode), FindNodeRoot(parents, secondNode)
+        if firstRoot == secondRoot: raise ValueError("Conflicting Circuit Connection: Series components cannot form a loop.\n\nCheck CIRCUIT Block")
+        parents[secondRoot] = firstRoot
+        neighbours[firstNode].append(secondNode)
+        neighbours[secondNode].append(firstNode)
+
+    # The chain must hold every node apart from the common node, unless there is a single node with only parallel components
+    chainNodes = np.flatnonzero(degree > 0)
+    if len(chainNodes) == 0: chainNodes = np.flatnonzero(~commonMask)[:1]
+    chainRoots = set(FindNodeRoot(parents, node) for node in chainNodes.tolist())
+    if (len(chainRoots) > 1) or (len(chainNodes) != np.count_nonzero(~commonMask)): raise ValueError("Missing Node Connection: All nodes must be connected by a component\n\nCheck CIRCUIT Block")
+
+    # Walks the chain from the end with the lowest label, as the labels are sorted
+    positions = np.zeros(len(labels))
+    previousNode, node = -1, int(chainNodes[0]) if len(chainNodes) == 1 else int(chainNodes[degree[chainNodes] == 1][0])
+    for position in range(1, len(chainNodes) + 1):
+        positions[node] = position
+        nextNodes = [neighbour for neighbour in neighbours[node] if neighbour != previousNode]
+        previousNode, node = node, (nextNodes[0] if nextNodes else -1)
+
+    # Parallel components sort on (position, 0) and series components on (first position, 1)
+    componentPositions = positions[nodeIndexes]
+    firstPositions = np.where(np.all(componentPositions > 0, axis=1), componentPositions.min(axis=1), componentPositions.max(axis=1))
+    return np.lexsort((seriesMask.astype(int), firstPositions))
 
 # =================================================================================================================================
 # ========================================================== TERMS BLOCK ==========================================================
@@ -322,6 +593,48 @@ def CheckLogarithmicSweep(term):
     print("test")
     return False
 
+def GetTerminationValues(termText):
+    """
+    Gets the value of a termination term (VT, IN, RS, GS or RL), which can be a single value, a list of values separated by semicolons, or a linear range
+    written as start:end:number of values. A single value is returned as a float, so a circuit with one termination is unchanged.
+
+    Examples shown below:
+        RL=50               (50.0)
+        RL=50;75;100        (array([50, 75, 100]))
+        RL=10:100:10        (array([10, 20, 30, ..., 100]))
+
+    Args:
+        termText (str): Text of the value after the equals sign
+
+    Raises:
+        ValueError: Raised when the range does not have a start, end and a positive number of values
+
+    Returns:
+        float or ndarray: The value or array of values
+    """    
+    if ";" in termText: return np.array([float(value) for value in termText.split(";")])
+    if ":" in termText:
+        rangeValues = termText.split(":")
+        if len(rangeValues) != 3 or int(rangeValues[2]) < 1: raise ValueError("Invalid Range: " + termText + "\n Use start:end:number of values")
+        return np.linspace(float(rangeValues[0]), float(rangeValues[1]), int(rangeValues[2]))
+    return float(termText)
+
+def GetTerminations(termsList):
+    """
+    Gets every combination of the source value, source impedance and load impedance from the terms, with the load impedance changing fastest.
+    Each of the terms can be a single value or an array from GetTerminationValues.
+
+    Args:
+        termsList (list): List of each term, from GetTerms
+
+    Returns:
+        sourceValues (ndarray): Source value of each termination
+        sourceImpedances (ndarray): Source impedance of each termination
+        loadImpedances (ndarray): Load impedance of each termination
+    """    
+    terminationGrid = np.meshgrid(np.atleast_1d(termsList[0][1]), np.atleast_1d(termsList[1]), np.atleast_1d(termsList[2]), indexing="ij")
+    return tuple(np.asarray(terminationValues, dtype=float).ravel() for terminationValues in terminationGrid)
+
 def UpdateTermData(term, termsList):
     """
     Updates the term data depending on the type of data that is entered in.
@@ -337,11 +650,14 @@ def UpdateTermData(term, termsList):
     Returns:
         termsList (list): The updated list of all of the terms
     """    
-    termValue = float(term.split("=")[1])
+    if any(termName in term for termName in ("VT", "IN", "RS", "GS", "RL")): termValue = GetTerminationValues(term.split("=")[1])      # Terminations can be lists or ranges
+    else:                                                                     termValue = float(term.split("=")[1])
     if "VT" in term:        termsList[0] = ('V', termValue)
     elif "IN" in term:      termsList[0] = ('I', termValue)
     elif "RS" in term:      termsList[1] = termValue
-    elif "GS" in term:      termsList[1] = 1/termValue
+    elif "GS" in term:
+        if np.any(np.asarray(termValue) == 0): raise ZeroDivisionError("Cannot divide by 0: GS=0")
+        termsList[1] = 1/termValue
     elif "RL" in term:      termsList[2] = termValue
     elif "Fstart" in term:  
         termsList[3] = termValue
@@ -409,7 +725,7 @@ def GetTerms(terms):
     for i in range(0, len(termsLines)):
         if not (termsLines[i] == ""):
             termsList, termsCounter = ConvertTerms(termsLines[i], termsList, termsCounter)
-    if "" in termsList: raise ValueError("TERMS Block has a missing term! Check TERMS block.\n" + terms)
+    if any(isinstance(termValue, str) for termValue in termsList): raise ValueError("TERMS Block has a missing term! Check TERMS block.\n" + terms)       # Unset terms are still ""
     # There are 6 terms, so if the counter is triggered too little or too many times, then the TERMS block is erroneous
     if termsCounter != 6: raise ValueError("TERMS Block has too many or too little terms! Check TERMS block.\n" + terms)
     return termsList
@@ -516,10 +832,144 @@ def GetOutputOrder(outputs):
     outputTerms = RemoveEmptyElements(outputTerms)
     return outputTerms
 
+# =====================================================================================================================================
+# ========================================================== TOLERANCE BLOCK ==========================================================
+# =====================================================================================================================================
+
+def GetTolerances(tolerances):
+    """
+    Gets the tolerance settings from the optional <TOLERANCE> block. Tolerances are written in percent and can be given for every component of a type,
+    or for the components on a specific line by including the nodes. A tolerance for a line overrides the tolerance for the type.
+
+    Examples shown below:
+        R=5 C=10 L=2%               (Every resistor is 5%, every capacitor 10% and every inductor 2%)
+        n1=4 n2=0 C=1               (The capacitor between nodes 4 and 0 is 1%)
+        n1=1 n2=2 TOL=0.5           (Every component between nodes 1 and 2 is 0.5%)
+        Nsamples=1000 Seed=42       (Number of random circuits and the seed for repeatable results)
+
+    Args:
+        tolerances (str): String containing the text in the <TOLERANCE> block
+
+    Raises:
+        ValueError: Raised when an unknown or invalid tolerance is entered
+
+    Returns:
+        toleranceSettings (dict): Dictionary containing the "types", "lines", "samples" and "seed" of the tolerance analysis
+
+    Additional Information:
+        "types" is keyed by component type and "lines" is keyed by (sorted nodes, component type), with a component type of None for TOL.
+        The tolerances are stored as fractions, so 5% is stored as 0.05
+    """    
+    toleranceSettings = {"types": {}, "lines": {}, "samples": 1000, "seed": None}
+
+    for toleranceLine in RemoveEmptyElements(tolerances.split("\n")):
+        toleranceLine = CleanTextLine(toleranceLine).replace("%", "")
+        if toleranceLine == "": continue
+
+        try:
+            terms = dict(term.split("=") for term in toleranceLine.split(" "))
+            nodes = tuple(sorted((float(terms.pop("n1")), float(terms.pop("n2"))))) if ("n1" in terms) or ("n2" in terms) else None
+            for key, value in terms.items():
+                if key == "Nsamples":       toleranceSettings["samples"] = int(float(value))
+                elif key == "Seed":         toleranceSettings["seed"] = int(float(value))
+                elif key in ("R", "G", "L", "C", "TOL"):
+                    componentType = None if key == "TOL" else key
+                    if nodes == None and componentType == None: raise ValueError
+                    if nodes == None: toleranceSettings["types"][componentType] = float(value) / 100
+                    else:             toleranceSettings["lines"][(nodes, componentType)] = float(value) / 100
+                else: raise ValueError
+        except:
+            raise ValueError("Invalid Tolerance Entered: " + toleranceLine + "\n Please Check TOLERANCE")
+    
+    if toleranceSettings["samples"] <= 0: raise ValueError("Invalid Number of Samples: " + str(toleranceSettings["samples"]) + "\n Please Check TOLERANCE")
+    return toleranceSettings
+
+def GetComponentTolerances(nodeComponents, toleranceSettings):
+    """
+    Gets the tolerance of every component in circuit order, in the same order as the list from GetCircuitComponents.
+    The tolerance for a component type and line is used first, then the tolerance for the line, then the tolerance for the type. Components without a
+    tolerance are fixed at their value.
+
+    Args:
+        nodeComponents (list): List of the components with their node data, from GetCircuitNodeComponents
+        toleranceSettings (dict): Tolerance settings from GetTolerances
+
+    Returns:
+        componentTolerances (list): List of the tolerance of each component as a fraction
+    """    
+    componentTolerances = []
+    for individualComponent in nodeComponents:
+        nodes = tuple(sorted(individualComponent[1:3]))
+        componentType = individualComponent[3]
+        if   (nodes, componentType) in toleranceSettings["lines"]:  componentTolerances.append(toleranceSettings["lines"][(nodes, componentType)])
+        elif (nodes, None) in toleranceSettings["lines"]:           componentTolerances.append(toleranceSettings["lines"][(nodes, None)])
+        else:                                                       componentTolerances.append(toleranceSettings["types"].get(componentType, 0.0))
+    return componentTolerances
+
 # ==================================================================================================================================
 # ========================================================== FILE READING ==========================================================
 # ==================================================================================================================================
 
+def StreamBlocks(file, blockNames=("CIRCUIT", "TERMS", "OUTPUT", "TOLERANCE")):
+    """
+    Reads the file one line at a time and yields the text of each block as it is read. This is a state machine that is either outside of a block or
+    inside one, and moves between the two on the <NAME> and </NAME> delimiters, so the file is read in a single pass. Comments are removed from each
+    line first, and the text outside of the blocks is discarded.
+
+    Example:
+        "<TERMS>\nVT=5 RS=50 # Source\n</TERMS>" yields ("TERMS", "\n"), ("TERMS", "VT=5 RS=50 \n") and ("TERMS", None)
+
+    Args:
+        file (_io.TextIOWrapper): This is the file that will be read
+        blockNames (tuple, optional): Names of the blocks to recognise. Defaults to ("CIRCUIT", "TERMS", "OUTPUT", "TOLERANCE")
+
+    Yields:
+        blockName (str): Name of the block the text belongs to
+        text (str): Text of the block on the line, or None when the block is closed
+    """
+    delimiterPattern = re.compile("<(/?)(" + "|".join(blockNames) + ")>")
+    currentBlock = None
+
+    for line in file:
+        line = StripComment(line)
+
+        # Lines without a delimiter belong to the current block
+        if not ("<" in line):
+            if (currentBlock != None) and (line != ""): yield currentBlock, line
+            continue
+
+        position = 0
+        for delimiter in delimiterPattern.finditer(line):
+            closingBoolean, blockName = delimiter.group(1) == "/", delimiter.group(2)
+            if (currentBlock == None) and not closingBoolean:
+                currentBlock = blockName
+                position = delimiter.end()
+            elif (currentBlock == blockName) and closingBoolean:
+                if delimiter.start() > position: yield currentBlock, line[position:delimiter.start()]
+                yield currentBlock, None
+                currentBlock = None
+        if (currentBlock != None) and (position < len(line)): yield currentBlock, line[position:]
+    return
+
+def ReadBlocks(file, blockNames=("CIRCUIT", "TERMS", "OUTPUT", "TOLERANCE")):
+    """
+    Reads the text of every block in the file in a single pass. A block is only kept once its closing delimiter has been read, and a block that is
+    repeated carries on from the text of the first one
+
+    Args:
+        file (_io.TextIOWrapper): This is the file that will be read
+        blockNames (tuple, optional): Names of the blocks to recognise. Defaults to ("CIRCUIT", "TERMS", "OUTPUT", "TOLERANCE")
+
+    Returns:
+        blocks (dict): Dictionary of the text inside each closed block, keyed by the block name
+    """
+    blocks = {}
+    pendingText = {}
+    for blockName, text in StreamBlocks(file, blockNames):
+        if text == None: blocks[blockName] = blocks.get(blockName, "") + "".join(pendingText.pop(blockName, []))
+        else:            pendingText.setdefault(blockName, []).append(text)
+    return blocks
+
 def ReadFile(fileName):
     """
     Reads the file and returns the text that is inside each of the blocks
@@ -529,7 +979,7 @@ def ReadFile(fileName):
 
     Raises:
         FileNotFoundError: Raised if the file entered does not exist
-        ValueError: Raised when one of the blocks in the .net file is empty
+        ValueError: Raised when one of the blocks in the .net file is missing or empty
 
     Returns:
         circuitText(str): String of the circuit block text
@@ -539,14 +989,334 @@ def ReadFile(fileName):
     print("READING FILE")
     try:
         with open(fileName, 'r') as file:
-            text = RemoveComments(file)
+            blocks = ReadBlocks(file)
     except:
         raise FileNotFoundError("No file or directory: '" + fileName + "'")
 
-    circuitText = ExtractBlock(text, "<CIRCUIT>", "</CIRCUIT>")
-    termsText = ExtractBlock(text, "<TERMS>", "</TERMS>")
-    outputText = ExtractBlock(text, "<OUTPUT>", "</OUTPUT>")
+    for blockName in ("CIRCUIT", "TERMS", "OUTPUT"):
+        if not (blockName in blocks): raise ValueError("<" + blockName + "> block is missing")
+    circuitText, termsText, outputText = blocks["CIRCUIT"], blocks["TERMS"], blocks["OUTPUT"]
 
     if (circuitText == "") or (termsText == "") or (outputText == ""): raise ValueError("Empty Block Detected!\n Check file: " + fileName)
 
     return circuitText, termsText, outputText
+
+def ReadOptionalBlock(fileName, blockName):
+    """
+    Reads the text inside an optional block of the file, such as <TOLERANCE>. Unlike ReadFile, a missing block is not an error
+
+    Args:
+        fileName (str): string for the file name to analyse
+        blockName (str): Name of the block without the delimiters, such as "TOLERANCE"
+
+    Raises:
+        FileNotFoundError: Raised if the file entered does not exist
+
+    Returns:
+        str: String of the block text, or an empty string if the block is missing
+    """    
+    try:
+        with open(fileName, 'r') as file:
+            blocks = ReadBlocks(file, (blockName,))
+    except:
+        raise FileNotFoundError("No file or directory: '" + fileName + "'")
+
+    return blocks.get(blockName, "")
+
+# ===================================================================================================================================
+# ========================================================== NETLIST CACHE ==========================================================
+# ===================================================================================================================================
+
+# Increase this whenever the parsed data changes, so that the caches written by an older parser are not reused
+PARSER_VERSION = 5
+
+def GetNetlistKey(fileName, nodeMode="numbered"):
+    """
+    Gets the key that identifies the contents of the .net file, which is a hash of the file, the parser version and the node normalisation
+
+    Args:
+        fileName (str): string for the file name to analyse
+        nodeMode (str, optional): Node mode of GetCircuitNodeComponents, as this changes the order of the components. Defaults to "numbered"
+
+    Raises:
+        FileNotFoundError: Raised if the file entered does not exist
+
+    Returns:
+        str: Hexadecimal key of the file
+    """    
+    try:
+        with open(fileName, 'rb') as file:
+            fileHash = hashlib.sha256(file.read())
+    except:
+        raise FileNotFoundError("No file or directory: '" + fileName + "'")
+    fileHash.update(("PARSER_VERSION=" + str(PARSER_VERSION) + " NODES=" + nodeMode).encode())
+    return fileHash.hexdigest()
+
+def GetCacheFileName(fileName):
+    """
+    Gets the name of the cache file that sits next to the .net file
+
+    Example:
+        "a_Test_Circuit_1.net" -> "a_Test_Circuit_1_cache.npz"
+
+    Args:
+        fileName (str): string for the file name to analyse
+
+    Returns:
+        str: Name of the cache file
+    """    
+    return os.path.splitext(fileName)[0] + "_cache.npz"
+
+def SaveNetlistCache(cacheFileName, netlistKey, componentTable, termsList, outputTerms):
+    """
+    Saves the parsed netlist to a binary .npz file as arrays, so that it can be reloaded without reading the text again. The file is written to a
+    temporary file in the same directory and then renamed over the cache, so an interrupted or concurrent run never leaves a partly written cache behind.
+    A cache that cannot be written only gives a warning, as the netlist has already been read.
+
+    Args:
+        cacheFileName (str): Name of the .npz file to write to
+        netlistKey (str): Key of the .net file from GetNetlistKey
+        componentTable (ComponentTable): Table of the components with their node data
+        termsList (list): List of each term, from GetTerms
+        outputTerms (list): List of tuples for each output variable, from GetOutputOrder
+    """    
+    try:
+        fileDescriptor, temporaryFileName = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(cacheFileName) + ".", dir=os.path.dirname(cacheFileName) or ".")
+    except OSError as error:
+        warnings.warn("WARNING: Could not write the netlist cache: " + cacheFileName + " (" + str(error) + ")")
+        return
+
+    try:
+        with os.fdopen(fileDescriptor, 'wb') as file:
+            np.savez(file, netlistKey=netlistKey,
+                     connectionCodes=componentTable.connectionCodes, typeCodes=componentTable.typeCodes, componentValues=componentTable.componentValues, nodes=componentTable.nodes,
+                     repeats=componentTable.repeats,
+                     sourceType=termsList[0][0], sourceValues=np.atleast_1d(termsList[0][1]), sourceImpedances=np.atleast_1d(termsList[1]),
+                     loadImpedances=np.atleast_1d(termsList[2]), termValues=np.array(termsList[3:6], dtype=float), logarithmicSweep=termsList[6],
+                     outputIndexes=np.array([outputTerm[0] for outputTerm in outputTerms], dtype=int),
+                     outputNames=np.array([outputTerm[1] for outputTerm in outputTerms], dtype=str),
+                     outputUnits=np.array([outputTerm[2] for outputTerm in outputTerms], dtype=str),
+                     outputDecibels=np.array([outputTerm[3] for outputTerm in outputTerms], dtype=bool),
+                     outputExponents=np.array([outputTerm[4] for outputTerm in outputTerms], dtype=int))
+        fileMask = os.umask(0)
+        os.umask(fileMask)
+        os.chmod(temporaryFileName, 0o666 & ~fileMask)         # mkstemp makes the file private, so it is given the permissions that open() would give
+        os.replace(temporaryFileName, cacheFileName)
+    except OSError as error:
+        warnings.warn("WARNING: Could not write the netlist cache: " + cacheFileName + " (" + str(error) + ")")
+        if os.path.exists(temporaryFileName): os.remove(temporaryFileName)
+    return
+
+def LoadNetlistCache(cacheFileName, netlistKey):
+    """
+    Loads the parsed netlist from a binary .npz file. The cache is only used if it was saved for the same file contents and parser version
+
+    Args:
+        cacheFileName (str): Name of the .npz file to read from
+        netlistKey (str): Key of the .net file from GetNetlistKey
+
+    Returns:
+        tuple: The componentTable, termsList and outputTerms, or None if the cache does not exist, is unreadable or is for a different file
+    """    
+    if not os.path.isfile(cacheFileName): return None
+    try:
+        with np.load(cacheFileName, allow_pickle=False) as data:
+            if str(data["netlistKey"]) != netlistKey: return None
+            componentTable = compTable.ComponentTable(data["connectionCodes"], data["typeCodes"], data["componentValues"], nodes=data["nodes"], repeats=data["repeats"])
+            sourceValue, sourceImpedance, loadImpedance = (float(values[0]) if len(values) == 1 else values for values in (data["sourceValues"], data["sourceImpedances"], data["loadImpedances"]))
+            termsList = [(str(data["sourceType"]), sourceValue), sourceImpedance, loadImpedance] + [float(termValue) for termValue in data["termValues"]] + [bool(data["logarithmicSweep"])]
+            outputTerms = [(int(outputIndex), str(outputName), str(outputUnit), bool(outputDecibel), int(outputExponent)) for outputIndex, outputName, outputUnit, outputDecibel, outputExponent
+                           in zip(data["outputIndexes"], data["outputNames"], data["outputUnits"], data["outputDecibels"], data["outputExponents"])]
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        warnings.warn("WARNING: Unreadable netlist cache: " + cacheFileName + " Reading the file instead")
+        return None
+    return componentTable, termsList, outputTerms
+
+def ReadNetlist(fileName, cacheBoolean=False, workers=1, nodeMode="numbered"):
+    """
+    Reads and parses every block of the .net file. When the cache is enabled, the parsed data is reloaded from the cache file if the contents of the .net
+    file have not changed, and is saved to the cache file otherwise. With more than one worker, the file is memory mapped and the <CIRCUIT> block is
+    parsed in parallel by ReadMappedFile
+
+    Args:
+        fileName (str): string for the file name to analyse
+        cacheBoolean (bool, optional): Uses the cache file when True. Defaults to False
+        workers (int, optional): Number of processes that parse the <CIRCUIT> block. Defaults to 1
+        nodeMode (str, optional): Node mode of GetCircuitNodeComponents. Defaults to "numbered"
+
+    Returns:
+        componentTable (ComponentTable): Table of the components with their node data, in circuit order
+        termsList (list): List of each term, from GetTerms
+        outputTerms (list): List of tuples for each output variable, from GetOutputOrder
+    """    
+    if cacheBoolean:
+        netlistKey = GetNetlistKey(fileName, nodeMode)
+        netlistData = LoadNetlistCache(GetCacheFileName(fileName), netlistKey)
+        if netlistData != None:
+            print("READING CACHE")
+            return netlistData
+
+    if workers > 1:
+        componentTable, termsText, outputText = ReadMappedFile(fileName, workers, nodeMode)
+    else:
+        circuitText, termsText, outputText = ReadFile(fileName)
+
+        print("READING CIRCUIT BLOCK")
+        componentTable = ReadCircuitTable(circuitText, nodeMode)
+
+    print("READING TERMS BLOCK")
+    termsList = GetTerms(termsText)
+    
+    print("READING OUTPUT BLOCK")
+    outputTerms = GetOutputOrder(outputText)
+
+    if cacheBoolean: SaveNetlistCache(GetCacheFileName(fileName), netlistKey, componentTable, termsList, outputTerms)
+    return componentTable, termsList, outputTerms
+
+# ====================================================================================================================================
+# ========================================================== PARALLEL READING ========================================================
+# ====================================================================================================================================
+
+def FindMappedDelimiter(mappedFile, delimiter, start=0):
+    """
+    Finds the first delimiter in the memory mapped file that is not inside a comment
+
+    Args:
+        mappedFile (mmap.mmap): Memory mapped .net file
+        delimiter (bytes): Delimiter to find, such as b"<CIRCUIT>"
+        start (int, optional): Position to start searching from. Defaults to 0
+
+    Returns:
+        int: Position of the delimiter, or -1 if it is not found
+    """    
+    position = mappedFile.find(delimiter, start)
+    while (position != -1) and (b"#" in mappedFile[mappedFile.rfind(b"\n", 0, position)+1:position]):
+        position = mappedFile.find(delimiter, position + 1)
+    return position
+
+def FindMappedBlock(mappedFile, blockName):
+    """
+    Finds the start and end positions of the text inside a block of the memory mapped file
+
+    Args:
+        mappedFile (mmap.mmap): Memory mapped .net file
+        blockName (str): Name of the block without the delimiters, such as "CIRCUIT"
+
+    Raises:
+        ValueError: Raised when the block is missing or is not closed
+
+    Returns:
+        start (int): Position after the opening delimiter
+        end (int): Position of the closing delimiter
+    """    
+    start = FindMappedDelimiter(mappedFile, ("<" + blockName + ">").encode())
+    if start == -1: raise ValueError("<" + blockName + "> block is missing")
+    start += len(blockName) + 2
+    end = FindMappedDelimiter(mappedFile, ("</" + blockName + ">").encode(), start)
+    if end == -1: raise ValueError("<" + blockName + "> block is missing")
+    return start, end
+
+def ReadMappedBlock(mappedFile, blockName):
+    """
+    Reads the text inside a block of the memory mapped file, without the comments
+
+    Args:
+        mappedFile (mmap.mmap): Memory mapped .net file
+        blockName (str): Name of the block without the delimiters, such as "TERMS"
+
+    Returns:
+        str: String of the block text
+    """    
+    start, end = FindMappedBlock(mappedFile, blockName)
+    blockText = mappedFile[start:end].decode().replace("\r\n", "\n").replace("\r", "\n")     # Universal line breaks, the same as reading the file as text
+    return "".join(StripComment(line) for line in blockText.splitlines(True))
+
+def SplitMappedBlock(mappedFile, start, end, numberOfChunks):
+    """
+    Splits the block between start and end into chunks of about the same size that begin and end on a line break, so no line is split between chunks
+
+    Args:
+        mappedFile (mmap.mmap): Memory mapped .net file
+        start (int): Position of the start of the block
+        end (int): Position of the end of the block
+        numberOfChunks (int): Number of chunks to split the block into
+
+    Returns:
+        list: List of the (start, end) positions of each chunk in order
+    """    
+    boundaries = [start]
+    for chunk in range(1, numberOfChunks):
+        lineBreak = mappedFile.find(b"\n", max(boundaries[-1], start + chunk*(end - start)//numberOfChunks), end)
+        if lineBreak == -1: break
+        boundaries.append(lineBreak + 1)
+    boundaries.append(end)
+    return [(chunkStart, chunkEnd) for chunkStart, chunkEnd in zip(boundaries[:-1], boundaries[1:]) if chunkEnd > chunkStart]
+
+# Start of a line that opens a REPEAT section
+REPEAT_PATTERN = re.compile(rb"(?im)^[ \t,]*REPEAT\b")
+
+def ParseCircuitChunk(fileName, start, end, nodeMode="numbered"):
+    """
+    Parses the component lines between start and end of the .net file into typed arrays. The file is memory mapped again by each process, so only the
+    positions and the arrays are sent between the processes
+
+    Args:
+        fileName (str): string for the file name to analyse
+        start (int): Position of the start of the chunk
+        end (int): Position of the end of the chunk
+        nodeMode (str, optional): Node mode of GetCircuitNodeComponents, only "numbered" nodes must be adjacent. Defaults to "numbered"
+
+    Raises:
+        ValueError: Invalid circuit connections: Series nodes must be adjacent
+
+    Returns:
+        chunkArrays (dict): Dictionary of the "connectionCodes", "typeCodes", "componentValues" and "nodes" arrays of the components in the chunk
+    """    
+    with open(fileName, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+        chunkText = mappedFile[start:end].decode()
+    return ParseCircuitLines(chunkText.splitlines(), nodeMode)[0]
+
+def ReadMappedFile(fileName, workers, nodeMode="numbered"):
+    """
+    Reads the file by memory mapping it. The <CIRCUIT> block is split into line aligned chunks that are parsed into typed arrays by a pool of processes,
+    then the arrays are merged, sorted into circuit order and the series node connections are checked once on the merged arrays
+
+    Args:
+        fileName (str): string for the file name to analyse
+        workers (int): Number of processes that parse the <CIRCUIT> block
+        nodeMode (str, optional): Node mode of GetCircuitNodeComponents. Defaults to "numbered"
+
+    Raises:
+        FileNotFoundError: Raised if the file entered does not exist
+        ValueError: Raised when one of the blocks in the .net file is missing or empty
+
+    Returns:
+        componentTable (ComponentTable): Table of the components with their node data in circuit order
+        termsText (str): String of the terms block text
+        outputText (str): String of the output block text
+    """    
+    print("READING FILE")
+    try:
+        file = open(fileName, 'rb')
+    except:
+        raise FileNotFoundError("No file or directory: '" + fileName + "'")
+
+    with file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mappedFile:
+        circuitStart, circuitEnd = FindMappedBlock(mappedFile, "CIRCUIT")
+        termsText = ReadMappedBlock(mappedFile, "TERMS")
+        outputText = ReadMappedBlock(mappedFile, "OUTPUT")
+        if (circuitStart == circuitEnd) or (termsText == "") or (outputText == ""): raise ValueError("Empty Block Detected!\n Check file: " + fileName)
+
+        # A REPEAT section cannot be split between chunks, and a netlist with sections is short, so the block is parsed as a whole instead
+        if REPEAT_PATTERN.search(mappedFile, circuitStart, circuitEnd):
+            circuitText = ReadMappedBlock(mappedFile, "CIRCUIT")
+            print("READING CIRCUIT BLOCK")
+            return ReadCircuitTable(circuitText, nodeMode), termsText, outputText
+        chunkBounds = SplitMappedBlock(mappedFile, circuitStart, circuitEnd, 4 * workers)
+
+    print("READING CIRCUIT BLOCK")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunkResults = list(executor.map(functools.partial(ParseCircuitChunk, fileName, nodeMode=nodeMode), *zip(*chunkBounds)))
+    circuitArrays = {entry: np.concatenate([chunkArrays[entry] for chunkArrays in chunkResults]) for entry in chunkResults[0]}
+
+    return GetCircuitTable(circuitArrays, [], nodeMode), termsText, outputText
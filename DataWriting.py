@@ -3,7 +3,7 @@
 #   Summary:      The module that contains the code for writing the data to a .csv file or .png
 #   Description:  This is a set of functions that are used to write the data into a .csv file. These include: Functions that write the
 #                 information into the file, functions that format the numbers into the correct form, format the numbers and ensure
-#                 that the data is written to the correct unit.
+#                 that the data is written to the correct unit. The data can also be written as binary columns with a JSON header.
 #
 #   Author:       C.J. Gacay 
 # ====================================================================================================================================
@@ -13,6 +13,7 @@ import cmath
 import numpy as np
 import pandas as pd
 import decimal
+import json, os, shutil, tempfile, zipfile
 
 def ConvertToDecibel(value, outputVariable):
     """
@@ -44,71 +45,486 @@ def FormatNumber(value,n=11):
     """    
     return ('%.3e' % decimal.Decimal(value)).rjust(n)
 
-def WriteDataToFile(outputTerms, outputs, fileName, frequency):
+def ConvertOutputColumns(values, outputTerm):
     """
-    Writes the output data into the .csv file given that the file is open for editing. This function also converts the value into decibels and polar form when stated.
-    outputTerm lists are laid out as: (Output Index, Variable Name, Variable Unit, Decibel Boolean, Exponent)
+    Converts an array of output values into the two parts that are written to the file, in the same way as CsvWriter.WriteRow. Decibel outputs become the
+    magnitude in decibels and the phase, and other outputs have the exponent applied and become the real and imaginary parts.
 
-    Supporting Mathematics are linked below:
-    
-    Converting complex numbers to magnitude in dB and phase in rads: https://www.rohde-schwarz.com/uk/faq/converting-the-real-and-imaginary-numbers-to-magnitude-in-db-and-phase-in-degrees-faq_78704-30465.html
-        
-    Conversion to decibels: https://dspillustrations.com/pages/posts/misc/decibel-conversion-factor-10-or-factor-20.html#:~:text=The%20dB%20is%20calculated%20via,amplitude%2C%20the%20factor%20is%2020.
+    Args:
+        values (ndarray): Array of the output values
+        outputTerm (tuple): The output term in the form (Output Index, Variable Name, Variable Unit, Decibel Boolean, Exponent)
+
+    Returns:
+        firstPart (ndarray): Real part or magnitude in decibels
+        secondPart (ndarray): Imaginary part or phase in rads
+    """    
+    if (outputTerm[3]):
+        decibelFactor = 10 if ("P" in outputTerm[1]) or ("p" in outputTerm[1]) else 20
+        with np.errstate(divide="ignore"):
+            return decibelFactor*np.log10(np.abs(values)), np.angle(values)
+    values = values / (10 ** outputTerm[4])
+    return np.real(values), np.imag(values)
+
+def ConvertToDecibelColumn(values, outputVariable):
+    """
+    Converts an array of output values into decibels, giving the same values as ConvertToDecibel. The logarithm is taken for the whole array at once,
+    and the few values that fall close to a rounding boundary of the 4 significant figures are calculated again with ConvertToDecibel, so that the
+    last bit of the logarithm cannot change the text that is written.
+
+    Args:
+        values (ndarray): Array of the output values
+        outputVariable (str): String of the output variable to check
+
+    Raises:
+        ValueError: Raised when a value is 0, the same as ConvertToDecibel
+
+    Returns:
+        decibels (ndarray): Array of the values in decibels
+    """
+    decibelFactor = 10 if ("P" in outputVariable) or ("p" in outputVariable) else 20
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decibels = decibelFactor*np.log10(np.abs(values))
+
+    for index in np.flatnonzero(GetRoundingBoundaryMask(decibels)):
+        decibels[index] = np.real(ConvertToDecibel(values[index], outputVariable))
+    return decibels
+
+def GetRoundingBoundaryMask(values, tolerance=1e-9):
+    """
+    Gets the values that are within a relative tolerance of a rounding boundary of the 4 significant figures written to the file, or are not finite
+
+    Args:
+        values (ndarray): Array of the values
+        tolerance (float, optional): Relative distance from the boundary. Defaults to 1e-9
+
+    Returns:
+        ndarray: Boolean array that is True for each value close to a boundary
+    """
+    magnitudes = np.abs(values)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        mantissas = magnitudes / 10.0**(np.floor(np.log10(magnitudes)) - 3)      # Mantissa scaled to 1000-9999, so the rounding boundaries are at .5
+        return ~np.isfinite(mantissas) | (np.abs(mantissas - np.floor(mantissas) - 0.5) < tolerance*mantissas)
+
+def GetOutputColumns(outputTerms, outputColumns):
+    """
+    Gets the two parts of every output term that are written to the file, for whole columns at once. The exponent is applied and the values are
+    converted into decibels and polar form in the same order as CsvWriter.WriteRow, so every part is identical to the value it writes.
 
     Args:
         outputTerms (list): List of all of the output terms. This is a list of lists
-        outputs (list): List of all of the output values
-        fileName (str): Name of the file to write to
-        frequency (float): Frequency that is being analysed
-    """    
-    decibelValue = 0
-    with open(fileName, 'a') as file:
-        file.write("\n"+FormatNumber(frequency,10))
+        outputColumns (ndarray): (12, N) block of the output values, from CascadeCircuit.CalculateOutputs
 
+    Returns:
+        columns (list): List of the arrays of each column, two for each output term
+    """
+    outputColumns = list(outputColumns)          # The exponent is applied in place as in CsvWriter.WriteRow, without changing the list of the caller
+    columns = []
     for outputTerm in outputTerms:
         outputIndex = outputTerm[0]
-        #outputs[outputIndex] = outputs[outputIndex] / (10 ** outputTerm[4])     # Applies the exponent to the value
-
-        # Checks if the value is read in decibels
         if (outputTerm[3]):
-            decibelValue = ConvertToDecibel(outputs[outputIndex], outputTerm[1])
-            firstPart = np.real(decibelValue)
-            secondPart = np.angle(outputs[outputIndex])
+            columns += [ConvertToDecibelColumn(outputColumns[outputIndex], outputTerm[1]), np.angle(outputColumns[outputIndex])]
         else:
-            outputs[outputIndex] = outputs[outputIndex] / (10 ** outputTerm[4])     # Applies the exponent to the value
-            firstPart = np.real(outputs[outputIndex])
-            secondPart = np.imag(outputs[outputIndex])
+            outputColumns[outputIndex] = outputColumns[outputIndex] / (10 ** outputTerm[4])     # Applies the exponent to the value
+            columns += [np.real(outputColumns[outputIndex]), np.imag(outputColumns[outputIndex])]
+    return columns
 
-        with open(fileName, 'a') as file:
-            file.write("," + FormatNumber(firstPart) + "," + FormatNumber(secondPart))
+def FormatRows(frequencies, columns):
+    """
+    Formats a block of rows in one pass. A single format string holds every value of the block, so the text is made by one formatting operation
+    instead of a call to FormatNumber for each value. '%.3e' of a Decimal formats the float value of the Decimal, so the text is the same as
+    FormatNumber, justified to 10 characters for the frequency and 11 characters for the other columns.
 
-    with open(fileName, 'a') as file:
-            file.write(",")
-    return
+    Args:
+        frequencies (ndarray): Frequencies of the rows
+        columns (list): List of the arrays of each column
 
-def InitialiseFile(fileName, outputTerms):
+    Returns:
+        str: Text of the rows, each starting with a new line and ending with a comma
     """
-    Initialises the file for writing by filling in the variables and units for each column
+    rowFormat = "\n%10.3e" + ",%11.3e"*len(columns) + ","
+    values = np.column_stack([np.asarray(frequencies, dtype=float)] + [np.asarray(column, dtype=float) for column in columns])
+    return (rowFormat*len(values)) % tuple(values.ravel().tolist())
 
-    Args:
-        fileName (str): Name of the file to write to
-        outputTerms (list): List of all of the output terms to consider
+# ===================================================================================================================================
+# ========================================================== CSV WRITER =============================================================
+# ===================================================================================================================================
+
+class CsvWriter:
     """
-    with open(fileName, 'a') as file:
-        file.write("      Freq")
+    Writer that keeps one buffered handle to the .csv file open for the whole run, instead of opening the file again for every value. The rows are
+    collected in the buffer of the handle and written to the file in blocks of bufferSize bytes.
+
+    Example:
+        with CsvWriter("test.csv", bufferSize=2**20) as csvWriter:
+            csvWriter.WriteHeader(outputTerms)
+            csvWriter.WriteRow(outputTerms, outputs, frequency)
+    """
+
+    def __init__(self, fileName, bufferSize=2**20, mode='w'):
+        """
+        Opens the file for writing
+
+        Args:
+            fileName (str): Name of the file to write to
+            bufferSize (int, optional): Number of bytes that are collected before they are written to the file. Defaults to 1 MiB
+            mode (str, optional): 'w' to replace the file or 'a' to add to the end of it. Defaults to 'w'
+        """
+        self.fileName = fileName
+        self.bufferSize = max(1, int(bufferSize))
+        self.file = open(fileName, mode, buffering=self.bufferSize)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.Close()
+        return False
+
+    def Close(self):
+        """
+        Writes the buffer to the file and closes it
+        """
+        self.file.close()
+        return
+
+    def WriteHeader(self, outputTerms):
+        """
+        Writes the variables and units for each column
+
+        Args:
+            outputTerms (list): List of all of the output terms to consider
+        """
+        header = ["      Freq"]
         for outputTerm in outputTerms:
             variable, variableUnit, decibleCheck = outputTerm[1:4]
 
             # Prints as in absolute and angle or real and imaginary depending on if it is a decibel value or not. Text is justified to the right
-            if (decibleCheck): file.write("," + ("|" + str(variable) + "|").rjust(11) + ","+ ("/_" + str(variable)).rjust(11))
-            else:               file.write(","+ ("Re(" + str(variable) + ")").rjust(11)+","+ ("Im(" + str(variable) + ")").rjust(11))      
-        file.write("\n        Hz")
+            if (decibleCheck): header.append("," + ("|" + str(variable) + "|").rjust(11) + ","+ ("/_" + str(variable)).rjust(11))
+            else:               header.append(","+ ("Re(" + str(variable) + ")").rjust(11)+","+ ("Im(" + str(variable) + ")").rjust(11))      
+        header.append("\n        Hz")
         for outputTerm in outputTerms:
             variable, variableUnit, decibleCheck = outputTerm[1:4]      # Unpacks the necessary data from the output terms from the list
-            if (decibleCheck): file.write("," + (str(variableUnit)).rjust(11) + ",       Rads")                         # When in decibels, write in the unit and rads 
-            else:               file.write("," + str(variableUnit).rjust(11) + "," + str(variableUnit).rjust(11))       # Displays the normal units otherwise
+            if (decibleCheck): header.append("," + (str(variableUnit)).rjust(11) + ",       Rads")                         # When in decibels, write in the unit and rads 
+            else:               header.append("," + str(variableUnit).rjust(11) + "," + str(variableUnit).rjust(11))       # Displays the normal units otherwise
+        self.file.write("".join(header))
+        return
+
+    def WriteRows(self, outputTerms, outputColumns, frequencies, blockSize=4096):
+        """
+        Writes the output data of every frequency, formatting blocks of rows at once with GetOutputColumns and FormatRows. The text is the same as
+        calling WriteRow for each frequency.
+
+        Args:
+            outputTerms (list): List of all of the output terms. This is a list of lists
+            outputColumns (ndarray): (12, N) block of the output values, from CascadeCircuit.CalculateOutputs
+            frequencies (ndarray): Frequencies that were analysed
+            blockSize (int, optional): Number of rows that are formatted at once. Defaults to 4096
+        """
+        for start in range(0, len(frequencies), blockSize):
+            block = slice(start, start + blockSize)
+            columns = GetOutputColumns(outputTerms, [np.asarray(outputColumn)[block] for outputColumn in outputColumns])
+            self.file.write(FormatRows(frequencies[block], columns))
+        return
+
+    def WriteRow(self, outputTerms, outputs, frequency):
+        """
+        Writes the output data of a single frequency as a row. This also converts the value into decibels and polar form when stated.
+        outputTerm lists are laid out as: (Output Index, Variable Name, Variable Unit, Decibel Boolean, Exponent)
+
+        Supporting Mathematics are linked below:
+
+        Converting complex numbers to magnitude in dB and phase in rads: https://www.rohde-schwarz.com/uk/faq/converting-the-real-and-imaginary-numbers-to-magnitude-in-db-and-phase-in-degrees-faq_78704-30465.html
+
+        Conversion to decibels: https://dspillustrations.com/pages/posts/misc/decibel-conversion-factor-10-or-factor-20.html#:~:text=The%20dB%20is%20calculated%20via,amplitude%2C%20the%20factor%20is%2020.
+
+        Args:
+            outputTerms (list): List of all of the output terms. This is a list of lists
+            outputs (list): List of all of the output values
+            frequency (float): Frequency that is being analysed
+        """
+        row = ["\n" + FormatNumber(frequency,10)]
+        for outputTerm in outputTerms:
+            outputIndex = outputTerm[0]
+
+            # Checks if the value is read in decibels
+            if (outputTerm[3]):
+                decibelValue = ConvertToDecibel(outputs[outputIndex], outputTerm[1])
+                firstPart = np.real(decibelValue)
+                secondPart = np.angle(outputs[outputIndex])
+            else:
+                outputs[outputIndex] = outputs[outputIndex] / (10 ** outputTerm[4])     # Applies the exponent to the value
+                firstPart = np.real(outputs[outputIndex])
+                secondPart = np.imag(outputs[outputIndex])
+            row.append("," + FormatNumber(firstPart) + "," + FormatNumber(secondPart))
+        row.append(",")
+        self.file.write("".join(row))
+        return
+
+class TerminationWriter:
+    """
+    Writer of a sweep over a grid of terminations, with the same WriteRows and Close as CsvWriter. Each termination has its own .csv file, laid out in
+    the same way as the file of a single termination and numbered in the order of DataReading.GetTerminations, and the main file becomes an index of
+    the terminations and their files. The file of every termination is kept open for the lifetime of the writer, and the buffer size is shared between
+    the files, with at least 64 KiB for each file.
+
+    Example:
+        with TerminationWriter("test.csv", outputTerms, 'V', sourceValues, sourceImpedances, loadImpedances) as terminationWriter:
+            terminationWriter.WriteRows(outputTerms, outputColumns, frequencies)         # (12, N, terminations) block
+    """
+
+    def __init__(self, fileName, outputTerms, sourceType, sourceValues, sourceImpedances, loadImpedances, bufferSize=2**20):
+        """
+        Writes the index to the main file and the header of the file of every termination
+
+        Args:
+            fileName (str): Name of the main file, which must include the .csv extension
+            outputTerms (list): List of all of the output terms to consider
+            sourceType (str): 'V' for a Thevenin source or 'I' for a Norton source
+            sourceValues (ndarray): Source value of each termination
+            sourceImpedances (ndarray): Source impedance of each termination
+            loadImpedances (ndarray): Load impedance of each termination
+            bufferSize (int, optional): Number of bytes of buffer that are shared between the files of the terminations. Defaults to 1 MiB
+        """
+        self.fileNames = [fileName.replace(".csv", "_" + str(index + 1) + ".csv") for index in range(len(loadImpedances))]
+
+        with CsvWriter(fileName, bufferSize) as csvWriter:
+            sourceName, sourceUnit = ("VT", "V") if "V" in sourceType else ("IN", "A")
+            csvWriter.file.write("     Index," + sourceName.rjust(11) + ",         RS,         RL,File")
+            csvWriter.file.write("\n          ," + sourceUnit.rjust(11) + ",       Ohms,       Ohms,")
+            for index, termination in enumerate(zip(sourceValues, sourceImpedances, loadImpedances, self.fileNames)):
+                csvWriter.file.write("\n" + str(index + 1).rjust(10) + "," + ",".join(FormatNumber(value) for value in termination[:3]) + "," + os.path.basename(termination[3]))
+
+        # Each file keeps its own handle, and closes the files that were already opened if a later one fails
+        fileBufferSize = max(2**16, bufferSize // max(1, len(self.fileNames)))
+        self.csvWriters = []
+        try:
+            for terminationFileName in self.fileNames:
+                self.csvWriters.append(CsvWriter(terminationFileName, fileBufferSize))
+                self.csvWriters[-1].WriteHeader(outputTerms)
+        except BaseException:
+            self.Close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.Close()
+        return False
+
+    def Close(self):
+        """
+        Writes the buffer of every termination to its file and closes them
+        """
+        while self.csvWriters:
+            self.csvWriters.pop().Close()
+        return
+
+    def WriteRows(self, outputTerms, outputColumns, frequencies):
+        """
+        Adds the rows of a chunk to the file of every termination
+
+        Args:
+            outputTerms (list): List of all of the output terms
+            outputColumns (ndarray): (12, N, terminations) block of the output values, from CascadeCircuit.CalculateOutputs
+            frequencies (ndarray): Frequencies of the chunk
+        """
+        outputColumns = np.asarray(outputColumns)
+        for index, csvWriter in enumerate(self.csvWriters):
+            csvWriter.WriteRows(outputTerms, outputColumns[:, :, index], frequencies)
+        return
+
+# ===================================================================================================================================
+# ========================================================== BINARY COLUMNS =========================================================
+# ===================================================================================================================================
+
+COLUMN_FORMAT_VERSION = 2
+
+def GetColumnHeader(outputTerms, numberOfFrequencies, terminations=None):
+    """
+    Gets the JSON header of the binary columns, which holds the name, unit, type and row shape of every column. Each output term is a complex column
+    with its exponent applied, so the values are in the stated unit. Decibel terms keep the complex value, and the decibel flag records that the file
+    writes them as magnitude in decibels and phase. For a grid of terminations, each row of an output column holds the value of every termination, and
+    the terminations are listed in the header.
+
+    Args:
+        outputTerms (list): List of all of the output terms, from DataReading.GetOutputOrder
+        numberOfFrequencies (int): Number of rows in each column
+        terminations (tuple, optional): (Source Type, Source Values, Source Impedances, Load Impedances) of a grid of terminations. Defaults to None
+
+    Returns:
+        header (dict): Dictionary of the header
+    """
+    rowShape = [] if terminations is None else [len(terminations[3])]
+    columns = [{"key": "frequency", "variable": "Freq", "unit": "Hz", "decibel": False, "exponent": 0, "dtype": "float64", "shape": []}]
+    usedKeys = {"frequency"}
+    for outputTerm in outputTerms:
+        outputIndex, variable, variableUnit, decibleCheck, exponent = outputTerm[:5]
+
+        # Repeated variables (for example in V and in mV) get a numbered key
+        key, count = str(variable), 1
+        while key in usedKeys:
+            count += 1
+            key = str(variable) + "_" + str(count)
+        usedKeys.add(key)
+        columns.append({"key": key, "variable": str(variable), "unit": str(variableUnit), "decibel": bool(decibleCheck), "exponent": int(exponent),
+                        "outputIndex": int(outputIndex), "dtype": "complex128", "shape": rowShape})
+    header = {"version": COLUMN_FORMAT_VERSION, "length": int(numberOfFrequencies), "byteorder": "little", "columns": columns}
+    if terminations is not None:
+        header["terminations"] = {"sourceType": str(terminations[0]), "sourceValues": np.asarray(terminations[1], dtype=float).tolist(),
+                                  "sourceImpedances": np.asarray(terminations[2], dtype=float).tolist(), "loadImpedances": np.asarray(terminations[3], dtype=float).tolist()}
+    return header
+
+def GetColumnValues(outputTerms, outputColumns, frequencies):
+    """
+    Gets the array of every column in the order of the header, with the exponent of each output term applied
+
+    Args:
+        outputTerms (list): List of all of the output terms
+        outputColumns (ndarray): (12, N) or (12, N, terminations) block of the output values, from CascadeCircuit.CalculateOutputs
+        frequencies (ndarray): Frequencies that were analysed
+
+    Returns:
+        list: List of the arrays of each column
+    """
+    columnValues = [np.asarray(frequencies, dtype="<f8")]
+    for outputTerm in outputTerms:
+        columnValues.append(np.asarray(np.asarray(outputColumns[outputTerm[0]]) / (10 ** outputTerm[4]), dtype="<c16"))
+    return columnValues
+
+def WriteBinaryColumns(fileName, columnFormat, outputTerms, outputColumns, frequencies, terminations=None):
+    """
+    Writes the frequencies and every output term as typed binary columns, instead of the text of the .csv file.
+
+    Formats:
+        "npz": Compressed .npz file with an array for each column and the JSON header in the "header" array
+        "raw": Directory with a header.json file and a raw little-endian <key>.bin file for each column, which LoadBinaryColumns maps into memory
+
+    Args:
+        fileName (str): Name of the .npz file or the directory to write to
+        columnFormat (str): "npz" or "raw"
+        outputTerms (list): List of all of the output terms
+        outputColumns (ndarray): (12, N) or (12, N, terminations) block of the output values, from CascadeCircuit.CalculateOutputs
+        frequencies (ndarray): Frequencies that were analysed
+        terminations (tuple, optional): (Source Type, Source Values, Source Impedances, Load Impedances) of a grid of terminations. Defaults to None
+    """
+    with ColumnWriter(fileName, columnFormat, outputTerms, terminations) as columnWriter:
+        columnWriter.WriteRows(outputTerms, outputColumns, frequencies)
     return
 
+class ColumnWriter:
+    """
+    Writer of the binary columns that takes the rows a chunk at a time, in the same way as CsvWriter. Each column is added to the end of its raw file
+    as the chunks arrive, so the columns are never held in memory as a whole. The header is written when the writer is closed, once the number of
+    rows is known, and for the "npz" format the raw files are then copied into the compressed .npz file and removed.
+
+    Example:
+        with ColumnWriter("test_columns", "raw", outputTerms) as columnWriter:
+            columnWriter.WriteRows(outputTerms, outputColumns, frequencies)
+    """
+
+    def __init__(self, fileName, columnFormat, outputTerms, terminations=None):
+        """
+        Opens a raw file for each column
+
+        Args:
+            fileName (str): Name of the .npz file or the directory to write to
+            columnFormat (str): "npz" or "raw"
+            outputTerms (list): List of all of the output terms
+            terminations (tuple, optional): (Source Type, Source Values, Source Impedances, Load Impedances) of a grid of terminations. Defaults to None
+
+        Raises:
+            ValueError: Raised when the format is unknown
+        """
+        if not (columnFormat in ("npz", "raw")): raise ValueError("Unknown Column Format: " + str(columnFormat) + "\n Use npz or raw")
+        self.fileName = fileName
+        self.columnFormat = columnFormat
+        self.header = GetColumnHeader(outputTerms, 0, terminations)
+
+        # The columns of an .npz file are collected in a temporary directory next to it, so they are on the same disk
+        if columnFormat == "raw":
+            self.directory = fileName
+            os.makedirs(fileName, exist_ok=True)
+        else:
+            self.directory = tempfile.mkdtemp(prefix=".columns_", dir=os.path.dirname(os.path.abspath(fileName)))
+
+        self.files = []
+        for column in self.header["columns"]:
+            column["file"] = column["key"] + ".bin"
+            self.files.append(open(os.path.join(self.directory, column["file"]), 'wb'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.Close()
+        return False
+
+    def WriteRows(self, outputTerms, outputColumns, frequencies):
+        """
+        Adds the rows of a chunk to the end of every column
+
+        Args:
+            outputTerms (list): List of all of the output terms
+            outputColumns (ndarray): (12, N) or (12, N, terminations) block of the output values, from CascadeCircuit.CalculateOutputs
+            frequencies (ndarray): Frequencies of the chunk
+        """
+        for file, values in zip(self.files, GetColumnValues(outputTerms, outputColumns, frequencies)):
+            values.tofile(file)
+        self.header["length"] += len(frequencies)
+        return
+
+    def Close(self):
+        """
+        Closes the raw files and writes the header. For the "npz" format, every column is copied into the .npz file in blocks and the raw files are removed
+        """
+        if not self.files: return
+        for file in self.files: file.close()
+        self.files = []
+
+        if self.columnFormat == "raw":
+            with open(os.path.join(self.directory, "header.json"), 'w') as file:
+                json.dump(self.header, file, indent=1)
+            return
+
+        # Each column becomes a .npy entry of the archive, in the same layout as np.savez_compressed
+        fileName = self.fileName if self.fileName.endswith(".npz") else self.fileName + ".npz"
+        with zipfile.ZipFile(fileName, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            with archive.open("header.npy", 'w') as entry:
+                columns = [{key: value for key, value in column.items() if key != "file"} for column in self.header["columns"]]
+                np.lib.format.write_array(entry, np.array(json.dumps(dict(self.header, columns=columns))))
+            for column in self.header["columns"]:
+                with archive.open(column["key"] + ".npy", 'w', force_zip64=True) as entry:
+                    np.lib.format.write_array_header_2_0(entry, {"descr": np.dtype(column["dtype"]).newbyteorder("<").str, "fortran_order": False,
+                                                                 "shape": (self.header["length"],) + tuple(column["shape"])})
+                    with open(os.path.join(self.directory, column["file"]), 'rb') as file: shutil.copyfileobj(file, entry, 2**20)
+        shutil.rmtree(self.directory)
+        return
+
+def LoadBinaryColumns(fileName):
+    """
+    Loads the columns written by WriteBinaryColumns. Raw columns are returned as read-only memory maps, so only the parts that are used are read
+    from the disk. The output columns of a grid of terminations are (N, terminations) arrays.
+
+    Args:
+        fileName (str): Name of the .npz file or the directory of raw columns
+
+    Returns:
+        header (dict): Dictionary of the header
+        columns (dict): Dictionary of the array of each column, keyed by the column key
+    """
+    if os.path.isdir(fileName):
+        with open(os.path.join(fileName, "header.json"), 'r') as file:
+            header = json.load(file)
+        columns = {column["key"]: np.memmap(os.path.join(fileName, column["file"]), dtype=np.dtype(column["dtype"]).newbyteorder("<"), mode='r',
+                                            shape=(header["length"],) + tuple(column.get("shape", ()))) for column in header["columns"]}
+        return header, columns
+
+    with np.load(fileName) as data:
+        header = json.loads(str(data["header"]))
+        columns = {column["key"]: data[column["key"]] for column in header["columns"]}
+    return header, columns
+
 def GenerateGraph(userColumns, inputFile, outputFile):
     """
     Generates the graphs for user-stated columns
@@ -132,13 +548,98 @@ def GenerateGraph(userColumns, inputFile, outputFile):
         plt.savefig(outputFile + "_" + str(graphColumns[i]) + ".png")
     return  
 
-def CreateFile(fileName):
+def FormatComplexNumber(value):
+    """
+    Formats a complex number for the analysis summary, in scientific notation to 4 significant figures
+
+    Args:
+        value (complex): The value to be formatted
+
+    Returns:
+        str: String format of the value in the form a+bj
+    """    
+    return '%.3e%+.3ej' % (np.real(value), np.imag(value))
+
+def WriteAnalysisSummary(fileName, analysisResults):
+    """
+    Writes the summary of the transfer function analysis to a text file. Each transfer function is written as a section with its poles, zeros,
+    resonances, peak magnitude, -3 dB corners and bandwidth.
+
+    Args:
+        fileName (str): Name of the file to write to
+        analysisResults (dict): Dictionary of the results for each transfer function, from CircuitPolynomials.AnalyseRationalCircuit
+    """    
+    with open(fileName, 'w') as file:
+        for name, results in analysisResults.items():
+            file.write(name + "\n")
+            file.write("    Zeros (rad/s):           " + ", ".join(FormatComplexNumber(zero) for zero in results["zeros"]) + "\n")
+            file.write("    Poles (rad/s):           " + ", ".join(FormatComplexNumber(pole) for pole in results["poles"]) + "\n")
+            file.write("    Resonances (Hz, Q):      " + ", ".join('%.3e (Q=%.3e)' % resonance for resonance in results["resonances"]) + "\n")
+            file.write("    Antiresonances (Hz, Q):  " + ", ".join('%.3e (Q=%.3e)' % resonance for resonance in results["antiresonances"]) + "\n")
+            file.write("    Peak Magnitude:          " + '%.3e' % results["peakMagnitude"] + " at " + '%.3e' % results["peakFrequency"] + " Hz\n")
+            file.write("    -3 dB Corners (Hz):      " + ", ".join('%.3e' % corner for corner in results["corners"]) + "\n")
+            file.write("    Bandwidth (Hz):          " + '%.3e' % results["bandwidth"] + "\n\n")
+    return
+
+def WriteSensitivityFile(fileName, componentLabels, frequencies, sensitivities):
     """
-    Creates an empty file with the inputted fileName. This MUST include the file extension
+    Writes the sensitivity matrix to a .csv file. Each row is keyed by the component line and the frequency, followed by the real and imaginary parts of
+    the derivative of each output with respect to the component value. The columns use the same formatting as the main .csv file.
 
     Args:
-        fileName (str): Name of the file
+        fileName (str): Name of the file to write to
+        componentLabels (list): List of the label for each component, from DataReading.GetComponentLabels
+        frequencies (ndarray): Frequencies that were analysed
+        sensitivities (dict): Dictionary of (components, frequencies) arrays for each output, from CircuitSensitivity.CalculateSensitivities
     """    
+    labelWidth = max([len(label) for label in componentLabels] + [len("Component")])
+    units = {"Av": "L/x", "Ai": "L/x", "Zin": "Ohms/x", "Zout": "Ohms/x", "Pout": "W/x"}
+
     with open(fileName, 'w') as file:
-        file.write("")
+        file.write("Component".rjust(labelWidth) + ",      Freq")
+        for name in sensitivities: file.write("," + ("Re(d" + name + ")").rjust(11) + "," + ("Im(d" + name + ")").rjust(11))
+        file.write("\n" + "".rjust(labelWidth) + ",        Hz")
+        for name in sensitivities: file.write("," + units.get(name, "1/x").rjust(11) + "," + units.get(name, "1/x").rjust(11))
+
+        for index, label in enumerate(componentLabels):
+            for frequencyIndex, frequency in enumerate(frequencies):
+                file.write("\n" + label.rjust(labelWidth) + "," + FormatNumber(frequency,10))
+                for name in sensitivities:
+                    value = sensitivities[name][index, frequencyIndex]
+                    file.write("," + FormatNumber(np.real(value)) + "," + FormatNumber(np.imag(value)))
+                file.write(",")
+    return
+
+def WriteToleranceFile(fileName, outputTerms, frequencies, toleranceBands):
+    """
+    Writes the percentile bands of the tolerance analysis to a .csv file. Each output term has the 5%, 50% and 95% percentiles of both of its parts,
+    laid out in the same way as the main .csv file.
+
+    Args:
+        fileName (str): Name of the file to write to
+        outputTerms (list): List of all of the output terms
+        frequencies (ndarray): Frequencies that were analysed
+        toleranceBands (list): List of (firstPart, secondPart) tuples for each output term, where each part is a (3, N) array of the percentiles
+    """    
+    percentiles = ("5%", "50%", "95%")
+    with open(fileName, 'w') as file:
+        file.write("      Freq")
+        for outputTerm in outputTerms:
+            variable, variableUnit, decibleCheck = outputTerm[1:4]
+            partNames = ("|" + str(variable) + "|", "/_" + str(variable)) if decibleCheck else ("Re(" + str(variable) + ")", "Im(" + str(variable) + ")")
+            for partName in partNames:
+                for percentile in percentiles: file.write("," + (partName + percentile).rjust(11))
+        file.write("\n        Hz")
+        for outputTerm in outputTerms:
+            variable, variableUnit, decibleCheck = outputTerm[1:4]
+            partUnits = (str(variableUnit), "Rads") if decibleCheck else (str(variableUnit), str(variableUnit))
+            for partUnit in partUnits:
+                for percentile in percentiles: file.write("," + partUnit.rjust(11))
+
+        for frequencyIndex, frequency in enumerate(frequencies):
+            file.write("\n" + FormatNumber(frequency,10))
+            for firstPart, secondPart in toleranceBands:
+                for part in (firstPart, secondPart):
+                    for percentileIndex in range(len(percentiles)): file.write("," + FormatNumber(part[percentileIndex, frequencyIndex]))
+            file.write(",")
     return
@@ -0,0 +1,670 @@
+# ====================================================================================================================================
+#   Filename:     RegressionTest.py
+#   Summary:      The script that checks the optional engines of the program against independent calculations
+#   Description:  This runs a set of self contained checks that do not need the model files of AutoTest_08.py. The cached products of
+#                 CircuitTuning.CascadeTree are compared with a full recompute of the cascade after every change, and the derivatives
+#                 of CircuitSensitivity are compared with central finite differences of the outputs, and the phase bands of
+#                 CircuitTolerance are checked where the phase passes through +-pi. The netlist cache is checked to be saved, loaded
+#                 and replaced when it should be, the parallel read of a memory mapped file is compared with the serial read, the
+#                 normalised node mode is compared with numbered nodes on circuits with random labels, ladders that are written out
+#                 line by line are checked to be folded into the same entries as the cascade of every component, CircuitMNA is
+#                 compared with a dense solve of the nodal admittance matrix, and the binary columns are compared with the .csv
+#                 files. The .net files in Reference_files are run through the program and their outputs are compared with the model
+#                 files stored next to them. The script exits with a non-zero status when any check fails.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+# =========================================== NOTE TO SELF ===========================================
+# python RegressionTest.py
+
+import numpy as np
+import math, sys, os, io, re, shutil, subprocess, tempfile, contextlib, warnings
+import DataReading as dataRead
+import CascadeCircuit as cascade
+import CircuitTuning as circuitTune
+import CircuitSensitivity as circuitSens
+import CircuitTolerance as circuitTol
+import CircuitMNA as circuitMNA
+import DataWriting as dataWrite
+
+# Each reference test is (Test Name, Command Line Options, Output Suffixes). The .net file and the model files are in REFERENCE_DIRECTORY, with the
+# output <Test Name><Suffix>.csv compared against <Test Name><Suffix>_model.csv
+REFERENCE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Reference_files")
+REFERENCE_TESTS = [("t_Tolerance_LPF", ["-t"], ["", "_tolerance"]),
+                   ("g_Terms_Grid", [], ["", "_1", "_2", "_3", "_4", "_5", "_6"]),
+                   ("r_Repeat_Ladder", ["-s"], ["", "_sensitivity"]),
+                   ("h_High_Order_Ladder", ["-r", "h_High_Order_Ladder.npz"], [""]),
+                   ("p_Phase_Crossing", ["-t"], ["", "_tolerance"])]
+
+# =============================================================================================================================
+# ========================================================== GENERAL ==========================================================
+# =============================================================================================================================
+
+def GetTestCircuit(netFileName="a_Test_Circuit_1.net", numberOfFrequencies=200):
+    """
+    Reads the circuit and terminations of a .net file and gets a logarithmic sweep over its frequency range
+
+    Args:
+        netFileName (str, optional): Name of the .net file. Defaults to "a_Test_Circuit_1.net"
+        numberOfFrequencies (int, optional): Number of frequencies in the sweep. Defaults to 200
+
+    Returns:
+        circuitComponents (list): List of the circuit component data in the form (Connection Type, Component Type, Component Value)
+        termsList (list): List of the terminations from DataReading.ReadNetlist
+        angularFrequencies (ndarray): Frequencies (IN RADS) of the sweep
+    """
+    circuitComponents, termsList, outputTerms = dataRead.ReadNetlist(netFileName)
+    startFrequency, endFrequency = termsList[3], termsList[4]
+    frequencies = cascade.GetFrequencies(startFrequency, endFrequency, numberOfFrequencies, True)
+    return list(circuitComponents.Expand()), termsList, 2*math.pi*frequencies
+
+def CheckClose(checkName, expected, actual, relativeTolerance=1e-9):
+    """
+    Compares two arrays and prints the result of the check. The absolute tolerance scales with the largest expected value along the last axis, so each
+    row is compared against its own size and values that are close to 0 are not compared on their relative error alone.
+
+    Args:
+        checkName (str): Name of the check that is printed
+        expected (ndarray): Values from the independent calculation
+        actual (ndarray): Values from the code being checked
+        relativeTolerance (float, optional): Relative tolerance of the comparison. Defaults to 1e-9
+
+    Returns:
+        bool: True if the arrays agree
+    """
+    expected, actual = np.asarray(expected), np.asarray(actual)
+    scale = np.max(np.abs(expected), axis=-1, keepdims=True) if expected.size else 0.0
+    agreeBoolean = expected.shape == actual.shape and np.allclose(actual, expected, rtol=relativeTolerance, atol=relativeTolerance*scale)
+    if agreeBoolean: print("OK:   " + checkName)
+    else:
+        error = np.max(np.abs(actual - expected) / np.where(scale != 0, scale, 1)) if expected.shape == actual.shape else float("nan")
+        print("FAIL: " + checkName + " (largest relative difference " + str(error) + ")")
+    return agreeBoolean
+
+# ===================================================================================================================================
+# ========================================================== CASCADE TREE ===========================================================
+# ===================================================================================================================================
+
+def CheckCascadeTree(circuitComponents, angularFrequencies, numberOfChanges=50, seed=1):
+    """
+    Changes random components of a CascadeTree and compares its products with CascadeCircuit.CalculateCoefficients on the changed circuit. Every change
+    is previewed before it is set, so both the cached prefix and suffix products and the updates of the tree are checked.
+
+    Args:
+        circuitComponents (list): List of the circuit component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        numberOfChanges (int, optional): Number of components that are changed. Defaults to 50
+        seed (int, optional): Seed of the random changes. Defaults to 1
+
+    Returns:
+        bool: True if every check agrees
+    """
+    randomGenerator = np.random.default_rng(seed)
+    circuitComponents = list(circuitComponents)
+    tree = circuitTune.CascadeTree(circuitComponents, angularFrequencies)
+    passBoolean = CheckClose("CascadeTree matches the cascade when built", cascade.CalculateCoefficients(circuitComponents, angularFrequencies), tree.GetCoefficients())
+
+    expectedEntries, previewEntries, updateEntries = [], [], []
+    for change in range(numberOfChanges):
+        index = int(randomGenerator.integers(len(circuitComponents)))
+        connectionType, componentType, componentValue = circuitComponents[index]
+        componentValue *= randomGenerator.uniform(0.5, 2)
+        circuitComponents[index] = (connectionType, componentType, componentValue)
+        expectedEntries.append(cascade.CalculateCoefficients(circuitComponents, angularFrequencies))
+        previewEntries.append(tree.PreviewComponentValue(index, componentValue))
+        tree.SetComponentValue(index, componentValue)
+        updateEntries.append(tree.GetCoefficients())
+
+    passBoolean &= CheckClose("CascadeTree previews match a full recompute over " + str(numberOfChanges) + " changes", expectedEntries, previewEntries)
+    passBoolean &= CheckClose("CascadeTree updates match a full recompute over " + str(numberOfChanges) + " changes", expectedEntries, updateEntries)
+    return passBoolean
+
+# ===================================================================================================================================
+# ========================================================== SENSITIVITY ============================================================
+# ===================================================================================================================================
+
+def GetSensitivityOutputs(circuitComponents, angularFrequencies, inputSource, sourceImpedance, loadImpedance):
+    """
+    Gets Av, Zin and Pout of the circuit from a full sweep, in the same form as CircuitSensitivity.CalculateSensitivities
+
+    Args:
+        circuitComponents (list): List of the circuit component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        inputSource (tuple): Source in the form (Source Type, Source Value)
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+
+    Returns:
+        outputs (dict): Dictionary of the "Av", "Zin" and "Pout" values at each frequency
+    """
+    outputBlock = cascade.CalculateOutputs(*cascade.CalculateCoefficients(circuitComponents, angularFrequencies), inputSource, sourceImpedance, loadImpedance)
+    return {"Av": outputBlock[8], "Zin": outputBlock[6], "Pout": outputBlock[5]}
+
+def CheckSensitivities(circuitComponents, angularFrequencies, inputSource, sourceImpedance, loadImpedance, relativeStep=1e-5):
+    """
+    Compares the derivatives from CircuitSensitivity.CalculateSensitivities with central finite differences, where every component value is moved up and
+    down by a small fraction and the whole circuit is swept again. The derivatives are compared as x * df/dx, against the largest of them at each
+    frequency, as the rounding of the finite differences swamps the components that barely change an output.
+
+    Args:
+        circuitComponents (list): List of the circuit component data in the form (Connection Type, Component Type, Component Value)
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        inputSource (tuple): Source in the form (Source Type, Source Value)
+        sourceImpedance (float): Impedance of the source
+        loadImpedance (float): Impedance of the load
+        relativeStep (float, optional): Step of the finite differences as a fraction of the component value. Defaults to 1e-5
+
+    Returns:
+        bool: True if every output agrees
+    """
+    circuitComponents = list(circuitComponents)
+    sensitivities = circuitSens.CalculateSensitivities(circuitComponents, angularFrequencies, inputSource, sourceImpedance, loadImpedance)
+    differences = {name: np.zeros_like(sensitivities[name]) for name in sensitivities}
+
+    for index, (connectionType, componentType, componentValue) in enumerate(circuitComponents):
+        step = componentValue * relativeStep
+        upperOutputs = GetSensitivityOutputs(circuitComponents[:index] + [(connectionType, componentType, componentValue + step)] + circuitComponents[index + 1:],
+                                             angularFrequencies, inputSource, sourceImpedance, loadImpedance)
+        lowerOutputs = GetSensitivityOutputs(circuitComponents[:index] + [(connectionType, componentType, componentValue - step)] + circuitComponents[index + 1:],
+                                             angularFrequencies, inputSource, sourceImpedance, loadImpedance)
+        for name in differences: differences[name][index] = (upperOutputs[name] - lowerOutputs[name]) / (2*step)
+
+    componentValues = np.array([individualComponent[2] for individualComponent in circuitComponents])[:, np.newaxis]
+    passBoolean = True
+    for name in sensitivities:
+        passBoolean &= CheckClose("d" + name + " matches finite differences for a " + ("Thevenin" if "V" in inputSource[0] else "Norton") + " source",
+                                  (componentValues * differences[name]).T, (componentValues * sensitivities[name]).T, 1e-8)
+    return passBoolean
+
+# ===================================================================================================================================
+# ========================================================== TOLERANCE ==============================================================
+# ===================================================================================================================================
+
+def CheckTolerancePhase(netFileName, numberOfFrequencies=50):
+    """
+    Checks the phase bands of the tolerance analysis over a sweep where the phase of the outputs passes through +-pi. A band of a wrapped phase puts
+    the samples on both ends of (-pi, pi], so its percentiles are out of order or span almost a whole turn, while the spread of the samples is small.
+
+    Args:
+        netFileName (str): Name of the .net file, which must have a <TOLERANCE> block and decibel outputs
+        numberOfFrequencies (int, optional): Number of frequencies in the sweep. Defaults to 50
+
+    Returns:
+        bool: True if every phase band is in order and narrower than pi
+    """
+    circuitTable, termsList, outputTerms = dataRead.ReadNetlist(netFileName)
+    circuitTable = circuitTable.Expand()
+    angularFrequencies = 2*math.pi*cascade.GetFrequencies(termsList[3], termsList[4], numberOfFrequencies, True)
+    toleranceSettings = dataRead.GetTolerances(dataRead.ReadOptionalBlock(netFileName, "TOLERANCE"))
+    componentTolerances = dataRead.GetComponentTolerances(circuitTable.GetNodeComponents(), toleranceSettings)
+    toleranceBands = circuitTol.CalculateToleranceBands(list(circuitTable), componentTolerances, angularFrequencies, *termsList[:3], outputTerms,
+                                                        toleranceSettings["samples"], toleranceSettings["seed"])
+
+    passBoolean = True
+    for outputTerm, (firstBand, phaseBand) in zip(outputTerms, toleranceBands):
+        if not outputTerm[3]: continue
+        orderBoolean = np.all(phaseBand[0] <= phaseBand[1]) and np.all(phaseBand[1] <= phaseBand[2])
+        widthBoolean = np.all(phaseBand[2] - phaseBand[0] < np.pi)
+        if orderBoolean and widthBoolean: print("OK:   Phase bands of " + outputTerm[1] + " stay together through +-pi")
+        else:                             print("FAIL: Phase bands of " + outputTerm[1] + " are " + ("out of order" if not orderBoolean else "wider than pi"))
+        passBoolean &= orderBoolean and widthBoolean
+    return passBoolean
+
+# ===================================================================================================================================
+# ========================================================== NETLIST READING ========================================================
+# ===================================================================================================================================
+
+def ReadQuietNetlist(netFileName, *arguments, **keywordArguments):
+    """
+    Reads a .net file with DataReading.ReadNetlist without printing its progress, and records its warnings
+
+    Args:
+        netFileName (str): Name of the .net file
+        *arguments, **keywordArguments: Other arguments of DataReading.ReadNetlist
+
+    Returns:
+        netlistData (tuple): The componentTable, termsList and outputTerms of the file
+        printedText (str): Text that was printed while reading
+        warningTexts (list): List of the text of each warning
+    """
+    printedText = io.StringIO()
+    with contextlib.redirect_stdout(printedText), warnings.catch_warnings(record=True) as caughtWarnings:
+        warnings.simplefilter("always")
+        netlistData = dataRead.ReadNetlist(netFileName, *arguments, **keywordArguments)
+    return netlistData, printedText.getvalue(), [str(caughtWarning.message) for caughtWarning in caughtWarnings]
+
+def CheckSameNetlist(checkName, expected, actual, conditionBoolean=True):
+    """
+    Compares two parsed netlists from DataReading.ReadNetlist, which must have the same component arrays, terms and output terms
+
+    Args:
+        checkName (str): Name of the check that is printed
+        expected (tuple): The componentTable, termsList and outputTerms from the reference read
+        actual (tuple): The componentTable, termsList and outputTerms from the read being checked
+        conditionBoolean (bool, optional): Other condition of the check, such as how the netlist was read. Defaults to True
+
+    Returns:
+        bool: True if the netlists are the same and the condition holds
+    """
+    expectedTable, expectedTerms, expectedOutputs = expected
+    actualTable, actualTerms, actualOutputs = actual
+    agreeBoolean = all(np.array_equal(getattr(expectedTable, entry), getattr(actualTable, entry)) for entry in ("connectionCodes", "typeCodes", "componentValues", "nodes", "repeats"))
+    agreeBoolean &= len(expectedTerms) == len(actualTerms) and all(np.array_equal(expectedTerm, actualTerm) for expectedTerm, actualTerm in zip(expectedTerms, actualTerms))
+    agreeBoolean &= list(expectedOutputs) == list(actualOutputs) and conditionBoolean
+    print(("OK:   " if agreeBoolean else "FAIL: ") + checkName)
+    return agreeBoolean
+
+def CheckNetlistCache(netFileName):
+    """
+    Checks the netlist cache on a copy of a .net file. The first read must save the cache, the second must load it, a changed file must be read again,
+    and a corrupt cache must be read again with a warning and replaced. Every read must give the same netlist as reading the file without the cache.
+
+    Args:
+        netFileName (str): Name of the .net file
+
+    Returns:
+        bool: True if every check passes
+    """
+    testName = os.path.splitext(os.path.basename(netFileName))[0]
+    with tempfile.TemporaryDirectory() as runDirectory:
+        copyFileName = os.path.join(runDirectory, os.path.basename(netFileName))
+        shutil.copy(netFileName, copyFileName)
+        expected = ReadQuietNetlist(copyFileName)[0]
+
+        netlistData, printedText, warningTexts = ReadQuietNetlist(copyFileName, True)
+        passBoolean = CheckSameNetlist(testName + " cache miss reads the file and saves the cache", expected, netlistData,
+                                       os.path.isfile(dataRead.GetCacheFileName(copyFileName)) and "READING CACHE" not in printedText)
+        netlistData, printedText, warningTexts = ReadQuietNetlist(copyFileName, True)
+        passBoolean &= CheckSameNetlist(testName + " cache hit matches the file", expected, netlistData, "READING CACHE" in printedText)
+
+        # Any change to the file changes its key, even one that does not change the netlist
+        with open(copyFileName, 'a') as file: file.write("\n# Changed\n")
+        netlistData, printedText, warningTexts = ReadQuietNetlist(copyFileName, True)
+        passBoolean &= CheckSameNetlist(testName + " changed file is read again", expected, netlistData, "READING CACHE" not in printedText)
+        netlistData, printedText, warningTexts = ReadQuietNetlist(copyFileName, True)
+        passBoolean &= CheckSameNetlist(testName + " cache of the changed file is loaded", expected, netlistData, "READING CACHE" in printedText)
+
+        with open(dataRead.GetCacheFileName(copyFileName), 'r+b') as file: file.truncate(os.path.getsize(dataRead.GetCacheFileName(copyFileName)) // 2)
+        netlistData, printedText, warningTexts = ReadQuietNetlist(copyFileName, True)
+        passBoolean &= CheckSameNetlist(testName + " corrupt cache is read again with a warning", expected, netlistData,
+                                        "READING CACHE" not in printedText and any("Unreadable netlist cache" in warningText for warningText in warningTexts))
+        netlistData, printedText, warningTexts = ReadQuietNetlist(copyFileName, True)
+        passBoolean &= CheckSameNetlist(testName + " corrupt cache is replaced", expected, netlistData, "READING CACHE" in printedText and not warningTexts)
+    return passBoolean
+
+def WriteLadderNetlist(fileName, numberOfSections, seed=2, lineBreak="\n"):
+    """
+    Writes a .net file of a long L-C ladder with the component lines in a random order, with comments and blank lines between them
+
+    Args:
+        fileName (str): Name of the .net file to write to
+        numberOfSections (int): Number of L-C sections of the ladder
+        seed (int, optional): Seed of the order and values of the components. Defaults to 2
+        lineBreak (str, optional): Line break of the file. Defaults to "\n"
+    """
+    randomGenerator = np.random.default_rng(seed)
+    circuitLines = ["n1=1 n2=2 R=50"]
+    for section in range(numberOfSections):
+        node = section + 2
+        circuitLines.append("n1=" + str(node) + " n2=" + str(node + 1) + " L=" + repr(float(randomGenerator.uniform(0.5e-6, 2e-6))))
+        circuitLines.append("n1=" + str(node + 1) + " n2=0 C=" + repr(float(randomGenerator.uniform(0.5e-9, 2e-9))) + ("  # shunt" if section % 7 == 0 else ""))
+    circuitLines = [circuitLines[index] for index in randomGenerator.permutation(len(circuitLines))]
+    for index in range(0, len(circuitLines), 97): circuitLines[index] += lineBreak + "# comment" + lineBreak
+
+    with open(fileName, 'w', newline="") as file:
+        file.write(lineBreak.join(["<CIRCUIT>"] + circuitLines + ["</CIRCUIT>", "<TERMS>", "VT=1 RS=50", "RL=50", "Fstart=1e3 Fend=1e6 Nfreqs=10",
+                                                                  "</TERMS>", "<OUTPUT>", "Vout V", "Av dB", "</OUTPUT>", ""]))
+    return
+
+def CheckParallelReading(numberOfSections=5000, workers=4):
+    """
+    Checks that the memory mapped file parsed in parallel chunks by DataReading.ReadMappedFile gives the same netlist as the serial read, on a long ladder
+    with its lines out of order, for both line breaks and the numbered and normalised node modes
+
+    Args:
+        numberOfSections (int, optional): Number of L-C sections of the ladder. Defaults to 5000
+        workers (int, optional): Number of processes of the parallel read. Defaults to 4
+
+    Returns:
+        bool: True if every parallel read matches the serial read
+    """
+    passBoolean = True
+    with tempfile.TemporaryDirectory() as runDirectory:
+        for lineBreakName, lineBreak in (("LF", "\n"), ("CRLF", "\r\n")):
+            netFileName = os.path.join(runDirectory, "ladder_" + lineBreakName + ".net")
+            WriteLadderNetlist(netFileName, numberOfSections, lineBreak=lineBreak)
+            for nodeMode in ("numbered", "normalised"):
+                expected = ReadQuietNetlist(netFileName, nodeMode=nodeMode)[0]
+                netlistData, printedText, warningTexts = ReadQuietNetlist(netFileName, workers=workers, nodeMode=nodeMode)
+                passBoolean &= CheckSameNetlist("Parallel read of " + str(2*numberOfSections + 1) + " components with " + lineBreakName + " line breaks matches the serial read with " + nodeMode + " nodes",
+                                                expected, netlistData, len(expected[0]) == 2*numberOfSections + 1)
+    return passBoolean
+
+def RelabelCircuit(circuitText, seed=3):
+    """
+    Gives the nodes of a numbered circuit block random labels and puts its lines in a random order. The input node keeps the lowest label, as the
+    normalised node mode walks the cascade from there, and the common node stays 0.
+
+    Args:
+        circuitText (str): String of the circuit block text with numbered nodes, without REPEAT sections
+        seed (int, optional): Seed of the labels and the order. Defaults to 3
+
+    Returns:
+        relabelledText (str): String of the circuit block text with the new labels
+        nodeLabels (dict): Dictionary of the new label of each numbered node
+    """
+    randomGenerator = np.random.default_rng(seed)
+    nodePattern = re.compile(r"(?i)\b(n[12]=)(\d+)")
+    circuitLines = [line for line in circuitText.splitlines() if line.strip() != ""]
+    nodes = sorted(set(int(node) for line in circuitLines for prefix, node in nodePattern.findall(line)) - {0})
+
+    newLabels = np.sort(randomGenerator.choice(np.arange(2, 10*len(nodes) + 1000), len(nodes), replace=False))
+    nodeLabels = {0: 0, nodes[0]: int(newLabels[0])}
+    nodeLabels.update(zip(nodes[1:], randomGenerator.permutation(newLabels[1:]).tolist()))
+    relabelledLines = [nodePattern.sub(lambda match: match.group(1) + str(nodeLabels[int(match.group(2))]), line) for line in circuitLines]
+    return "\n".join(relabelledLines[index] for index in randomGenerator.permutation(len(relabelledLines))), nodeLabels
+
+def CheckNormalisedNodes(netFileName):
+    """
+    Checks the normalised node mode of -n on a numbered .net file. The circuit is read with numbered nodes, then with random labels and a random line
+    order in the normalised node mode, which must give the same components in the same order on the relabelled nodes.
+
+    Args:
+        netFileName (str): Name of the .net file, with numbered nodes and without REPEAT sections
+
+    Returns:
+        bool: True if both reads give the same circuit
+    """
+    with contextlib.redirect_stdout(io.StringIO()): circuitText = dataRead.ReadFile(netFileName)[0]
+    expectedTable = dataRead.ReadCircuitTable(circuitText)
+    relabelledText, nodeLabels = RelabelCircuit(circuitText)
+    actualTable = dataRead.ReadCircuitTable(relabelledText, "normalised")
+
+    labelledNodes = np.vectorize(nodeLabels.get)(expectedTable.nodes.astype(int)) if len(expectedTable) else expectedTable.nodes
+    agreeBoolean = list(expectedTable) == list(actualTable) and np.array_equal(labelledNodes, actualTable.nodes)
+    print(("OK:   " if agreeBoolean else "FAIL: ") + os.path.basename(netFileName) + " with random node labels and line order matches the numbered nodes")
+    return agreeBoolean
+
+# ===================================================================================================================================
+# ========================================================== PERIODIC FOLDING =======================================================
+# ===================================================================================================================================
+
+def GetWrittenOutCircuit(sectionCounts):
+    """
+    Gets the circuit block text of a ladder that is written out line by line, with a run of copies of each section one after the other
+
+    Args:
+        sectionCounts (list): List of (Section, Count) of each run, where the section is a list of (Connection Type, Component Type, Component Value)
+
+    Returns:
+        str: String of the circuit block text with numbered nodes
+    """
+    circuitLines, node = ["n1=1 n2=2 R=50"], 2
+    for section, count in sectionCounts:
+        for copy in range(count):
+            for connectionType, componentType, componentValue in section:
+                if connectionType == "S": circuitLines.append("n1=" + str(node) + " n2=" + str(node + 1) + " " + componentType + "=" + repr(componentValue))
+                else:                     circuitLines.append("n1=" + str(node) + " n2=0 " + componentType + "=" + repr(componentValue))
+                node += connectionType == "S"
+    return "\n".join(circuitLines + ["n1=" + str(node) + " n2=0 R=1e4"])
+
+def CheckPeriodicFolding(checkName, componentTable, angularFrequencies, expectedTable=None):
+    """
+    Compiles a circuit that was written out line by line and checks that FindPeriodicRuns folds its sections, and that the folded circuit gives the
+    same ABCD entries as cascading every component in turn
+
+    Args:
+        checkName (str): Name of the circuit that is printed
+        componentTable (ComponentTable): Table of the circuit components without REPEAT sections
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+        expectedTable (ComponentTable, optional): Table of the same circuit with REPEAT sections, which must give the same entries. Defaults to None
+
+    Returns:
+        bool: True if the circuit is folded and the entries agree
+    """
+    compiledTable = cascade.CompileCircuit(componentTable)
+    foldBoolean = bool(np.any(compiledTable.connectionCodes == 3))
+    print(("OK:   " if foldBoolean else "FAIL: ") + checkName + " is folded from " + str(len(componentTable)) + " components to " + str(len(compiledTable)) + " entries")
+    expected = cascade.CalculateCoefficients(list(componentTable), angularFrequencies)
+    passBoolean = foldBoolean & CheckClose("Folded " + checkName + " matches the cascade of every component", expected, cascade.CalculateCoefficients(compiledTable, angularFrequencies))
+    if expectedTable is not None:
+        passBoolean &= CheckClose("Folded " + checkName + " matches its REPEAT sections", cascade.CalculateCoefficients(cascade.CompileCircuit(expectedTable), angularFrequencies),
+                                  cascade.CalculateCoefficients(compiledTable, angularFrequencies))
+    return passBoolean
+
+# ===================================================================================================================================
+# ========================================================== NODAL ANALYSIS =========================================================
+# ===================================================================================================================================
+
+# Networks that are not a cascade, as <CIRCUIT> block text with the lowest node as the input and the highest node as the output
+BRIDGED_T_CIRCUIT = """n1=1 n2=3 R=100
+n1=3 n2=2 R=100
+n1=1 n2=2 C=10e-9
+n1=3 n2=0 L=1e-3"""
+TWIN_T_CIRCUIT = """n1=1 n2=3 R=1e3
+n1=3 n2=2 R=1e3
+n1=3 n2=0 C=200e-9
+n1=1 n2=4 C=100e-9
+n1=4 n2=2 C=100e-9
+n1=4 n2=0 R=500"""
+
+def GetDenseCoefficients(componentTable, angularFrequencies):
+    """
+    Gets the ABCD entries of a network from its full nodal admittance matrix with a dense solve at each frequency. With the output open, a current of 1
+    into the input gives A = V1/V2 and C = 1/V2, and with the output shorted it gives B = V1/I2 and D = 1/I2, where I2 leaves the output node.
+
+    Args:
+        componentTable (ComponentTable): Table of the network components, including their nodes
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the network will be analysed on
+
+    Returns:
+        A, B, C, D (ndarray): Arrays of each ABCD entry of the network, with one value per frequency
+    """
+    labels = np.unique(componentTable.nodes[componentTable.nodes != 0])
+    coefficients = np.zeros((4, len(angularFrequencies)), dtype=complex)
+    for index, angularFrequency in enumerate(angularFrequencies):
+        admittanceMatrix = np.zeros((len(labels), len(labels)), dtype=complex)
+        for (firstNode, secondNode), (connectionType, componentType, componentValue) in zip(componentTable.nodes, componentTable):
+            admittance = {"R": 1/componentValue, "G": componentValue, "L": 1/(1j*angularFrequency*componentValue), "C": 1j*angularFrequency*componentValue}[componentType]
+            nodeIndexes = [int(np.searchsorted(labels, node)) for node in (firstNode, secondNode) if node != 0]
+            for firstIndex in nodeIndexes: admittanceMatrix[firstIndex, firstIndex] += admittance
+            if len(nodeIndexes) == 2:
+                admittanceMatrix[nodeIndexes[0], nodeIndexes[1]] -= admittance
+                admittanceMatrix[nodeIndexes[1], nodeIndexes[0]] -= admittance
+
+        inputCurrent = np.zeros(len(labels))
+        inputCurrent[0] = 1
+        openVoltages = np.linalg.solve(admittanceMatrix, inputCurrent)
+        shortVoltages = np.linalg.solve(admittanceMatrix[:-1, :-1], inputCurrent[:-1])
+        outputCurrent = -admittanceMatrix[-1, :-1] @ shortVoltages
+        coefficients[:, index] = (openVoltages[0]/openVoltages[-1], shortVoltages[0]/outputCurrent, 1/openVoltages[-1], 1/outputCurrent)
+    return tuple(coefficients)
+
+def CheckNetwork(checkName, circuitText, angularFrequencies):
+    """
+    Compares the ABCD entries of CircuitMNA, which removes the internal nodes with a sparse factorisation, with a dense solve of the full nodal admittance
+    matrix from GetDenseCoefficients
+
+    Args:
+        checkName (str): Name of the network that is printed
+        circuitText (str): String of the circuit block text, read in the general node mode of -m
+        angularFrequencies (ndarray): Frequencies (IN RADS) that the network will be analysed on
+
+    Returns:
+        bool: True if the entries agree
+    """
+    componentTable = dataRead.ReadCircuitTable(circuitText, "general")
+    actual = circuitMNA.CalculateNetworkCoefficients(circuitMNA.CompileNetwork(componentTable), angularFrequencies, chunkSize=64)
+    return CheckClose("CircuitMNA matches a dense nodal solve on a " + checkName, GetDenseCoefficients(componentTable, angularFrequencies), actual)
+
+# ===================================================================================================================================
+# ========================================================== REFERENCE FILES ========================================================
+# ===================================================================================================================================
+
+def CompareOutputFiles(modelText, userText, absoluteTolerance=1e-13, relativeTolerance=1e-13):
+    """
+    Compares the text of an output file with its model file, line by line. Fields that are numbers in both files are compared with numpy.isclose, the
+    same as AutoTest_08.py, and every other field must be identical.
+
+    Args:
+        modelText (str): Text of the model file
+        userText (str): Text of the output file
+        absoluteTolerance (float, optional): Absolute tolerance of the numbers. Defaults to 1e-13
+        relativeTolerance (float, optional): Relative tolerance of the numbers. Defaults to 1e-13
+
+    Returns:
+        str: Description of the first difference, or an empty string when the files agree
+    """
+    modelLines, userLines = modelText.splitlines(), userText.splitlines()
+    if len(modelLines) != len(userLines): return "model has " + str(len(modelLines)) + " lines, output has " + str(len(userLines))
+
+    for lineNumber, (modelLine, userLine) in enumerate(zip(modelLines, userLines), 1):
+        modelFields, userFields = modelLine.split(","), userLine.split(",")
+        if len(modelFields) != len(userFields): return "line " + str(lineNumber) + " has a different number of fields"
+        for modelField, userField in zip(modelFields, userFields):
+            try:    agreeBoolean = np.isclose(float(userField), float(modelField), rtol=relativeTolerance, atol=absoluteTolerance)
+            except ValueError: agreeBoolean = modelField.strip() == userField.strip()
+            if not agreeBoolean: return "line " + str(lineNumber) + " differs, model=<" + modelField.strip() + ">, output=<" + userField.strip() + ">"
+    return ""
+
+def RunProgram(testName, options, runDirectory):
+    """
+    Runs a .net file from REFERENCE_DIRECTORY through CascadeCircuit.py in the run directory, writing <Test Name>.csv
+
+    Args:
+        testName (str): Name of the .net file without the extension
+        options (list): Command line options of the run
+        runDirectory (str): Directory that the .net file is copied to and the outputs are written to
+
+    Returns:
+        bool: True if the program runs
+    """
+    programFileName = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CascadeCircuit.py")
+
+    # The files are named relative to the run directory, as the command line formatting strips the separators of absolute paths
+    shutil.copy(os.path.join(REFERENCE_DIRECTORY, testName + ".net"), runDirectory)
+    runResult = subprocess.run([sys.executable, programFileName, testName + ".net", testName + ".csv"] + options, cwd=runDirectory, capture_output=True, text=True)
+    if runResult.returncode != 0: print("FAIL: " + testName + " " + " ".join(options) + " did not run\n" + runResult.stderr)
+    return runResult.returncode == 0
+
+def CheckBinaryColumns(testName):
+    """
+    Runs a .net file from REFERENCE_DIRECTORY with the .csv output and with both formats of -o, and checks the binary columns against the .csv files.
+    The "npz" and "raw" columns must be identical, and their values must give the rows of the .csv file of each termination when they are converted
+    and written to 4 significant figures in the same way.
+
+    Args:
+        testName (str): Name of the .net file without the extension
+
+    Returns:
+        bool: True if the columns agree with the .csv files
+    """
+    with tempfile.TemporaryDirectory() as runDirectory:
+        if not all(RunProgram(testName, options, runDirectory) for options in ([], ["-o", "npz"], ["-o", "raw"])): return False
+        header, columns = dataWrite.LoadBinaryColumns(os.path.join(runDirectory, testName + ".npz"))
+        rawHeader, rawColumns = dataWrite.LoadBinaryColumns(os.path.join(runDirectory, testName + "_columns"))
+        passBoolean = header["length"] == rawHeader["length"] and all(np.array_equal(columns[key], rawColumns[key]) for key in columns)
+        print(("OK:   " if passBoolean else "FAIL: ") + testName + " npz and raw columns are identical")
+
+        # Each termination of a grid has its own .csv file, and its values are along the last axis of the output columns
+        outputColumns = header["columns"][1:]
+        terminationSuffixes = [""] if "terminations" not in header else ["_" + str(index + 1) for index in range(len(header["terminations"]["loadImpedances"]))]
+        for index, terminationSuffix in enumerate(terminationSuffixes):
+            binaryColumns = []
+            for column in outputColumns:
+                values = columns[column["key"]] if terminationSuffix == "" else columns[column["key"]][:, index]
+                binaryColumns += list(dataWrite.ConvertOutputColumns(values * 10**column["exponent"], (column["outputIndex"], column["variable"], column["unit"], column["decibel"], column["exponent"])))
+            with open(os.path.join(runDirectory, testName + terminationSuffix + ".csv")) as csvFile: csvRows = csvFile.read().splitlines()[2:]
+            difference = CompareOutputFiles("\n".join(csvRows), dataWrite.FormatRows(columns["frequency"], binaryColumns)[1:], relativeTolerance=1e-3)
+            if difference == "": print("OK:   " + testName + terminationSuffix + " binary columns match the .csv file")
+            else:                print("FAIL: " + testName + terminationSuffix + " binary columns: " + difference)
+            passBoolean &= difference == "" and len(csvRows) == header["length"]
+    return passBoolean
+
+def RunReferenceTest(testName, options, outputSuffixes):
+    """
+    Runs a .net file from REFERENCE_DIRECTORY through CascadeCircuit.py in a temporary directory and compares every output file with its model file
+
+    Args:
+        testName (str): Name of the .net file without the extension
+        options (list): Command line options of the run
+        outputSuffixes (list): Suffixes of the output files that are compared, where "" is the main .csv file
+
+    Returns:
+        bool: True if the program runs and every output agrees with its model
+    """
+    with tempfile.TemporaryDirectory() as runDirectory:
+        if not RunProgram(testName, options, runDirectory): return False
+
+        passBoolean = True
+        for outputSuffix in outputSuffixes:
+            outputFileName = testName + outputSuffix + ".csv"
+            with open(os.path.join(REFERENCE_DIRECTORY, testName + outputSuffix + "_model.csv")) as modelFile: modelText = modelFile.read()
+            if not os.path.exists(os.path.join(runDirectory, outputFileName)): difference = "the file was not written"
+            else:
+                with open(os.path.join(runDirectory, outputFileName)) as userFile: difference = CompareOutputFiles(modelText, userFile.read())
+            if difference == "": print("OK:   " + outputFileName + " matches its model")
+            else:                print("FAIL: " + outputFileName + ": " + difference)
+            passBoolean &= difference == ""
+    return passBoolean
+
+# =================================================================================================
+# =========================================== MAIN CODE ===========================================
+# =================================================================================================
+def main():
+    circuitComponents, termsList, angularFrequencies = GetTestCircuit()
+
+    print("CHECKING CASCADE TREE")
+    passBoolean = CheckCascadeTree(circuitComponents, angularFrequencies)
+
+    print("CHECKING SENSITIVITIES")
+    inputSource, sourceImpedance, loadImpedance = termsList[:3]
+    passBoolean &= CheckSensitivities(circuitComponents, angularFrequencies, inputSource, sourceImpedance, loadImpedance)
+    passBoolean &= CheckSensitivities(circuitComponents, angularFrequencies, ("I", inputSource[1] / sourceImpedance), sourceImpedance, loadImpedance)
+
+    print("CHECKING TOLERANCE PHASE")
+    passBoolean &= CheckTolerancePhase(os.path.join(REFERENCE_DIRECTORY, "p_Phase_Crossing.net"))
+
+    print("CHECKING NETLIST CACHE")
+    for testName in ("g_Terms_Grid", "r_Repeat_Ladder"): passBoolean &= CheckNetlistCache(os.path.join(REFERENCE_DIRECTORY, testName + ".net"))
+
+    print("CHECKING PARALLEL READING")
+    passBoolean &= CheckParallelReading()
+
+    print("CHECKING NORMALISED NODES")
+    passBoolean &= CheckNormalisedNodes("a_Test_Circuit_1.net")
+    passBoolean &= CheckNormalisedNodes(os.path.join(REFERENCE_DIRECTORY, "g_Terms_Grid.net"))
+    with tempfile.TemporaryDirectory() as runDirectory:
+        WriteLadderNetlist(os.path.join(runDirectory, "ladder.net"), 1000)
+        passBoolean &= CheckNormalisedNodes(os.path.join(runDirectory, "ladder.net"))
+
+    print("CHECKING PERIODIC FOLDING")
+    circuitText = GetWrittenOutCircuit([([("S", "L", 1e-6), ("P", "C", 4e-10)], 100), ([("S", "R", 10.0), ("S", "L", 2e-6), ("P", "C", 1e-9)], 60)])
+    passBoolean &= CheckPeriodicFolding("written out ladder", dataRead.ReadCircuitTable(circuitText), angularFrequencies)
+    with contextlib.redirect_stdout(io.StringIO()): repeatTable = dataRead.ReadNetlist(os.path.join(REFERENCE_DIRECTORY, "h_High_Order_Ladder.net"))[0]
+    passBoolean &= CheckPeriodicFolding("h_High_Order_Ladder.net written out", repeatTable.Expand(), angularFrequencies, repeatTable)
+
+    print("CHECKING NODAL ANALYSIS")
+    passBoolean &= CheckNetwork("bridged-T", BRIDGED_T_CIRCUIT, angularFrequencies)
+    passBoolean &= CheckNetwork("twin-T", TWIN_T_CIRCUIT, angularFrequencies)
+    with contextlib.redirect_stdout(io.StringIO()): circuitText = dataRead.ReadFile("a_Test_Circuit_1.net")[0]
+    passBoolean &= CheckNetwork("ladder", circuitText, angularFrequencies)
+    passBoolean &= CheckClose("CircuitMNA matches the cascade on a ladder", cascade.CalculateCoefficients(circuitComponents, angularFrequencies),
+                              circuitMNA.CalculateNetworkCoefficients(circuitMNA.CompileNetwork(dataRead.ReadCircuitTable(circuitText, "general")), angularFrequencies))
+
+    print("CHECKING BINARY COLUMNS")
+    for testName in ("h_High_Order_Ladder", "p_Phase_Crossing", "g_Terms_Grid"): passBoolean &= CheckBinaryColumns(testName)
+
+    print("CHECKING REFERENCE FILES")
+    for testName, options, outputSuffixes in REFERENCE_TESTS: passBoolean &= RunReferenceTest(testName, options, outputSuffixes)
+
+    if not passBoolean: sys.exit(1)
+    print("ALL CHECKS PASSED")
+
+# ===================================================================================================
+# =========================================== END OF CODE ===========================================
+# ===================================================================================================
+
+if __name__ == "__main__":  # Allows the checks to be run as a script
+    main()
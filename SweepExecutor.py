@@ -0,0 +1,188 @@
+# ====================================================================================================================================
+#   Filename:     SweepExecutor.py
+#   Summary:      The module that runs the frequency sweep in parallel
+#   Description:  This is a set of functions that split the frequency grid into chunks and evaluate the chunks on a pool of threads or
+#                 processes. The results are put back together in frequency order before they are returned, so the output of a parallel
+#                 sweep is identical to the serial sweep. Numpy releases the GIL on large arrays, so threads suit the vectorized engines,
+#                 and processes suit work that holds the GIL.
+#
+#   Author:       C.J. Gacay
+# ====================================================================================================================================
+
+import numpy as np
+import functools
+import collections
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# ===================================================================================================================================
+# ========================================================== WORKER POOL ============================================================
+# ===================================================================================================================================
+
+MINIMUM_TASK_SIZE = 1024
+workerSweep = None
+
+def StoreWorkerSweep(sweepFunction, sweepArguments):
+    """
+    Stores the sweep function and its arguments in a worker process when the process starts, so the arguments are sent to each worker once
+    instead of with every chunk
+
+    Args:
+        sweepFunction (function): Function to evaluate on each chunk
+        sweepArguments (tuple): Arguments that come before the frequencies
+    """
+    global workerSweep
+    workerSweep = functools.partial(sweepFunction, *sweepArguments)
+    return
+
+def EvaluateWorkerSweep(angularFrequencies):
+    """
+    Evaluates the sweep function stored in the worker process on a chunk of frequencies
+
+    Args:
+        angularFrequencies (ndarray): Frequencies (IN RADS) of the chunk
+
+    Returns:
+        tuple: Tuple of the arrays returned by the sweep function
+    """
+    return workerSweep(angularFrequencies)
+
+class SweepPool:
+    """
+    Pool of threads or processes that evaluates one sweep function on as many frequency grids as needed. The pool is started once and kept until it
+    is closed, so a streaming sweep does not pay for starting the workers again on every chunk.
+
+    Example:
+        with SweepPool(CalculateCoefficients, (compiledComponents,), 4, "process") as sweepPool:
+            A, B, C, D = sweepPool.GetResults(sweepPool.Submit(angularFrequencies))
+    """
+
+    def __init__(self, sweepFunction, sweepArguments, workers, backend="thread"):
+        """
+        Starts the workers
+
+        Args:
+            sweepFunction (function): Function to evaluate on each chunk. This must be defined at the top level of a module for the process backend
+            sweepArguments (tuple): Arguments that come before the frequencies
+            workers (int): Number of workers
+            backend (str, optional): "thread" for a thread pool or "process" for a process pool. Defaults to "thread"
+
+        Raises:
+            ValueError: Raised when the backend is unknown
+        """
+        self.workers = workers
+        if backend == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+            self.chunkFunction = functools.partial(sweepFunction, *sweepArguments)
+        elif backend == "process":
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=StoreWorkerSweep, initargs=(sweepFunction, sweepArguments))
+            self.chunkFunction = EvaluateWorkerSweep
+        else: raise ValueError("Unknown Executor Backend: " + str(backend) + "\n Use thread or process")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        self.Close()
+        return False
+
+    def Close(self):
+        """
+        Waits for the workers to finish and stops them
+        """
+        self.executor.shutdown(wait=True)
+        return
+
+    def Submit(self, angularFrequencies):
+        """
+        Starts the sweep function on a frequency grid without waiting for it. The grid is only split between the workers when each part has at least
+        MINIMUM_TASK_SIZE frequencies, as smaller parts cost more to send to the workers than they take to evaluate.
+
+        Args:
+            angularFrequencies (ndarray): Frequencies (IN RADS) that the circuit will be analysed on
+
+        Returns:
+            list: List of the futures of the parts of the grid in order
+        """
+        angularFrequencies = np.asarray(angularFrequencies, dtype=float)
+        numberOfTasks = max(1, min(self.workers, len(angularFrequencies) // MINIMUM_TASK_SIZE))
+        return [self.executor.submit(self.chunkFunction, taskFrequencies) for taskFrequencies in np.array_split(angularFrequencies, numberOfTasks)]
+
+    def GetResults(self, taskFutures):
+        """
+        Waits for the parts started by Submit and joins them back together
+
+        Args:
+            taskFutures (list): List of the futures returned by Submit
+
+        Returns:
+            tuple: Tuple of the joined arrays returned by the sweep function
+        """
+        taskResults = [taskFuture.result() for taskFuture in taskFutures]
+        if len(taskResults) == 1: return taskResults[0]
+        return tuple(np.concatenate(entries) for entries in zip(*taskResults))
+
+# ===================================================================================================================================
+# ========================================================== PIPELINE ===============================================================
+# ===================================================================================================================================
+
+def GetChunkSize(memoryBudget, bytesPerFrequency, minimumSize=1):
+    """
+    Gets the number of frequencies in each chunk of a streaming sweep, so that the arrays of a chunk stay within the memory budget
+
+    Args:
+        memoryBudget (int): Largest number of bytes that a chunk should use
+        bytesPerFrequency (int): Number of bytes that each frequency of a chunk uses, over every stage of the pipeline
+        minimumSize (int, optional): Smallest number of frequencies in a chunk. Defaults to 1
+
+    Returns:
+        int: Number of frequencies in each chunk
+    """
+    return max(int(minimumSize), int(memoryBudget) // max(1, int(bytesPerFrequency)))
+
+def GetChunksInFlight(workers):
+    """
+    Gets the largest number of chunks that a streaming sweep holds at once. With more than one worker, StreamSweep keeps one chunk evaluating on each
+    worker while the chunk before them is being used, so the memory budget has to be shared between workers + 1 chunks.
+
+    Args:
+        workers (int): Number of workers
+
+    Returns:
+        int: Number of chunks held at once
+    """
+    return 1 if workers <= 1 else workers + 1
+
+def StreamSweep(sweepFunction, sweepArguments, frequencyChunks, workers=1, backend="thread"):
+    """
+    Evaluates a sweep function on each chunk of frequencies as the chunks are consumed. The chunks are taken lazily from frequencyChunks and are
+    evaluated on one SweepPool that is kept for the whole sweep. With more than one worker, the next chunks are evaluated while the earlier chunk is
+    used, so up to GetChunksInFlight(workers) chunks are held at once: one being used and one evaluating for each worker. The chunk size should be
+    chosen from the memory budget divided by that number. The memory used does not depend on the number of frequencies, and the chunks are yielded
+    in order.
+
+    Args:
+        sweepFunction (function): Function to evaluate on each chunk, called as sweepFunction(*sweepArguments, angularFrequencies)
+        sweepArguments (tuple): Arguments that come before the frequencies
+        frequencyChunks (iterable): Chunks of the frequencies (IN HZ) in order
+        workers (int, optional): Number of workers. Defaults to 1
+        backend (str, optional): "thread" or "process". Defaults to "thread"
+
+    Yields:
+        frequencies (ndarray): Frequencies of the chunk
+        results (tuple): Tuple of the arrays returned by the sweep function for the chunk
+    """
+    if workers <= 1:
+        for frequencies in frequencyChunks:
+            yield frequencies, sweepFunction(*sweepArguments, 2*np.pi*np.asarray(frequencies, dtype=float))
+        return
+
+    with SweepPool(sweepFunction, sweepArguments, workers, backend) as sweepPool:
+        pendingChunks = collections.deque()
+        for frequencies in frequencyChunks:
+            pendingChunks.append((frequencies, sweepPool.Submit(2*np.pi*np.asarray(frequencies, dtype=float))))
+            if len(pendingChunks) == GetChunksInFlight(workers):
+                frequencies, taskFutures = pendingChunks.popleft()
+                yield frequencies, sweepPool.GetResults(taskFutures)
+        while len(pendingChunks) > 0:
+            frequencies, taskFutures = pendingChunks.popleft()
+            yield frequencies, sweepPool.GetResults(taskFutures)